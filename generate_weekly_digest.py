@@ -32,20 +32,24 @@ async def generate_weekly_digest():
         print("STEP 1/4: Collecting AI news from multiple sources")
         print("-" * 60)
         collector = AINewsCollector()
-        news_data = await collector.collect_all()
+        curator = ContentCurator()
+        generator = WebpageGenerator()
+        # Item cards are rendered as curated items stream in
+        curator.on_item = generator.prerender
+        # Each source's batch is deduplicated and clustered while the others download
+        prep = curator.news_prep()
+        news_data = await collector.collect_all(on_batch=prep.add_batch)
         print()
 
         # Step 2: Curate content
         print("STEP 2/4: Curating and filtering content with Claude")
         print("-" * 60)
-        curator = ContentCurator()
-        curated_data = await curator.curate()
+        curated_data = await curator.curate(prep)
         print()
 
         # Step 3: Generate webpage
         print("STEP 3/4: Generating beautiful webpage")
         print("-" * 60)
-        generator = WebpageGenerator()
         filepath = await generator.generate()
         print()
 
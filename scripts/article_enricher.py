@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Article Enrichment
+Fetches the pages items link to and adds a short extractive summary of each
+"""
+
+import asyncio
+import math
+import re
+from functools import partial
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from dedup import canonicalize_url, item_link
+from http_pool import AsyncHTTPPool
+from item_cache import ItemCache
+from near_dup import TOKEN_RE, STOPWORDS
+
+# Links whose pages are discussions, media or already summarized by their source
+SKIP_HOSTS = {
+    'reddit.com', 'redd.it', 'i.redd.it', 'v.redd.it', 'news.ycombinator.com', 'arxiv.org',
+    'twitter.com', 'youtube.com', 'i.imgur.com', 'imgur.com'
+}
+SKIP_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp4', '.mp3', '.zip')
+# Error statuses that mean the page won't turn into an article on a later run
+PERMANENT_STATUSES = {404, 410}
+
+# Elements whose text is never article content
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'nav', 'header', 'footer', 'aside',
+             'form', 'button', 'iframe', 'figure'}
+# Elements that end a run of text
+BLOCK_TAGS = {'p', 'div', 'section', 'article', 'main', 'li', 'ul', 'ol', 'blockquote', 'pre', 'br',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'td', 'tr', 'table', 'body'}
+CONTENT_TAGS = {'article', 'main'}
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=["“(]?[A-Z0-9])')
+
+class TextExtractor(HTMLParser):
+    """Collects paragraph-sized text blocks and the page's meta description.
+
+    Blocks inside ``<article>`` or ``<main>`` are kept separately, so a page with a
+    marked-up content area can ignore its sidebars and comment threads.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.content_depth = 0
+        self.current: List[str] = []
+        self.blocks: List[str] = []
+        self.content_blocks: List[str] = []
+        self.description = ''
+
+    def _flush(self):
+        text = ' '.join(' '.join(self.current).split())
+        self.current = []
+        if text:
+            self.blocks.append(text)
+            if self.content_depth:
+                self.content_blocks.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attrs = dict(attrs)
+            if attrs.get('name') == 'description' or attrs.get('property') == 'og:description':
+                self.description = self.description or ' '.join((attrs.get('content') or '').split())
+            return
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+        if tag in CONTENT_TAGS:
+            self.content_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+        if tag in CONTENT_TAGS:
+            self.content_depth = max(0, self.content_depth - 1)
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.current.append(data)
+
+def extract_text(html: str) -> Dict[str, Any]:
+    """Main text of a page as ``{text, description}``; only prose-like blocks are kept"""
+    parser = TextExtractor()
+    parser.feed(html)
+    parser.close()
+    parser._flush()
+
+    def prose(blocks):
+        return [block for block in blocks if len(block) >= 40 and len(block.split()) >= 6]
+
+    blocks = prose(parser.content_blocks) or prose(parser.blocks)
+    return {'text': '\n'.join(blocks), 'description': parser.description}
+
+def summarize(text: str, title: str = '', sentences: int = 3, max_chars: int = 400) -> str:
+    """Pick the ``sentences`` most representative sentences of ``text``, in their original order.
+
+    A sentence scores by how frequent its content words are across the whole text,
+    normalized for length, with a bonus for words shared with the title and for
+    appearing early (articles tend to lead with the point).
+    """
+    candidates = [sentence.strip() for sentence in SENTENCE_RE.split(text.replace('\n', ' '))]
+    # Boilerplate repeated across a page (bylines, calls to action) counts once
+    candidates = [sentence for sentence in dict.fromkeys(candidates) if 6 <= len(sentence.split()) <= 60]
+    if not candidates:
+        return ''
+
+    def words(value):
+        return [word for word in TOKEN_RE.findall(value.lower()) if word not in STOPWORDS]
+
+    frequency: Dict[str, int] = {}
+    for sentence in candidates:
+        for word in words(sentence):
+            frequency[word] = frequency.get(word, 0) + 1
+    title_words = set(words(title))
+
+    scored = []
+    for position, sentence in enumerate(candidates):
+        sentence_words = set(words(sentence))
+        if not sentence_words:
+            continue
+        score = sum(frequency[word] for word in sentence_words) / math.sqrt(len(sentence_words))
+        score *= 1 + 0.5 * len(sentence_words & title_words) / (len(title_words) or 1)
+        score *= 1.2 if position < 3 else 1
+        scored.append((score, position, sentence))
+
+    chosen = sorted(sorted(scored, reverse=True)[:sentences], key=lambda entry: entry[1])
+    summary = ' '.join(sentence for _, _, sentence in chosen)
+    return summary if len(summary) <= max_chars else summary[:max_chars].rsplit(' ', 1)[0] + '…'
+
+def article_url(item: Dict[str, Any]) -> Optional[str]:
+    """The external page worth reading for ``item``, or None"""
+    url = item_link(item)
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        return None
+    host = (parts.hostname or '').lower()
+    host = host[4:] if host.startswith('www.') else host
+    if host in SKIP_HOSTS or parts.path.lower().endswith(SKIP_EXTENSIONS):
+        return None
+    return url
+
+class ArticleEnricher:
+    """Adds ``article_summary`` to items that link to an article.
+
+    Pages are fetched concurrently through an :class:`AsyncHTTPPool`, reading at
+    most ``max_bytes`` of each body, and only HTML is parsed. Parsing and
+    summarizing run on the pool's worker threads. Results, including pages that
+    turned out not to be articles (non-HTML) or are gone (``PERMANENT_STATUSES``),
+    are cached in the item cache under the ``article`` source, keyed by canonical
+    URL and never refreshed, so each article is fetched once however many runs or
+    items mention it. Timeouts, server errors and every other error status
+    (rate limits, 408, a bot wall's 403) are not cached and are retried next run.
+    """
+
+    def __init__(self, cache: Optional[ItemCache] = None, max_concurrency: int = 16, timeout: float = 10,
+                 max_bytes: int = 512 * 1024, summary_sentences: int = 3, summary_chars: int = 400):
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.summary_sentences = summary_sentences
+        self.summary_chars = summary_chars
+        self.fetched = 0
+        self.cached = 0
+
+    def _digest(self, body: bytes, encoding: str, title: str) -> Dict[str, Any]:
+        page = extract_text(body.decode(encoding, errors='replace'))
+        summary = summarize(page['text'], title, self.summary_sentences, self.summary_chars)
+        return {'summary': summary or page['description'][:self.summary_chars],
+                'words': len(page['text'].split())}
+
+    async def _fetch(self, pool: AsyncHTTPPool, url: str, title: str) -> Optional[Dict[str, Any]]:
+        try:
+            response, body = await pool.get_capped(url, self.max_bytes)
+        except requests.RequestException:
+            return None
+
+        if response.status_code >= 400 and response.status_code not in PERMANENT_STATUSES:
+            return None
+        content_type = response.headers.get('Content-Type', '')
+        if response.status_code >= 400 or 'html' not in content_type:
+            return {'summary': '', 'status': response.status_code, 'content_type': content_type}
+
+        # Without a declared charset requests guesses Latin-1; modern pages are UTF-8
+        encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
+        loop = asyncio.get_running_loop()
+        article = await loop.run_in_executor(pool.executor, partial(self._digest, body, encoding or 'utf-8', title))
+        article['status'] = response.status_code
+        return article
+
+    async def enrich(self, items: List[Dict[str, Any]], **pool_options) -> int:
+        """Attach ``article_summary`` to every item whose page yields one; return how many did"""
+        by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            url = article_url(item)
+            if url:
+                by_url.setdefault(canonicalize_url(url), []).append(item)
+        if not by_url:
+            return 0
+
+        keys = list(by_url)
+        if self.cache:
+            articles, to_fetch = self.cache.lookup('article', keys, refresh_if=lambda article: False)
+        else:
+            articles, to_fetch = {}, keys
+        self.cached += len(articles)
+
+        if to_fetch:
+            pool = AsyncHTTPPool(max_concurrency=self.max_concurrency, timeout=self.timeout, **pool_options)
+            try:
+                results = await asyncio.gather(*(
+                    self._fetch(pool, article_url(by_url[key][0]), by_url[key][0].get('title', ''))
+                    for key in to_fetch
+                ))
+            finally:
+                pool.close()
+
+            fetched = {key: article for key, article in zip(to_fetch, results) if article is not None}
+            self.fetched += len(fetched)
+            if self.cache:
+                self.cache.put_many('article', fetched)
+            articles.update(fetched)
+
+        enriched = 0
+        for key, article in articles.items():
+            if not article.get('summary'):
+                continue
+            for item in by_url[key]:
+                item['article_summary'] = article['summary']
+                enriched += 1
+        return enriched
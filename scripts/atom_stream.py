@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Streaming Atom Reader
+Incremental arXiv Atom parsing with xml.etree.iterparse
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, Union, BinaryIO
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+ARXIV = '{http://arxiv.org/schemas/atom}'
+
+def _text(elem: Optional[ET.Element]) -> str:
+    return ' '.join((elem.text or '').split()) if elem is not None else ''
+
+def _parse_entry(elem: ET.Element) -> Dict[str, Any]:
+    published = datetime.strptime(elem.findtext(f'{ATOM}published', '').strip(), '%Y-%m-%dT%H:%M:%SZ')
+
+    link = ''
+    for link_elem in elem.iterfind(f'{ATOM}link'):
+        if link_elem.get('rel', 'alternate') == 'alternate':
+            link = link_elem.get('href', '')
+            break
+
+    primary = elem.find(f'{ARXIV}primary_category')
+
+    return {
+        'id': (elem.findtext(f'{ATOM}id') or '').strip(),
+        'title': _text(elem.find(f'{ATOM}title')),
+        'summary': (elem.findtext(f'{ATOM}summary') or '').strip(),
+        'url': link,
+        'authors': [_text(author.find(f'{ATOM}name')) for author in elem.iterfind(f'{ATOM}author')],
+        'published': published,
+        'primary_category': primary.get('term') if primary is not None else None,
+        'categories': [category.get('term') for category in elem.iterfind(f'{ATOM}category')]
+    }
+
+def iter_arxiv_entries(source: Union[bytes, BinaryIO],
+                       stop_before: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Yield arXiv entries one at a time as their closing tag is read.
+
+    Only the fields the collector uses are extracted, and each ``<entry>`` subtree is
+    discarded once yielded, so memory stays at one entry regardless of page size.
+    arXiv results are sorted newest first, so with ``stop_before`` set the reader
+    stops at the first older entry without reading the rest of the document.
+    """
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    root = None
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = elem
+            continue
+        if event != 'end' or elem.tag != f'{ATOM}entry':
+            continue
+
+        entry = _parse_entry(elem)
+        root.clear()
+
+        if stop_before and entry['published'] < stop_before:
+            return
+        yield entry
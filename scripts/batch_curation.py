@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Batch Curation
+Map-reduce curation: token-budgeted item batches scored concurrently, then one
+small call that picks each section's top items and writes the weekly summary
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional
+
+from curation_schema import (ITEM_SCHEMA, PICKS_TOOL, SCORES_TOOL, compile_schema, format_errors, picks_tool,
+                             scores_tool)
+from json_stream import IncrementalJSONParser, Path
+from llm_cache import LLMCache, create_message, message_text, stream_message
+
+# Rough size of a token in JSON-heavy English text
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(value: Any) -> int:
+    """Approximate prompt tokens for ``value`` (a string, or anything JSON-serializable)"""
+    text = value if isinstance(value, str) else json.dumps(value, separators=(',', ':'))
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def token_batches(items: List[Dict[str, Any]], batch_tokens: int) -> List[List[Dict[str, Any]]]:
+    """Split ``items`` into consecutive batches of about ``batch_tokens`` each.
+
+    An item larger than the budget gets a batch of its own.
+    """
+    batches: List[List[Dict[str, Any]]] = []
+    batch: List[Dict[str, Any]] = []
+    used = 0
+    for item in items:
+        size = estimate_tokens(item)
+        if batch and used + size > batch_tokens:
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(item)
+        used += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+def parse_json_response(response_text: str) -> Dict[str, Any]:
+    """The JSON object in a Claude response, with any markdown code fence removed.
+
+    Raises ValueError (JSONDecodeError included) if there isn't one.
+    """
+    json_str = response_text.strip()
+
+    # Remove opening code fence
+    for prefix in ['```json\n', '```json', '```\n', '```']:
+        if json_str.startswith(prefix):
+            json_str = json_str[len(prefix):]
+            break
+
+    # Remove closing code fence
+    if '\n```' in json_str:
+        json_str = json_str[:json_str.rfind('\n```')]
+    elif json_str.endswith('```'):
+        json_str = json_str[:-3]
+
+    json_str = json_str.strip()
+
+    # Validate we have JSON
+    if not json_str.startswith('{'):
+        raise ValueError(f"Response doesn't start with '{{': {json_str[:100]}")
+
+    if not json_str.endswith('}'):
+        raise ValueError(f"Response doesn't end with '}}': {json_str[-100:]}")
+
+    return json.loads(json_str)
+
+class MapReduceCurator:
+    """Curates any number of items in roughly two calls' latency.
+
+    Map: the items are cut into batches of about ``batch_tokens`` prompt tokens,
+    and each batch is scored and assigned to a section, at most ``max_parallel``
+    calls at a time. Items are referred to by index, so a batch's response holds
+    only ids, sections, insights and scores. A batch whose response is truncated
+    or unparseable is split in half and retried, so one bad batch never sinks
+    the run.
+
+    Reduce: the ``candidates_per_section`` best-scored items of each section go
+    to a final small call, which picks the top ``max_items`` per section and
+    writes ``weekly_summary``. The result has the same shape as a single-prompt
+    curation.
+
+    With ``structured``, both steps answer through a forced tool call
+    (``record_scores`` and ``record_picks``) and the answer is checked against
+    the tool's schema; a map answer that fails it is split and retried like an
+    unparseable one.
+
+    With ``stream``, the reduce call is streamed and each pick is handed to
+    ``on_item(section, index, item)`` as soon as its id arrives, so later stages
+    can start before the weekly summary is written. Without it, ``on_item`` is
+    called for every pick once the response is complete. Either way, only picks
+    that pass the item schema are passed on.
+    """
+
+    def __init__(self, client, cache: Optional[LLMCache], model: str, focus_topics: List[str],
+                 sections: List[Dict[str, Any]], batch_tokens: int = 6000, max_parallel: int = 4,
+                 candidates_per_section: int = 15, structured: bool = True, stream: bool = False,
+                 on_item: Optional[Callable[[str, int, Dict[str, Any]], None]] = None):
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.focus_topics = focus_topics
+        self.sections = sections
+        self.batch_tokens = batch_tokens
+        self.max_parallel = max_parallel
+        self.candidates_per_section = candidates_per_section
+        self.structured = structured
+        self.stream = stream
+        self.on_item = on_item
+        self.scores_tool = scores_tool([s['name'] for s in sections])
+        self.picks_tool = picks_tool(sections)
+        self.calls = 0
+
+    def _call(self, prompt: str, max_tokens: int, tool: Dict[str, Any],
+              on_entry: Optional[Callable[[Path, Any], None]] = None) -> Dict[str, Any]:
+        """The answer to ``prompt``; with ``on_entry``, streamed and each ``sections`` entry passed to it on arrival"""
+        request = dict(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        if self.structured:
+            request.update(tools=[tool], tool_choice={"type": "tool", "name": tool['name']})
+        self.calls += 1
+        try:
+            if on_entry:
+                parser = IncrementalJSONParser(watch=lambda path: len(path) == 3 and path[0] == 'sections',
+                                               on_value=on_entry)
+                stream_message(self.client, self.cache, parser.feed, **request)
+                answer = parser.close()
+            else:
+                answer = parse_json_response(message_text(create_message(self.client, self.cache, **request)))
+            if self.structured:
+                errors = compile_schema(tool['input_schema'])(answer)
+                if errors:
+                    raise ValueError(f"{tool['name']} failed the schema: {format_errors(errors)}")
+            return answer
+        except ValueError:
+            # Don't let a rerun get the same unusable response from the cache
+            if self.cache:
+                self.cache.invalidate(request)
+            raise
+
+    def _output_instructions(self, tool_name: str, structure: str, note: str = '') -> str:
+        if self.structured:
+            return f"Record your answer with the {tool_name} tool{f' ({note})' if note else ''}."
+        return f"""CRITICAL: Return ONLY valid JSON. No markdown, no code blocks, no explanatory text. Start with {{ and end with }}.
+
+Structure{f' ({note})' if note else ''}:
+{structure}"""
+
+    def _map_prompt(self, batch: List[Dict[str, Any]]) -> str:
+        section_names = [s['name'] for s in self.sections]
+        return f"""Score items for a weekly digest on agentic AI - autonomous agents, multi-agent systems, tool use, planning, reasoning.
+
+Focus topics: {', '.join(self.focus_topics)}
+
+An item's "keywords" lists the tracked topics it mentions. Items "featured in an earlier digest" score low unless there is major news about them.
+
+For each item relevant to agentic AI and agent capabilities, give:
+- "id": the item's id
+- "section": one of {json.dumps(section_names)}
+- "insight": one sentence on what makes it important/interesting
+- "score": relevance 1-10
+
+Leave out items scoring below 4.
+
+Items:
+
+{json.dumps(batch, separators=(',', ':'))}
+
+{self._output_instructions(SCORES_TOOL, '{"items": [{"id": 0, "section": "...", "insight": "...", "score": 7}]}')}"""
+
+    def _map_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Scored entries for ``batch``; runs on a worker thread"""
+        try:
+            scored = self._call(self._map_prompt(batch), min(8192, 200 + 120 * len(batch)), self.scores_tool)
+            return [entry for entry in scored.get('items', []) if isinstance(entry, dict)]
+        except ValueError as e:
+            if len(batch) == 1:
+                print(f"  ⚠️  Skipping item {batch[0]['id']}: {e}")
+                return []
+            print(f"  ⚠️  Splitting a batch of {len(batch)} items after a bad response: {e}")
+            middle = len(batch) // 2
+            return self._map_batch(batch[:middle]) + self._map_batch(batch[middle:])
+
+    def _reduce_prompt(self, candidates: Dict[str, List[Dict[str, Any]]]) -> str:
+        limits = ', '.join(f"{s['name']}: {s['max_items']}" for s in self.sections)
+        structure = f"""{{
+  "sections": {{{', '.join(f'"{s["name"]}": [0]' for s in self.sections)}}},
+  "weekly_summary": "2-3 sentence summary of week's major themes"
+}}"""
+        return f"""Finalize a weekly digest on agentic AI - autonomous agents, multi-agent systems, tool use, planning, reasoning.
+
+Focus topics: {', '.join(self.focus_topics)}
+
+These candidates were already scored (1-10) and assigned a section. Tasks:
+
+1. Select the TOP items per section: {limits}
+   Prefer higher scores, but avoid picking several items about the same story. You may move an item to a better-fitting section.
+2. Write a 2-3 sentence summary of the week's major themes.
+
+Candidates by section:
+
+{json.dumps(candidates, indent=1)}
+
+{self._output_instructions(PICKS_TOOL, structure, "ids in order of importance")}"""
+
+    async def curate(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Curate ``items`` (prompt entries with title, url, meta, ...) into sections"""
+        numbered = [dict(item, id=index) for index, item in enumerate(items)]
+        batches = token_batches(numbered, self.batch_tokens)
+        print(f"  Scoring {len(items)} items in {len(batches)} batches ({self.max_parallel} at a time)...")
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, self._map_batch, batch) for batch in batches
+            ))
+
+        # Keep each item's best entry, dropping ids and sections the model made up
+        section_names = [s['name'] for s in self.sections]
+        scored: Dict[int, Dict[str, Any]] = {}
+        for entry in (entry for result in results for entry in result):
+            item_id, section = entry.get('id'), entry.get('section')
+            if not isinstance(item_id, int) or not 0 <= item_id < len(items) or section not in section_names:
+                continue
+            try:
+                entry['score'] = float(entry.get('score', 0))
+            except (TypeError, ValueError):
+                continue
+            if item_id not in scored or entry['score'] > scored[item_id]['score']:
+                scored[item_id] = entry
+        if not scored:
+            raise ValueError("No batch produced any usable scores")
+
+        candidates: Dict[str, List[Dict[str, Any]]] = {name: [] for name in section_names}
+        for item_id, entry in sorted(scored.items(), key=lambda pair: -pair[1]['score']):
+            if len(candidates[entry['section']]) < self.candidates_per_section:
+                item = items[item_id]
+                candidates[entry['section']].append({
+                    'id': item_id, 'title': item['title'], 'meta': item['meta'],
+                    'insight': entry.get('insight', ''), 'score': entry['score']
+                })
+        print(f"  {len(scored)} relevant items; picking the top ones per section...")
+
+        curated = {'sections': {name: [] for name in section_names}, 'weekly_summary': ''}
+        limits = {s['name']: s['max_items'] for s in self.sections}
+        validate_item = compile_schema(ITEM_SCHEMA)
+        used = set()
+
+        def pick(name: str, item_id: Any):
+            """Add ``item_id`` to section ``name`` unless it's unknown, already picked or over the limit"""
+            if (name not in curated['sections'] or not isinstance(item_id, int) or item_id not in scored
+                    or item_id in used or len(curated['sections'][name]) >= limits[name]):
+                return
+            used.add(item_id)
+            item, entry = items[item_id], scored[item_id]
+            score = entry['score']
+            picked = {
+                'title': item['title'], 'url': item['url'], 'meta': item['meta'],
+                'insight': entry.get('insight', ''), 'score': int(score) if score.is_integer() else score
+            }
+            curated['sections'][name].append(picked)
+            if self.stream:
+                print(f"  ✓ {name}: {item['title'][:70]}")
+            # Picks that fail the item schema are repaired later, so nobody is told about them
+            if self.on_item and not validate_item(picked):
+                self.on_item(name, len(curated['sections'][name]) - 1, picked)
+
+        prompt = self._reduce_prompt(candidates)
+        if self.stream:
+            reduced = self._call(prompt, 2048, self.picks_tool, on_entry=lambda path, item_id: pick(path[1], item_id))
+        else:
+            reduced = self._call(prompt, 2048, self.picks_tool)
+            for name, ids in (reduced.get('sections') or {}).items():
+                for item_id in ids if isinstance(ids, list) else []:
+                    pick(name, item_id)
+        curated['weekly_summary'] = reduced.get('weekly_summary', '')
+        return curated
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Collector Benchmark
+Replays a recorded cassette through AINewsCollector.collect_all and times it
+
+Record a cassette first:  python3 collect_news.py --record ../data/cassettes/week.jsonl.gz
+Usage: python3 benchmark_collect.py CASSETTE [latency_ms] [repeats]
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+from cassette import Cassette
+from collect_news import AINewsCollector
+from dedup import news_lists
+
+async def replay_once(cassette_path: str, latency: float):
+    """One full collection from the cassette into a throwaway data directory"""
+    cassette = Cassette(cassette_path, mode='replay', latency=latency)
+    with tempfile.TemporaryDirectory() as data_dir:
+        collector = AINewsCollector(cassette=cassette, data_dir=data_dir)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            news = await collector.collect_all()
+        elapsed = time.perf_counter() - start
+
+    items = sum(len(news[key]) for key in news_lists(news))
+    return elapsed, cassette.replayed, cassette.misses, items
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        sys.exit(1)
+
+    cassette_path = sys.argv[1]
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    print(f"📼 Replaying {cassette_path} with {latency_ms:g} ms per request, median of {repeats} runs\n")
+
+    runs = [asyncio.run(replay_once(cassette_path, latency_ms / 1000)) for _ in range(repeats)]
+    elapsed, requests_made, misses, items = sorted(runs)[len(runs) // 2]
+
+    print(f"  collect_all  {elapsed * 1000:9.1f} ms   {requests_made:,} requests   "
+          f"{requests_made / elapsed:,.0f} req/s   {items:,} items")
+    if misses:
+        print(f"  ⚠️  {misses} requests were not in the cassette (collector behaviour changed?)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+HTTP Cassettes
+Record every upstream HTTP exchange to a file and replay it offline
+"""
+
+import base64
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+class CassetteMiss(requests.RequestException):
+    """A replayed request that the cassette holds no recording of"""
+
+class Cassette:
+    """A gzipped JSON-lines file of HTTP exchanges, keyed by method and URL.
+
+    The first line is a header with the recording time. Each following line holds
+    one response: status, headers and body (text, or base64 for binary bodies).
+    In ``record`` mode, sessions mounted with :meth:`mount` hit the network and
+    append every exchange. In ``replay`` mode they never touch the network.
+    Responses are served from the file after ``latency`` seconds, so a replayed run
+    has the same shape as a live one but is deterministic. Repeated requests for
+    one URL replay its recordings in order, and the last one repeats. A streamed
+    response is recorded as far as the caller reads it, so a capped read stays capped.
+    """
+
+    def __init__(self, path: Path, mode: str = 'replay', latency: float = 0.0):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.recorded_at = datetime.now()
+        self.exchanges: Dict[str, List[Dict[str, Any]]] = {}
+        self.replayed = 0
+        self.misses = 0
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if mode == 'replay':
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            self.recorded_at = datetime.fromisoformat(header['recorded_at'])
+            for line in f:
+                exchange = json.loads(line)
+                self.exchanges.setdefault(exchange['key'], []).append(exchange)
+
+    def save(self):
+        """Write the recorded exchanges (record mode only)"""
+        if self.replaying:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'recorded_at': self.recorded_at.isoformat()}) + '\n')
+            for exchanges in self.exchanges.values():
+                for exchange in exchanges:
+                    f.write(json.dumps(encode_body(exchange)) + '\n')
+        tmp_path.replace(self.path)
+
+    def record(self, method: str, url: str, response: requests.Response, stream: bool = False):
+        """Add an exchange; with ``stream``, its body is the part of ``response`` read from now on"""
+        exchange = {'key': self.key(method, url), 'status': response.status_code,
+                    'headers': dict(response.headers)}
+        if stream:
+            exchange['raw_body'] = bytearray()
+            response.raw = TeeReader(response.raw, exchange['raw_body'])
+        else:
+            exchange['raw_body'] = response.content
+
+        # Bodies are stored decoded, so the encoding headers no longer apply
+        for name in ('Content-Encoding', 'Transfer-Encoding', 'Content-Length'):
+            exchange['headers'].pop(name, None)
+
+        with self._lock:
+            self.exchanges.setdefault(exchange['key'], []).append(exchange)
+
+    def next_exchange(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        key = self.key(method, url)
+        with self._lock:
+            recorded = self.exchanges.get(key)
+            if not recorded:
+                self.misses += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = min(position + 1, len(recorded) - 1)
+            self.replayed += 1
+            return recorded[position]
+
+    def mount(self, session: requests.Session, adapter: Optional[HTTPAdapter] = None):
+        """Route ``session`` through this cassette (``adapter`` does the real work when recording)"""
+        transport = ReplayAdapter(self) if self.replaying else RecordingAdapter(self, adapter or HTTPAdapter())
+        session.mount('https://', transport)
+        session.mount('http://', transport)
+
+    def summary(self) -> str:
+        if self.replaying:
+            return f"{self.replayed} responses replayed, {self.misses} not in cassette"
+        return f"{sum(len(exchanges) for exchanges in self.exchanges.values())} exchanges recorded"
+
+def encode_body(exchange: Dict[str, Any]) -> Dict[str, Any]:
+    """``exchange`` with its recorded bytes as ``body`` text, or ``body_b64`` for binary bodies"""
+    exchange = dict(exchange)
+    body = bytes(exchange.pop('raw_body'))
+    try:
+        exchange['body'] = body.decode('utf-8')
+    except UnicodeDecodeError:
+        exchange['body_b64'] = base64.b64encode(body).decode('ascii')
+    return exchange
+
+class TeeReader:
+    """Wraps a urllib3 response and copies every decoded chunk read through ``stream`` into ``body``"""
+
+    def __init__(self, raw, body: bytearray):
+        self.raw = raw
+        self.body = body
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None):
+        for chunk in self.raw.stream(amt, decode_content=decode_content):
+            self.body += chunk
+            yield chunk
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests through a real adapter and copies each exchange into the cassette"""
+
+    def __init__(self, cassette: Cassette, adapter: HTTPAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        method, url = request.method, request.url
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(method, url, response, stream=kwargs.get('stream', False))
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+class ReplayAdapter(BaseAdapter):
+    """Answers requests from the cassette after its configured latency"""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        if self.cassette.latency:
+            time.sleep(self.cassette.latency)
+
+        exchange = self.cassette.next_exchange(request.method, request.url)
+        if exchange is None:
+            raise CassetteMiss(f"{request.method} {request.url} is not in the cassette", request=request)
+
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response._content = (base64.b64decode(exchange['body_b64']) if 'body_b64' in exchange
+                             else exchange['body'].encode('utf-8'))
+        response._content_consumed = True  # Lets streamed reads iterate the stored body
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.reason = ''
+        return response
+
+    def close(self):
+        pass
@@ -4,190 +4,522 @@ AI News Aggregator
 Collects AI news from multiple sources for weekly digest
 """
 
+import argparse
 import asyncio
-import json
+import copy
+import re
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
-import feedparser
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
+
+from atom_stream import iter_arxiv_entries
+from cassette import Cassette
+from digest_repo import DigestRepository
+from featured_filter import FeaturedFilter
+from http_cache import HTTPCache
+from http_pool import AsyncHTTPPool
+from hn_week_scan import HNWeekScanner, FETCH_FAILED
+from item_cache import ItemCache
+from keyword_matcher import KeywordMatcher
+from resilience import Resilience
+from raw_store import RawNewsStore, SOURCE_KEYS, item_key
+from sources import SourcePlugin, build_sources, stream_batches
+
+HN_API = "https://hacker-news.firebaseio.com/v0"
+ARXIV_API = "http://export.arxiv.org/api/query"
+
+def parse_arxiv_feed(content: bytes, stop_before: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Reduce an arXiv Atom response to the JSON-serializable fields the collector uses"""
+    entries = []
+    for entry in iter_arxiv_entries(content, stop_before=stop_before):
+        entry['authors'] = entry['authors'][:3]
+        entry['published'] = entry['published'].isoformat()
+        entries.append(entry)
+    return entries
+
+def arxiv_id(entry_id: str) -> str:
+    """Strip the URL prefix and version from an arXiv entry ID (.../abs/2401.01234v2 -> 2401.01234)"""
+    return re.sub(r'v\d+$', '', entry_id.rsplit('/abs/', 1)[-1])
 
 class AINewsCollector:
-    def __init__(self, config_path: str = "../config.yaml"):
+    def __init__(self, config_path: str = "../config.yaml", incremental: Optional[bool] = None,
+                 cassette: Optional[Cassette] = None, data_dir: Optional[Path] = None):
         self.base_dir = Path(__file__).parent.parent
         config_file = self.base_dir / "config.yaml"
 
         with open(config_file) as f:
             self.config = yaml.safe_load(f)
 
-        self.data_dir = self.base_dir / "data"
+        self.data_dir = Path(data_dir) if data_dir else self.base_dir / "data"
         self.data_dir.mkdir(exist_ok=True)
 
-        self.today = datetime.now()
+        # A cassette records every HTTP exchange, or replays a recording offline.
+        # A replay runs as of the recording time so the same week window applies.
+        self.cassette = cassette
+        self.today = cassette.recorded_at if cassette and cassette.replaying else datetime.now()
         self.week_ago = self.today - timedelta(days=7)
 
-    async def collect_arxiv(self) -> List[Dict[str, Any]]:
-        """Collect recent AI papers from arXiv"""
-        if not self.config['sources']['arxiv']['enabled']:
-            return []
+        # Incremental runs only look back to the previous run of each source (plus
+        # an overlap) and append what is new or has changed since then
+        collection_config = self.config.get('collection', {})
+        self.incremental = collection_config.get('incremental', False) if incremental is None else incremental
+        self.overlap = timedelta(hours=collection_config.get('overlap_hours', 24))
+        self.store = RawNewsStore(self.data_dir)
+        self.cursors = self.store.load_cursors()
+
+        # Items featured in an earlier digest are dropped (or flagged) before curation
+        featured_config = self.config.get('featured', {})
+        self.featured_action = featured_config.get('action', 'drop')
+        self.featured = None
+        if featured_config.get('enabled', True):
+            self.featured = FeaturedFilter(
+                self.data_dir,
+                capacity=featured_config.get('capacity', 20000),
+                error_rate=featured_config.get('error_rate', 0.01),
+                exclude=[f"curated_{self.today.strftime('%Y%m%d')}.json"]
+            )
+
+        # Built once and shared by every collector
+        self.keyword_matcher = KeywordMatcher(self.config['sources']['hackernews']['keywords'])
+
+        # Retry/hedging policy, circuit breakers and latency stats for every upstream host
+        resilience_config = self.config.get('resilience', {})
+        self.resilience = Resilience(
+            retries=resilience_config.get('retries', 2),
+            backoff_base=resilience_config.get('backoff_base', 0.5),
+            backoff_max=resilience_config.get('backoff_max', 8),
+            hedge=resilience_config.get('hedge', True),
+            hedge_min_samples=resilience_config.get('hedge_min_samples', 20),
+            hedge_budget=resilience_config.get('hedge_budget', 0.1),
+            breaker_failures=resilience_config.get('breaker_failures', 5),
+            breaker_reset_seconds=resilience_config.get('breaker_reset_seconds', 30)
+        )
 
+        cache_config = self.config.get('cache', {})
+        self.item_cache = None
+        self.http_cache = None
+        # Cassette runs bypass the caches so every request is recorded in full and
+        # every replay does the same work
+        if cache_config.get('enabled', True) and not cassette:
+            self.item_cache = ItemCache(
+                self.data_dir / "item_cache.db",
+                ttl_seconds=cache_config.get('ttl_minutes', 360) * 60
+            )
+            self.http_cache = HTTPCache(self.data_dir / "http_cache")
+
+        # One plugin per enabled `sources:` entry; their pools share one worker pool
+        self.sources = build_sources(self.config['sources'], self)
+        self.max_workers = collection_config.get('max_workers', 96)
+
+    def _make_pool(self, plugin: SourcePlugin, executor: ThreadPoolExecutor) -> AsyncHTTPPool:
+        return AsyncHTTPPool(**plugin.pool_options(), http_cache=self.http_cache, cassette=self.cassette,
+                             resilience=self.resilience, executor=executor)
+
+    def _since(self, source: str) -> datetime:
+        """Oldest post time ``source`` needs to cover in this run"""
+        cursor = self.cursors.get(source)
+        if not self.incremental or not cursor:
+            return self.week_ago
+        return max(self.week_ago, datetime.fromisoformat(cursor['last_run']) - self.overlap)
+
+    def _check_featured(self, source: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop or flag items that already appeared in a past digest"""
+        if not self.featured:
+            return items
+
+        kept = []
+        repeats = 0
+        for item in items:
+            if self.featured.seen(item):
+                repeats += 1
+                if self.featured_action == 'drop':
+                    continue
+                item['previously_featured'] = True
+            kept.append(item)
+
+        if repeats:
+            verb = 'Dropped' if self.featured_action == 'drop' else 'Flagged'
+            print(f"  {verb} {repeats} {source} items featured in earlier digests")
+        return kept
+
+    def _update_cursor(self, source: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record this run in ``source``'s cursor and return the items worth appending.
+
+        The cursor remembers each item's score and comment count when it was last
+        stored. Items that are new, or whose engagement has changed, are returned;
+        in a full run everything is.
+        """
+        cursor = self.cursors.get(source, {'seen': {}})
+        seen = cursor['seen']
+        now = self.today.isoformat()
+
+        changed = []
+        for item in items:
+            key = item_key(item)
+            engagement = [item.get('score', 0), item.get('comments', 0)]
+            previous = seen.get(key)
+            if previous is None or previous[:2] != engagement or not self.incremental:
+                changed.append(item)
+            seen[key] = engagement + [previous[2] if previous else now]
+
+        # Anything first seen before the window can no longer be collected again
+        cutoff = self.week_ago.isoformat()
+        cursor['seen'] = {key: entry for key, entry in seen.items() if entry[2] >= cutoff}
+        cursor['last_run'] = now
+        self.cursors[source] = cursor
+        self.store.save_cursors(self.cursors)
+        return changed
+
+    async def _cached_json(self, source: str, key: str, fetch) -> Any:
+        """Return a cached response for ``key`` while it is fresh, else await ``fetch()``"""
+        if not self.item_cache:
+            return await fetch()
+
+        cached, to_fetch = self.item_cache.lookup(source, [key])
+        if not to_fetch:
+            return cached[key]
+
+        try:
+            data = await fetch()
+        except Exception:
+            if key in cached:
+                return cached[key]
+            raise
+
+        self.item_cache.put_many(source, {key: data})
+        return data
+
+    async def collect_arxiv(self, pool: AsyncHTTPPool) -> List[Dict[str, Any]]:
+        """Collect recent AI papers from arXiv"""
         print("📚 Collecting from arXiv...")
+        since = self._since('arxiv')
         papers = []
-        categories = self.config['sources']['arxiv']['categories']
-        max_papers = self.config['sources']['arxiv']['max_papers']
-
-        for category in categories:
-            url = f"http://export.arxiv.org/api/query?search_query=cat:{category}&sortBy=submittedDate&sortOrder=descending&max_results={max_papers}"
-
-            feed = feedparser.parse(url)
-
-            for entry in feed.entries[:max_papers]:
-                published = datetime(*entry.published_parsed[:6])
-
-                if published >= self.week_ago:
-                    papers.append({
-                        'source': 'arxiv',
-                        'title': entry.title,
-                        'summary': entry.summary.replace('\n', ' ')[:300],
-                        'url': entry.link,
-                        'authors': [author.name for author in entry.authors[:3]],
-                        'published': published.isoformat(),
-                        'category': category
-                    })
+        arxiv_config = self.config['sources']['arxiv']
+        categories = arxiv_config['categories']
+        max_papers = arxiv_config['max_papers']
+        page_size = arxiv_config.get('page_size', 1000)
+
+        # One OR-combined query for all categories, newest first, paged until the
+        # week boundary is crossed (the pool paces requests as arXiv asks)
+        query = '+OR+'.join(f"cat:{category}" for category in categories)
+        seen_ids = set()
+        per_category = {category: 0 for category in categories}
+        start = 0
+        requests_made = 0
+
+        while True:
+            url = f"{ARXIV_API}?search_query={query}&sortBy=submittedDate&sortOrder=descending&start={start}&max_results={page_size}"
+
+            # Parsing stops at the first pre-week entry. An unchanged feed reuses the
+            # stored parse, which stays valid because week_ago only moves forward
+            # (the later incremental boundary is applied below, not in the parse).
+            entries = await pool.get_parsed(url, partial(parse_arxiv_feed, stop_before=self.week_ago))
+            requests_made += 1
+            crossed_boundary = False
+
+            for entry in entries:
+                published = datetime.fromisoformat(entry['published'])
+                if published < since:
+                    crossed_boundary = True
+                    break
+
+                # Pages can shift while new papers arrive, and cross-lists repeat IDs
+                paper_id = arxiv_id(entry['id'])
+                if paper_id in seen_ids:
+                    continue
+                seen_ids.add(paper_id)
+
+                category = entry.get('primary_category')
+                if category not in per_category:
+                    category = next((c for c in entry.get('categories', []) if c in per_category), categories[0])
+                if max_papers and per_category[category] >= max_papers:
+                    continue
+                per_category[category] += 1
+
+                papers.append({
+                    'source': 'arxiv',
+                    'title': entry['title'],
+                    'summary': entry['summary'].replace('\n', ' ')[:300],
+                    'url': entry['url'],
+                    'authors': entry['authors'],
+                    'published': published.isoformat(),
+                    'category': category,
+                    'matched_keywords': self.keyword_matcher.matches(f"{entry['title']} {entry['summary']}")
+                })
+
+            all_full = max_papers and all(count >= max_papers for count in per_category.values())
+            if crossed_boundary or all_full or len(entries) < page_size:
+                break
+            start += page_size
 
+        print(f"  Scanned {len(seen_ids)} papers since {since:%Y-%m-%d %H:%M} in {requests_made} request(s)")
         print(f"  Found {len(papers)} recent papers")
         return papers
 
-    async def collect_hackernews(self) -> List[Dict[str, Any]]:
-        """Collect AI-related stories from Hacker News"""
-        if not self.config['sources']['hackernews']['enabled']:
-            return []
-
-        print("🔥 Collecting from Hacker News...")
-        stories = []
-        keywords = self.config['sources']['hackernews']['keywords']
-        min_score = self.config['sources']['hackernews']['min_score']
-        max_items = self.config['sources']['hackernews']['max_items']
-
-        # Get top stories
-        top_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        response = requests.get(top_url, timeout=10)
-        story_ids = response.json()[:100]  # Check top 100
-
-        for story_id in story_ids:
-            if len(stories) >= max_items:
-                break
-
-            story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-            story_data = requests.get(story_url, timeout=5).json()
+    def _matches_keywords(self, story_data: Dict[str, Any]) -> bool:
+        """Check a live HN story's title against the configured keywords"""
+        if not story_data or story_data.get('type', 'story') != 'story' or 'title' not in story_data:
+            return False
+        if story_data.get('dead') or story_data.get('deleted'):
+            return False
 
-            if not story_data or 'title' not in story_data:
-                continue
+        return self.keyword_matcher.search(story_data['title'])
 
-            title_lower = story_data['title'].lower()
+    def _is_relevant_story(self, story_data: Dict[str, Any]) -> bool:
+        """Check an HN item against the configured keywords and score floor"""
+        min_score = self.config['sources']['hackernews']['min_score']
+        return self._matches_keywords(story_data) and story_data.get('score', 0) >= min_score
+
+    async def _fetch_hn_items(self, pool: AsyncHTTPPool, item_ids: List[int], failed: Any = None) -> List[Any]:
+        """Fetch HN items in order, skipping the network for items the cache can answer.
+
+        A stale cached item is only refetched when its title matches the keywords:
+        for everything else the score can't change whether the story is kept. Deleted
+        items are ``None``, and items that failed to fetch are ``failed`` unless a
+        stale copy is cached.
+        """
+        def urls(ids):
+            return [f"{HN_API}/item/{item_id}.json" for item_id in ids]
+
+        if not self.item_cache:
+            return await pool.get_many_json(urls(item_ids), failed=failed)
+
+        cached, to_fetch = self.item_cache.lookup('hackernews', item_ids, refresh_if=self._matches_keywords)
+        fetched = dict(zip(to_fetch, await pool.get_many_json(urls(to_fetch), failed=failed)))
+        self.item_cache.put_many('hackernews', {item_id: item for item_id, item in fetched.items()
+                                                if item and item is not failed})
+
+        items = []
+        for item_id in item_ids:
+            item = fetched[item_id] if item_id in fetched else cached.get(item_id)
+            if (item is None or item is failed) and item_id in cached:
+                item = cached[item_id]
+            items.append(item)
+        return items
+
+    def _format_story(self, story_data: Dict[str, Any]) -> Dict[str, Any]:
+        story_id = story_data['id']
+        return {
+            'source': 'hackernews',
+            'title': story_data['title'],
+            'url': story_data.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
+            'score': story_data.get('score', 0),
+            'comments': story_data.get('descendants', 0),
+            'time': datetime.fromtimestamp(story_data['time']).isoformat(),
+            'matched_keywords': self.keyword_matcher.matches(story_data['title'])
+        }
 
-            # Check if story matches AI keywords
-            if any(keyword in title_lower for keyword in keywords):
-                if story_data.get('score', 0) >= min_score:
-                    stories.append({
-                        'source': 'hackernews',
-                        'title': story_data['title'],
-                        'url': story_data.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                        'score': story_data.get('score', 0),
-                        'comments': story_data.get('descendants', 0),
-                        'time': datetime.fromtimestamp(story_data['time']).isoformat()
-                    })
+    async def collect_hackernews(self, pool: AsyncHTTPPool) -> List[Dict[str, Any]]:
+        """Collect AI-related stories from Hacker News"""
+        print("🔥 Collecting from Hacker News...")
+        hn_config = self.config['sources']['hackernews']
+        max_items = hn_config['max_items']
+        week_mode = hn_config.get('mode', 'top') == 'week'
+
+        if week_mode:
+            # Walk every item posted this week, then keep the highest-scoring matches
+            scanner = HNWeekScanner(
+                lambda item_ids: self._fetch_hn_items(pool, item_ids, failed=FETCH_FAILED),
+                cursor_path=self.data_dir / "hn_scan_cursor.json",
+                batch_size=hn_config.get('scan_batch_size', 2000)
+            )
+            max_id = await pool.get_json(f"{HN_API}/maxitem.json", timeout=10)
+            # Always the whole week, even on incremental runs: a story posted before the
+            # previous run can still climb past min_score, and the item cache answers
+            # everything else without a request
+            matches = await scanner.scan(max_id, self.week_ago, self._is_relevant_story)
+            matches.sort(key=lambda item: item.get('score', 0), reverse=True)
+        else:
+            # Fetch the top 100 stories concurrently; results come back in rank order
+            top_ids = await self._cached_json(
+                'hackernews', 'topstories',
+                lambda: pool.get_cached_json(f"{HN_API}/topstories.json", timeout=10)
+            )
+            story_ids = top_ids[:100]
+            matches = [item for item in await self._fetch_hn_items(pool, story_ids)
+                       if self._is_relevant_story(item)]
+
+        stories = [self._format_story(item) for item in matches[:max_items]]
 
         print(f"  Found {len(stories)} relevant stories")
         return stories
 
-    async def collect_reddit(self) -> List[Dict[str, Any]]:
-        """Collect AI discussions from Reddit"""
-        if not self.config['sources']['reddit']['enabled']:
-            return []
+    async def _collect_subreddit(self, pool: AsyncHTTPPool, subreddit: str) -> List[Dict[str, Any]]:
+        """Page through a subreddit's weekly top listing until posts drop below the score floor"""
+        reddit_config = self.config['sources']['reddit']
+        min_score = reddit_config['min_score']
+        max_items = reddit_config['max_items']
+        page_size = min(reddit_config.get('page_size', 100), max_items or 100)
 
-        print("💬 Collecting from Reddit...")
         posts = []
-        subreddits = self.config['sources']['reddit']['subreddits']
-        min_score = self.config['sources']['reddit']['min_score']
-        max_items = self.config['sources']['reddit']['max_items']
-
-        for subreddit in subreddits:
-            url = f"https://www.reddit.com/r/{subreddit}/top.json?t=week&limit={max_items}"
-            headers = {'User-Agent': 'AIWeeklyDigest/1.0'}
-
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                data = response.json()
-
-                for post in data['data']['children'][:max_items]:
-                    post_data = post['data']
-
-                    if post_data['score'] >= min_score:
-                        posts.append({
-                            'source': 'reddit',
-                            'subreddit': subreddit,
-                            'title': post_data['title'],
-                            'url': f"https://reddit.com{post_data['permalink']}",
-                            'score': post_data['score'],
-                            'comments': post_data['num_comments'],
-                            'author': post_data['author'],
-                            'created': datetime.fromtimestamp(post_data['created_utc']).isoformat()
-                        })
-            except Exception as e:
-                print(f"  Error collecting from r/{subreddit}: {e}")
+        after = None
+        for _ in range(reddit_config.get('max_pages', 10)):
+            url = f"https://www.reddit.com/r/{subreddit}/top.json?t=week&limit={page_size}"
+            if after:
+                url += f"&after={after}"
+
+            data = await self._cached_json(
+                'reddit', f"top-week:{subreddit}:{page_size}:{after or ''}",
+                lambda: pool.get_cached_json(url)
+            )
+            children = data['data']['children']
+
+            # The listing is sorted by score, so the first post under the floor ends the scan
+            done = False
+            for post in children:
+                post_data = post['data']
+
+                if post_data['score'] < min_score:
+                    done = True
+                    break
+
+                reddit_post = {
+                    'source': 'reddit',
+                    'subreddit': subreddit,
+                    'title': post_data['title'],
+                    'url': f"https://reddit.com{post_data['permalink']}",
+                    'score': post_data['score'],
+                    'comments': post_data['num_comments'],
+                    'author': post_data['author'],
+                    'created': datetime.fromtimestamp(post_data['created_utc']).isoformat(),
+                    'matched_keywords': self.keyword_matcher.matches(post_data['title'])
+                }
+                # Link posts also carry the outbound URL, which dedup matches against other sources
+                if not post_data.get('is_self') and post_data.get('url'):
+                    reddit_post['link'] = post_data['url']
+                posts.append(reddit_post)
+
+                if max_items and len(posts) >= max_items:
+                    done = True
+                    break
+
+            after = data['data'].get('after')
+            if done or not after or not children:
+                break
 
-        print(f"  Found {len(posts)} relevant posts")
         return posts
 
-    async def collect_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Collect from all enabled sources"""
-        print("\n🤖 Starting AI news collection...\n")
+    async def collect_reddit(self, pool: AsyncHTTPPool) -> List[Dict[str, Any]]:
+        """Collect AI discussions from Reddit"""
+        print("💬 Collecting from Reddit...")
+        reddit_config = self.config['sources']['reddit']
+        subreddits = reddit_config['subreddits']
 
-        # Run all collectors concurrently
+        # All subreddits share the pool's request budget, which Reddit's
+        # X-Ratelimit-* headers keep in sync with the server's view
         results = await asyncio.gather(
-            self.collect_arxiv(),
-            self.collect_hackernews(),
-            self.collect_reddit(),
+            *(self._collect_subreddit(pool, subreddit) for subreddit in subreddits),
             return_exceptions=True
         )
 
-        papers, hn_stories, reddit_posts = results
-
-        # Handle any exceptions
-        if isinstance(papers, Exception):
-            print(f"arXiv error: {papers}")
-            papers = []
-        if isinstance(hn_stories, Exception):
-            print(f"HN error: {hn_stories}")
-            hn_stories = []
-        if isinstance(reddit_posts, Exception):
-            print(f"Reddit error: {reddit_posts}")
-            reddit_posts = []
-
-        all_news = {
-            'papers': papers,
-            'hackernews': hn_stories,
-            'reddit': reddit_posts,
-            'collected_at': self.today.isoformat(),
-            'week_start': self.week_ago.isoformat(),
-            'week_end': self.today.isoformat()
-        }
+        posts = []
+        for subreddit, result in zip(subreddits, results):
+            if isinstance(result, Exception):
+                print(f"  Error collecting from r/{subreddit}: {result}")
+            else:
+                posts.extend(result)
 
-        # Save raw data
-        output_file = self.data_dir / f"raw_news_{self.today.strftime('%Y%m%d')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(all_news, f, indent=2)
+        print(f"  Found {len(posts)} relevant posts")
+        return posts
+
+    async def collect_all(self, on_batch: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None
+                          ) -> Dict[str, List[Dict[str, Any]]]:
+        """Collect from all enabled sources.
+
+        ``on_batch(source, items)`` is called with a copy of each stored batch as it
+        arrives, so downstream stages can start before the slowest source finishes.
+        """
+        print(f"\n🤖 Starting {'incremental ' if self.incremental else ''}AI news collection...\n")
+
+        run_date = self.today.strftime('%Y%m%d')
+        store = self.store
+        store.set_meta(run_date,
+                       collected_at=self.today.isoformat(),
+                       week_start=self.week_ago.isoformat(),
+                       week_end=self.today.isoformat())
+        repo = DigestRepository(self.data_dir)
+        run_id = repo.start_collection(self.today, self.week_ago)
+
+        appended = {}
+        collected = {plugin.name: [] for plugin in self.sources}
+
+        # Every source runs concurrently on one shared worker pool. Each batch is
+        # written as soon as it arrives, not after the slowest source.
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='http-pool')
+        try:
+            async for plugin, batch in stream_batches(self.sources, lambda plugin: self._make_pool(plugin, executor)):
+                if isinstance(batch, Exception):
+                    print(f"{plugin.label} error: {batch}")
+                    continue
+
+                items = self._check_featured(plugin.name, batch)
+                changed = self._update_cursor(plugin.name, items)
+                if changed:
+                    store.append(run_date, plugin.name, changed)
+                    repo.add_raw_items(run_id, changed)
+                appended.setdefault(plugin.name, []).extend(changed)
+                collected[plugin.name].extend(items)
+                if on_batch:
+                    on_batch(plugin.name, copy.deepcopy(items))
+
+            keep_weeks = self.config.get('archive', {}).get('keep_weeks', 4)
+            repo.prune(self.today - timedelta(weeks=keep_weeks))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            repo.close()
+
+        all_news = {key: [] for key in SOURCE_KEYS.values()}
+        for name, items in collected.items():
+            all_news[SOURCE_KEYS.get(name, name)] = items
+        all_news.update(
+            collected_at=self.today.isoformat(),
+            week_start=self.week_ago.isoformat(),
+            week_end=self.today.isoformat()
+        )
 
-        total = len(papers) + len(hn_stories) + len(reddit_posts)
+        total = sum(len(items) for items in collected.values())
         print(f"\n✅ Collection complete! Found {total} items")
-        print(f"📁 Saved to: {output_file}")
+        if self.incremental:
+            print(f"🧾 Appended {sum(len(items) for items in appended.values())} new or updated items")
+        print(f"📁 Saved to: {store.store_dir / f'raw_news_{run_date}.jsonl'}")
+
+        print("🌐 Upstream hosts:")
+        for host, summary in self.resilience.summary().items():
+            print(f"  {host}: {summary}")
+
+        if self.cassette:
+            self.cassette.save()
+            print(f"📼 Cassette {self.cassette.path.name}: {self.cassette.summary()}")
+
+        if self.item_cache:
+            retention_days = self.config.get('cache', {}).get('retention_days', 30)
+            article_retention_days = self.config.get('cache', {}).get('article_retention_days', 365)
+            print(f"🗄️  Item cache: {self.item_cache.summary()}")
+            # Page summaries never go stale; they only need to outlive the links still being shared
+            self.item_cache.prune(retention_days, {'article': article_retention_days})
+            self.http_cache.prune(retention_days)
 
         return all_news
 
 async def main():
-    collector = AINewsCollector()
+    parser = argparse.ArgumentParser(description="Collect AI news from all enabled sources")
+    parser.add_argument('--incremental', action='store_true',
+                        help="append only what changed since the last run (e.g. from a daily cron)")
+    parser.add_argument('--record', metavar='CASSETTE', help="record every HTTP exchange to CASSETTE")
+    parser.add_argument('--replay', metavar='CASSETTE', help="replay CASSETTE instead of using the network")
+    parser.add_argument('--latency-ms', type=float, default=0, help="simulated per-request latency when replaying")
+    args = parser.parse_args()
+
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, mode='record')
+    elif args.replay:
+        cassette = Cassette(args.replay, mode='replay', latency=args.latency_ms / 1000)
+
+    collector = AINewsCollector(incremental=True if args.incremental else None, cassette=cassette)
     await collector.collect_all()
 
 if __name__ == "__main__":
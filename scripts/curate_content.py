@@ -9,10 +9,72 @@ import json
 import yaml
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Optional
 import anthropic
 import os
 
+from article_enricher import ArticleEnricher
+from batch_curation import MapReduceCurator, estimate_tokens, parse_json_response
+from curation_schema import (DIGEST_TOOL, SECTION_TOOL, SUMMARY_TOOL, ITEM_SCHEMA, compile_schema,
+                             digest_schema, digest_tool, format_errors, invalid_parts, section_tool,
+                             summary_tool)
+from data_archive import DataArchive
+from dedup import DedupIndex, describe_sightings, news_lists
+from digest_repo import DigestRepository
+from featured_filter import describe_featured
+from item_cache import ItemCache
+from json_stream import IncrementalJSONParser, JSONStreamError
+from llm_cache import create_message, llm_cache_from_config, message_text, stream_message
+from near_dup import NearDuplicateIndex, describe_cluster, fold_clusters
+from pre_rank import PreRanker, np
+from raw_store import RawNewsStore, SOURCE_KEYS, item_key
+
+class NewsPrep:
+    """Pre-curation (exact and near-duplicate merging) fed one source batch at a time.
+
+    Both indexes are filled as each batch arrives, so the per-item hashing is done
+    while slower sources are still downloading. When a better-ranked duplicate
+    takes over an item's dict, the near-duplicate index re-signs it from its new
+    title and summary. :meth:`finish` only has to cluster the signed items, collapse
+    the clusters and group the survivors by source.
+    """
+
+    def __init__(self, near_duplicate_threshold: float = 0.75):
+        self.near = NearDuplicateIndex(threshold=near_duplicate_threshold) if near_duplicate_threshold else None
+        self.dedup = DedupIndex(on_promote=self.near.update if self.near else None)
+        self.items: List[Dict[str, Any]] = []
+        self.keys = set()
+        self.batch_counts: Dict[str, int] = {}
+
+    def add_batch(self, source: str, items: Iterable[Dict[str, Any]]):
+        """Fold a batch into the indexes (items merged into an earlier one are dropped)"""
+        items = list(items)
+        self.batch_counts[source] = self.batch_counts.get(source, 0) + len(items)
+        for item in items:
+            self.keys.add(item_key(item))
+            if self.dedup.add(item) is None:
+                continue
+            self.items.append(item)
+            if self.near:
+                self.near.add(item)
+
+    def finish(self) -> Dict[str, Any]:
+        """The deduplicated news dict, one list per source"""
+        if self.dedup.merged:
+            print(f"🔗 Merged {self.dedup.merged} duplicate items across sources")
+
+        # A primary can change source when a better-ranked duplicate takes it over,
+        # so lists are built from each item's final source
+        news = {key: [] for key in SOURCE_KEYS.values()}
+        for item in self.items:
+            news.setdefault(SOURCE_KEYS.get(item['source'], item['source']), []).append(item)
+
+        if self.near:
+            clustered = fold_clusters(news, self.near)
+            if clustered:
+                print(f"🧩 Folded {clustered} near-duplicate items into their story clusters")
+        return news
+
 class ContentCurator:
     def __init__(self, config_path: str = "../config.yaml"):
         self.base_dir = Path(__file__).parent.parent
@@ -23,16 +85,75 @@ class ContentCurator:
 
         self.data_dir = self.base_dir / "data"
         self.client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        self.llm_cache = llm_cache_from_config(self.data_dir, self.config)
+        self.repo = None  # Opened for each run, closed when it ends
+        # Called as on_item(section, index, item) for each curated item as soon as it
+        # streams in; a retried stream calls it again from index 0
+        self.on_item: Optional[Callable[[str, int, Dict[str, Any]], None]] = None
 
     def get_latest_raw_data(self) -> Dict[str, Any]:
         """Load the most recent raw news data"""
-        data_files = sorted(self.data_dir.glob("raw_news_*.json"), reverse=True)
+        run = self.repo.latest_collection()
+        if run and run['week_start']:
+            # Everything posted in the latest run's week, across all runs that saw it
+            news = {key: [] for key in SOURCE_KEYS.values()}
+            for item in self.repo.raw_items_since(datetime.fromisoformat(run['week_start'])):
+                news.setdefault(SOURCE_KEYS.get(item['source'], item['source']), []).append(item)
+            news.update(collected_at=run['started_at'], week_start=run['week_start'], week_end=run['started_at'])
+            return news
+
+        # Collections from before the repository
+        store = RawNewsStore(self.data_dir)
+        dates = store.window_dates(days=7)
+        if dates:
+            # Incremental runs spread the week over several collection days; the
+            # latest record of each item wins and anything older than the week drops out
+            week_start = store.load_index(dates[-1])['meta'].get('week_start')
+            return store.load_news(dates, since=datetime.fromisoformat(week_start) if week_start else None)
+
+        # Collections from before the JSONL store
+        archive = DataArchive(self.data_dir)
+        data_files = archive.glob("raw_news_*.json")
 
         if not data_files:
             raise FileNotFoundError("No raw news data found. Run collect_news.py first.")
 
-        with open(data_files[0]) as f:
-            return json.load(f)
+        return archive.read_json(data_files[-1])
+
+    def news_prep(self) -> NewsPrep:
+        """An empty pre-curation stage; pass its ``add_batch`` to ``collect_all(on_batch=...)``"""
+        return NewsPrep(self.config.get('dedup', {}).get('near_duplicate_threshold', 0.75))
+
+    def prepare_news(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Collapse exact and near-duplicate items so each story reaches Claude once"""
+        # The same link often shows up on HN, Reddit and arXiv (one item per URL), and
+        # differently-worded posts about the same story go to curation as one item
+        prep = self.news_prep()
+        for key in news_lists(news_data):
+            prep.add_batch(key, news_data[key])
+
+        prepared = prep.finish()
+        for key in news_lists(news_data):
+            news_data[key] = []
+        news_data.update(prepared)
+        return news_data
+
+    def finish_stream(self, prep: NewsPrep) -> Dict[str, Any]:
+        """Complete a streamed pre-curation with the week's items from earlier collection runs"""
+        run = self.repo.latest_collection()
+        if run and run['week_start']:
+            # Incremental runs only re-collect part of the week, and a full run can miss
+            # items an earlier run saw (e.g. stories that left the HN front page)
+            earlier = [item for item in self.repo.raw_items_since(datetime.fromisoformat(run['week_start']))
+                       if item_key(item) not in prep.keys]
+            if earlier:
+                print(f"🗂️  Adding {len(earlier)} items from earlier collection runs this week")
+                prep.add_batch('earlier runs', earlier)
+
+        news_data = prep.finish()
+        if run:
+            news_data.update(collected_at=run['started_at'], week_start=run['week_start'], week_end=run['started_at'])
+        return news_data
 
     async def categorize_and_summarize(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
         """Use Claude to intelligently categorize and summarize the news"""
@@ -51,7 +172,8 @@ class ContentCurator:
                 'title': paper['title'],
                 'summary': paper['summary'][:200],
                 'url': paper['url'],
-                'meta': f"arXiv • {', '.join(paper['authors'])}"
+                'meta': f"arXiv • {', '.join(paper['authors'])}{describe_sightings(paper)}{describe_cluster(paper)}{describe_featured(paper)}",
+                'keywords': paper.get('matched_keywords', [])
             })
 
         # Add HN stories
@@ -59,8 +181,10 @@ class ContentCurator:
             all_items.append({
                 'type': 'news',
                 'title': story['title'],
+                'summary': story.get('article_summary', ''),
                 'url': story['url'],
-                'meta': f"Hacker News • {story['score']} points • {story['comments']} comments"
+                'meta': f"Hacker News • {story['score']} points • {story['comments']} comments{describe_sightings(story)}{describe_cluster(story)}{describe_featured(story)}",
+                'keywords': story.get('matched_keywords', [])
             })
 
         # Add Reddit posts
@@ -68,19 +192,105 @@ class ContentCurator:
             all_items.append({
                 'type': 'discussion',
                 'title': post['title'],
+                'summary': post.get('article_summary', ''),
                 'url': post['url'],
-                'meta': f"r/{post['subreddit']} • {post['score']} upvotes • {post['comments']} comments"
+                'meta': f"r/{post['subreddit']} • {post['score']} upvotes • {post['comments']} comments{describe_sightings(post)}{describe_cluster(post)}{describe_featured(post)}",
+                'keywords': post.get('matched_keywords', [])
             })
 
+        # Add posts from configured feeds (blogs, company news, ...)
+        for key in news_lists(news_data):
+            if key in SOURCE_KEYS.values():
+                continue
+            for post in news_data[key]:
+                all_items.append({
+                    'type': 'news',
+                    'title': post['title'],
+                    'summary': post.get('article_summary') or post.get('summary', '')[:200],
+                    'url': post['url'],
+                    'meta': f"{post.get('feed', key)}{describe_sightings(post)}{describe_cluster(post)}{describe_featured(post)}",
+                    'keywords': post.get('matched_keywords', [])
+                })
+
+        # Drop empty keyword lists and summaries so they don't cost prompt tokens
+        for item in all_items:
+            for field in ('keywords', 'summary'):
+                if not item[field]:
+                    del item[field]
+
         # Reduce items per section to avoid truncation
         limited_sections = [{"name": s['name'], "max_items": min(5, s.get('max_items', 5))} for s in sections]
 
+        curation_config = self.config['curation']
+        mode = curation_config.get('mode', 'auto')
+        batch_tokens = curation_config.get('batch_tokens', 6000)
+        if mode == 'auto':
+            mode = 'map_reduce' if estimate_tokens(all_items) > batch_tokens else 'single'
+
+        if mode == 'map_reduce':
+            curator = MapReduceCurator(
+                self.client, self.llm_cache, curation_config['model'], focus_topics, limited_sections,
+                batch_tokens=batch_tokens,
+                max_parallel=curation_config.get('max_parallel', 4),
+                candidates_per_section=curation_config.get('candidates_per_section', 15),
+                structured=curation_config.get('structured', True),
+                stream=curation_config.get('stream', True),
+                on_item=self.on_item
+            )
+            curated = await curator.curate(all_items)
+        else:
+            curated = self.curate_single(all_items, focus_topics, limited_sections)
+
+        # Either mode's answer gets the same schema check, and only failing parts are redone
+        if curation_config.get('structured', True):
+            curated = self.repair_curation(curated, all_items, focus_topics, limited_sections)
+
+        # Save curated content
+        output_file = self.data_dir / f"curated_{datetime.now().strftime('%Y%m%d')}.json"
+        with open(output_file, 'w') as f:
+            json.dump(curated, f, indent=2)
+        self.repo.record_digest(curated)
+
+        # Print summary
+        print("✅ Content curated successfully!\n")
+        print(f"Weekly theme: {curated['weekly_summary']}\n")
+
+        for section_name, items in curated['sections'].items():
+            print(f"  {section_name}: {len(items)} items")
+
+        print(f"\n📁 Saved to: {output_file}")
+
+        return curated
+
+    def curate_single(self, all_items: List[Dict[str, Any]], focus_topics: List[str],
+                      limited_sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Curate every item with one prompt"""
+        structured = self.config['curation'].get('structured', True)
+        if structured:
+            output_instructions = (f"Record the digest with the {DIGEST_TOOL} tool. "
+                                   "Copy each chosen item's title, url and meta exactly.")
+        else:
+            output_instructions = """CRITICAL: Return ONLY valid JSON. No markdown, no code blocks, no explanatory text. Start with { and end with }.
+
+Structure:
+{
+  "sections": {
+    "Key Research Papers": [
+      {"title": "...", "url": "...", "meta": "...", "insight": "...", "score": 9}
+    ],
+    "Industry Updates": [],
+    "Tools & Frameworks": [],
+    "Notable Discussions": []
+  },
+  "weekly_summary": "2-3 sentence summary of week's major themes"
+}"""
+
         # Create prompt for Claude
         prompt = f"""Curate weekly digest on agentic AI - autonomous agents, multi-agent systems, tool use, planning, reasoning.
 
 Focus topics: {', '.join(focus_topics)}
 
-{len(all_items)} items from this week. Tasks:
+{len(all_items)} items from this week. An item's "keywords" lists the tracked topics it mentions. Skip items "featured in an earlier digest" unless there is major news about them. Tasks:
 
 1. Filter most relevant items about agentic AI and agent capabilities
 2. Categorize into sections:
@@ -100,89 +310,250 @@ Items:
 
 {json.dumps(all_items, indent=2)}
 
-CRITICAL: Return ONLY valid JSON. No markdown, no code blocks, no explanatory text. Start with {{ and end with }}.
-
-Structure:
-{{
-  "sections": {{
-    "Key Research Papers": [
-      {{"title": "...", "url": "...", "meta": "...", "insight": "...", "score": 9}}
-    ],
-    "Industry Updates": [],
-    "Tools & Frameworks": [],
-    "Notable Discussions": []
-  }},
-  "weekly_summary": "2-3 sentence summary of week's major themes"
-}}"""
+{output_instructions}"""
 
         # Call Claude with higher token limit for complete JSON
-        message = self.client.messages.create(
+        request = dict(
             model=self.config['curation']['model'],
             max_tokens=16384,  # Increased for large JSON responses
             temperature=0.3,
             messages=[{"role": "user", "content": prompt}]
         )
+        if structured:
+            request.update(tools=[digest_tool(limited_sections)], tool_choice={"type": "tool", "name": DIGEST_TOOL})
+
+        if self.config['curation'].get('stream', True):
+            curated = self.stream_curation(request, limited_sections)
+        else:
+            message = create_message(self.client, self.llm_cache, **request)
+
+            response_text = message_text(message)
+
+            # Parse JSON response
+            try:
+                curated = parse_json_response(response_text)
+            except ValueError as e:
+                print(f"Error parsing Claude response: {e}")
+                print(f"Response: {response_text}")
+                # Don't let a rerun get the same unusable response from the cache
+                if self.llm_cache:
+                    self.llm_cache.invalidate(request)
+                raise
 
-        response_text = message.content[0].text
-
-        # Parse JSON response
-        try:
-            # Remove ALL markdown code blocks (multiple passes)
-            json_str = response_text.strip()
-
-            # Remove opening code fence
-            for prefix in ['```json\n', '```json', '```\n', '```']:
-                if json_str.startswith(prefix):
-                    json_str = json_str[len(prefix):]
-                    break
-
-            # Remove closing code fence
-            if '\n```' in json_str:
-                json_str = json_str[:json_str.rfind('\n```')]
-            elif json_str.endswith('```'):
-                json_str = json_str[:-3]
-
-            json_str = json_str.strip()
-
-            # Validate we have JSON
-            if not json_str.startswith('{'):
-                raise ValueError(f"Response doesn't start with '{{': {json_str[:100]}")
-
-            if not json_str.endswith('}'):
-                raise ValueError(f"Response doesn't end with '}}': {json_str[-100:]}")
-
-            curated = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            print(f"Error parsing Claude response: {e}")
-            print(f"Response: {response_text}")
-            raise
+        return curated
 
-        # Save curated content
-        output_file = self.data_dir / f"curated_{datetime.now().strftime('%Y%m%d')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(curated, f, indent=2)
+    def _tool_call(self, prompt: str, tool: Dict[str, Any], max_tokens: int, validate) -> Any:
+        """Force a call of ``tool``, plus up to ``curation.section_retries`` retries; return its input and schema errors"""
+        request = dict(
+            model=self.config['curation']['model'],
+            max_tokens=max_tokens,
+            temperature=0.3,
+            messages=[{"role": "user", "content": prompt}],
+            tools=[tool],
+            tool_choice={"type": "tool", "name": tool['name']}
+        )
+        answer, errors = None, [((), "no response")]
+        for attempt in range(self.config['curation'].get('section_retries', 2) + 1):
+            message = create_message(self.client, self.llm_cache, **request)
+            try:
+                answer = parse_json_response(message_text(message))
+                errors = validate(answer)
+            except ValueError as e:
+                answer, errors = None, [((), str(e))]
+            if not errors:
+                break
+            print(f"  ⚠️  {tool['name']} failed the schema: {format_errors(errors)}")
+            # Don't let a rerun get the same unusable response from the cache
+            if self.llm_cache:
+                self.llm_cache.invalidate(request)
+        return answer, errors
+
+    def request_section(self, section: Dict[str, Any], curated: Dict[str, Any],
+                        all_items: List[Dict[str, Any]], focus_topics: List[str]) -> List[Dict[str, Any]]:
+        """Re-curate just one section, from the items no other section has taken"""
+        taken = {item.get('url') for name, items in curated['sections'].items()
+                 if name != section['name'] and isinstance(items, list) for item in items if isinstance(item, dict)}
+        candidates = [item for item in all_items if item['url'] not in taken]
+        description = next((s.get('description', '') for s in self.config['presentation']['sections']
+                            if s['name'] == section['name']), '')
+        described = f" ({description})" if description else ''
+
+        prompt = f"""Pick the top {section['max_items']} items for the "{section['name']}" section{described} of a weekly digest on agentic AI.
 
-        # Print summary
-        print("✅ Content curated successfully!\n")
-        print(f"Weekly theme: {curated['weekly_summary']}\n")
+Focus topics: {', '.join(focus_topics)}
 
-        for section_name, items in curated['sections'].items():
-            print(f"  {section_name}: {len(items)} items")
+Skip items "featured in an earlier digest" unless there is major news about them. For each pick, copy its title, url and meta exactly, and add a one-sentence insight (what makes it important/interesting) and a relevance score (1-10). Record them with the {SECTION_TOOL} tool.
 
-        print(f"\n📁 Saved to: {output_file}")
+Items:
 
+{json.dumps(candidates, separators=(',', ':'))}"""
+
+        tool = section_tool(section['max_items'])
+        answer, errors = self._tool_call(prompt, tool, 2048, compile_schema(tool['input_schema']))
+        if not errors:
+            return answer['items']
+
+        # Out of retries: keep whichever picks are valid on their own
+        validate_item = compile_schema(ITEM_SCHEMA)
+        items = answer.get('items') if isinstance(answer, dict) else None
+        valid = [item for item in items[:section['max_items']] if not validate_item(item)] if isinstance(items, list) else []
+        print(f"  ⚠️  Keeping {len(valid)} valid items for {section['name']}")
+        return valid
+
+    def request_summary(self, curated: Dict[str, Any]) -> str:
+        """Re-write just the weekly summary, from the curated items"""
+        picks = {name: [f"{item.get('title')}: {item.get('insight')}" for item in items if isinstance(item, dict)]
+                 for name, items in curated['sections'].items() if isinstance(items, list)}
+        prompt = f"""These items were picked for this week's digest on agentic AI:
+
+{json.dumps(picks, indent=1)}
+
+Write a 2-3 sentence summary of the week's major themes and record it with the {SUMMARY_TOOL} tool."""
+
+        tool = summary_tool()
+        answer, errors = self._tool_call(prompt, tool, 512, compile_schema(tool['input_schema']))
+        return '' if errors else answer['weekly_summary']
+
+    def repair_curation(self, curated: Any, all_items: List[Dict[str, Any]], focus_topics: List[str],
+                        limited_sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Check ``curated`` against the digest schema and re-request only the parts that fail.
+
+        A bad section costs one small call for that section instead of redoing the
+        whole curation; a bad summary costs one tiny call.
+        """
+        if not isinstance(curated, dict):
+            curated = {}
+        if not isinstance(curated.get('sections'), dict):
+            curated['sections'] = {}
+        # Extra items are cheaper to drop than to re-request
+        for section in limited_sections:
+            items = curated['sections'].get(section['name'])
+            if isinstance(items, list):
+                del items[section['max_items']:]
+
+        errors = compile_schema(digest_schema(limited_sections))(curated)
+        if not errors:
+            return curated
+
+        section_names = [s['name'] for s in limited_sections]
+        bad_sections, bad_summary = invalid_parts(errors, section_names)
+        parts = [name for name in section_names if name in bad_sections] + (['weekly summary'] if bad_summary else [])
+        print(f"  ⚠️  Curation failed the schema ({format_errors(errors)}); re-requesting {', '.join(parts)}")
+
+        for section in limited_sections:
+            if section['name'] in bad_sections:
+                curated['sections'][section['name']] = self.request_section(section, curated, all_items, focus_topics)
+        if bad_summary:
+            curated['weekly_summary'] = self.request_summary(curated)
+        # Repaired sections back in their configured order
+        curated['sections'] = dict({name: curated['sections'].get(name, []) for name in section_names},
+                                   **curated['sections'])
         return curated
 
-    async def curate(self) -> Dict[str, Any]:
-        """Main curation workflow"""
+    def stream_curation(self, request: Dict[str, Any], sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a curation request as a stream, parsing the JSON while it arrives.
+
+        Each section item is handed to :attr:`on_item` as soon as it is complete,
+        if it can survive schema repair: a valid item, in one of ``sections``,
+        within its ``max_items``. A structural error aborts the stream right away
+        and the request is retried up to ``curation.stream_retries`` times.
+        """
+        retries = self.config['curation'].get('stream_retries', 1)
+        limits = {s['name']: s['max_items'] for s in sections}
+        validate_item = compile_schema(ITEM_SCHEMA)
+
+        def section_item(path):
+            return len(path) == 3 and path[0] == 'sections'
+
+        def on_value(path, item):
+            _, section, index = path
+            if section not in limits or not isinstance(index, int) or index >= limits[section] or validate_item(item):
+                return
+            print(f"  ✓ {section}: {item['title'][:70]}")
+            if self.on_item:
+                self.on_item(section, index, item)
+
+        for attempt in range(retries + 1):
+            parser = IncrementalJSONParser(watch=section_item, on_value=on_value)
+            try:
+                stream_message(self.client, self.llm_cache, parser.feed, **request)
+                return parser.close()
+            except JSONStreamError as e:
+                print(f"  ⚠️  Malformed curation response: {e}")
+                # Don't let a rerun get the same unusable response from the cache
+                if self.llm_cache:
+                    self.llm_cache.invalidate(request)
+                if attempt == retries:
+                    raise
+                print(f"  Retrying ({attempt + 1}/{retries})...")
+
+    def pre_rank(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Cut the items down to each section's likeliest candidates (see pre_rank.py)"""
+        pre_rank_config = self.config['curation'].get('pre_rank', {})
+        if not pre_rank_config.get('enabled', True):
+            return news_data
+        if np is None:
+            print("⚠️  NumPy not installed - pre-ranking skipped, every item goes to Claude\n")
+            return news_data
+
+        ranker = PreRanker(
+            self.config['curation']['focus_topics'],
+            self.config['presentation']['sections'],
+            top_k=pre_rank_config.get('top_k', 40),
+            engagement_weight=pre_rank_config.get('engagement_weight', 0.5)
+        )
+        return ranker.rank(news_data)
+
+    async def enrich_articles(self, news_data: Dict[str, Any]):
+        """Summarize the pages linked from HN, Reddit and feed items (see article_enricher.py)"""
+        enrichment_config = self.config.get('enrichment', {})
+        if not enrichment_config.get('enabled', True):
+            return
+
+        cache = ItemCache(self.data_dir / "item_cache.db") if self.config.get('cache', {}).get('enabled', True) else None
+        enricher = ArticleEnricher(
+            cache,
+            max_concurrency=enrichment_config.get('max_concurrency', 16),
+            timeout=enrichment_config.get('timeout', 10),
+            max_bytes=enrichment_config.get('max_kb', 512) * 1024,
+            summary_sentences=enrichment_config.get('summary_sentences', 3),
+            summary_chars=enrichment_config.get('summary_chars', 400)
+        )
+        items = [item for key in news_lists(news_data) for item in news_data[key]]
+        print("📖 Reading linked articles...")
+        enriched = await enricher.enrich(items)
+        print(f"  Summarized {enriched} items ({enricher.fetched} pages fetched, {enricher.cached} from cache)\n")
+        if cache:
+            cache.close()
+
+    async def curate(self, prep: Optional[NewsPrep] = None) -> Dict[str, Any]:
+        """Main curation workflow.
+
+        With ``prep``, the items were already streamed into pre-curation during
+        collection, so nothing is re-read from disk except earlier runs' items.
+        """
         print("🎯 Starting content curation...\n")
+        self.repo = DigestRepository(self.data_dir)
 
-        # Load raw data
-        raw_data = self.get_latest_raw_data()
-        print(f"📊 Loaded raw data with {len(raw_data['papers']) + len(raw_data['hackernews']) + len(raw_data['reddit'])} items\n")
-
-        # Curate with Claude
-        curated = await self.categorize_and_summarize(raw_data)
+        try:
+            if prep:
+                raw_data = self.finish_stream(prep)
+                counts = ', '.join(f"{source} {count}" for source, count in prep.batch_counts.items())
+                print(f"📊 Pre-curated {sum(prep.batch_counts.values())} items ({counts})\n")
+            else:
+                # Load raw data
+                raw_data = self.get_latest_raw_data()
+                print(f"📊 Loaded raw data with {sum(len(raw_data[key]) for key in news_lists(raw_data))} items\n")
+                raw_data = self.prepare_news(raw_data)
+
+            # Only the pre-ranked candidates are worth fetching pages for
+            raw_data = self.pre_rank(raw_data)
+            await self.enrich_articles(raw_data)
+
+            # Curate with Claude
+            curated = await self.categorize_and_summarize(raw_data)
+        finally:
+            self.repo.close()
 
         return curated
 
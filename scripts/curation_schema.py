@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Curation Schema
+JSON Schema for curated digests, a validator compiled from it, and the tools that
+make Claude answer in that shape
+"""
+
+from typing import List, Dict, Any, Callable, Set, Tuple
+
+Path = Tuple[Any, ...]
+SchemaError = Tuple[Path, str]
+Validator = Callable[[Any, Path], List[SchemaError]]
+
+DIGEST_TOOL = 'record_digest'
+SECTION_TOOL = 'record_section'
+SUMMARY_TOOL = 'record_summary'
+SCORES_TOOL = 'record_scores'
+PICKS_TOOL = 'record_picks'
+
+ITEM_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'title': {'type': 'string', 'minLength': 1},
+        'url': {'type': 'string', 'minLength': 1},
+        'meta': {'type': 'string'},
+        'insight': {'type': 'string', 'minLength': 1, 'description': 'One sentence on what makes it important/interesting'},
+        'score': {'type': 'integer', 'minimum': 1, 'maximum': 10, 'description': 'Relevance 1-10'}
+    },
+    'required': ['title', 'url', 'meta', 'insight', 'score']
+}
+
+SUMMARY_SCHEMA = {'type': 'string', 'minLength': 1, 'description': "2-3 sentence summary of the week's major themes"}
+
+def section_schema(max_items: int) -> Dict[str, Any]:
+    return {'type': 'array', 'items': ITEM_SCHEMA, 'maxItems': max_items}
+
+def digest_schema(sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The ``{sections, weekly_summary}`` shape of a curated digest"""
+    return {
+        'type': 'object',
+        'properties': {
+            'sections': {
+                'type': 'object',
+                'properties': {s['name']: section_schema(s['max_items']) for s in sections},
+                'required': [s['name'] for s in sections]
+            },
+            'weekly_summary': SUMMARY_SCHEMA
+        },
+        'required': ['sections', 'weekly_summary']
+    }
+
+def tool(name: str, description: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {'name': name, 'description': description, 'input_schema': schema}
+
+def digest_tool(sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return tool(DIGEST_TOOL, "Record the curated weekly digest", digest_schema(sections))
+
+def section_tool(max_items: int) -> Dict[str, Any]:
+    return tool(SECTION_TOOL, "Record the items chosen for one digest section",
+                {'type': 'object', 'properties': {'items': section_schema(max_items)}, 'required': ['items']})
+
+def summary_tool() -> Dict[str, Any]:
+    return tool(SUMMARY_TOOL, "Record the weekly summary",
+                {'type': 'object', 'properties': {'weekly_summary': SUMMARY_SCHEMA}, 'required': ['weekly_summary']})
+
+def scores_tool(section_names: List[str]) -> Dict[str, Any]:
+    """Map step of batch curation: a section, insight and score per relevant item id"""
+    entry = {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'integer', 'minimum': 0},
+            'section': {'type': 'string', 'enum': section_names},
+            'insight': ITEM_SCHEMA['properties']['insight'],
+            'score': ITEM_SCHEMA['properties']['score']
+        },
+        'required': ['id', 'section', 'insight', 'score']
+    }
+    return tool(SCORES_TOOL, "Record the scores of the relevant items in this batch",
+                {'type': 'object', 'properties': {'items': {'type': 'array', 'items': entry}}, 'required': ['items']})
+
+def picks_tool(sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce step of batch curation: the chosen item ids per section, and the weekly summary"""
+    ids = {'type': 'array', 'items': {'type': 'integer', 'minimum': 0}}
+    return tool(PICKS_TOOL, "Record the items picked for each section and the weekly summary", {
+        'type': 'object',
+        'properties': {
+            'sections': {
+                'type': 'object',
+                'properties': {s['name']: ids for s in sections},
+                'required': [s['name'] for s in sections]
+            },
+            'weekly_summary': SUMMARY_SCHEMA
+        },
+        'required': ['sections', 'weekly_summary']
+    })
+
+TYPE_CHECKS = {
+    'object': lambda value: isinstance(value, dict),
+    'array': lambda value: isinstance(value, list),
+    'string': lambda value: isinstance(value, str),
+    'integer': lambda value: isinstance(value, int) and not isinstance(value, bool),
+    'number': lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    'boolean': lambda value: isinstance(value, bool)
+}
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Turn ``schema`` into a function ``validate(value, path=()) -> [(path, message), ...]``.
+
+    The schema is walked once, here, into a tree of closures that each check only
+    what their node declares, so validating doesn't re-interpret the schema. The
+    subset used by this module is supported: ``type``, ``properties``,
+    ``required``, ``items``, ``maxItems``, ``minLength``, ``enum``, ``minimum``
+    and ``maximum``. A missing required property is reported at its own path.
+    """
+    checks: List[Validator] = []
+
+    if 'type' in schema:
+        type_name, is_type = schema['type'], TYPE_CHECKS[schema['type']]
+        checks.append(lambda value, path: [] if is_type(value) else [(path, f"expected {type_name}")])
+
+    if 'properties' in schema or 'required' in schema:
+        properties = {name: compile_schema(child) for name, child in schema.get('properties', {}).items()}
+        required = schema.get('required', [])
+
+        def check_object(value, path):
+            errors = [(path + (name,), "is required") for name in required if name not in value]
+            for name, validate in properties.items():
+                if name in value:
+                    errors += validate(value[name], path + (name,))
+            return errors
+        checks.append(lambda value, path: check_object(value, path) if isinstance(value, dict) else [])
+
+    if 'items' in schema:
+        validate_item = compile_schema(schema['items'])
+        checks.append(lambda value, path: [error for index, item in enumerate(value)
+                                           for error in validate_item(item, path + (index,))]
+                      if isinstance(value, list) else [])
+
+    if 'maxItems' in schema:
+        max_items = schema['maxItems']
+        checks.append(lambda value, path: [(path, f"more than {max_items} items")]
+                      if isinstance(value, list) and len(value) > max_items else [])
+
+    if 'minLength' in schema:
+        min_length = schema['minLength']
+        checks.append(lambda value, path: [(path, "is empty" if min_length == 1 else f"shorter than {min_length}")]
+                      if isinstance(value, str) and len(value.strip()) < min_length else [])
+
+    if 'enum' in schema:
+        allowed = schema['enum']
+        checks.append(lambda value, path: [] if value in allowed else [(path, f"not one of {allowed}")])
+
+    for keyword, fails in (('minimum', lambda value, bound: value < bound),
+                           ('maximum', lambda value, bound: value > bound)):
+        if keyword in schema:
+            def check_bound(value, path, bound=schema[keyword], keyword=keyword, fails=fails):
+                if TYPE_CHECKS['number'](value) and fails(value, bound):
+                    return [(path, f"{keyword} is {bound}")]
+                return []
+            checks.append(check_bound)
+
+    def validate(value, path: Path = ()) -> List[SchemaError]:
+        errors = []
+        for check in checks:
+            errors += check(value, path)
+            if errors and check is checks[0] and 'type' in schema:
+                break  # Nothing else means anything for a value of the wrong type
+        return errors
+    return validate
+
+def invalid_parts(errors: List[SchemaError], section_names: List[str]) -> Tuple[Set[str], bool]:
+    """Which sections, and whether the weekly summary, the ``errors`` of a digest fall in"""
+    sections: Set[str] = set()
+    summary = False
+    for path, _ in errors:
+        if not path:
+            return set(section_names), True
+        if path[0] == 'weekly_summary':
+            summary = True
+        elif len(path) == 1:
+            sections.update(section_names)  # No usable sections object at all
+        else:
+            sections.add(path[1])
+    return sections, summary
+
+def format_errors(errors: List[SchemaError], limit: int = 3) -> str:
+    shown = '; '.join(f"{'.'.join(str(part) for part in path) or '(root)'} {message}"
+                      for path, message in errors[:limit])
+    return shown + (f" (+{len(errors) - limit} more)" if len(errors) > limit else '')
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Data Archive
+Compacts old files in data/ into per-month gzip bundles that stay readable in place
+"""
+
+import argparse
+import fnmatch
+import gzip
+import json
+import re
+import yaml
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Dated files that are safe to archive, relative to data/
+ARCHIVABLE = ("curated_*.json", "raw_news_*.json", "raw/raw_news_*.jsonl", "raw/raw_news_*.idx.json")
+DATE_RE = re.compile(r'_(\d{8})\.')
+
+class DataArchive:
+    """Month bundles under ``data/archive/``: ``YYYY-MM.gz`` plus ``YYYY-MM.idx.json``.
+
+    A bundle is a series of independent gzip members, one per archived file, so
+    any file can be read back by seeking to its offset and decompressing just that
+    member. The index maps each file's path (relative to ``data/``) to its offset,
+    compressed length and original size.
+
+    :meth:`glob` and :meth:`read` cover live and archived files alike. Readers that
+    go through them don't need to know whether a file has been compacted.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.archive_dir = self.data_dir / "archive"
+        self._members: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _index_path(self, month: str) -> Path:
+        return self.archive_dir / f"{month}.idx.json"
+
+    def _bundle_path(self, month: str) -> Path:
+        return self.archive_dir / f"{month}.gz"
+
+    def _load_index(self, month: str) -> Dict[str, Any]:
+        index_path = self._index_path(month)
+        if not index_path.exists():
+            return {'members': {}}
+        with open(index_path) as f:
+            return json.load(f)
+
+    @property
+    def members(self) -> Dict[str, Dict[str, Any]]:
+        """Every archived file, mapped to its bundle month and index entry"""
+        if self._members is None:
+            self._members = {}
+            for index_path in sorted(self.archive_dir.glob("*.idx.json")):
+                month = index_path.name[:-len(".idx.json")]
+                for name, entry in self._load_index(month)['members'].items():
+                    self._members[name] = dict(entry, month=month)
+        return self._members
+
+    def glob(self, pattern: str) -> List[str]:
+        """Paths (relative to ``data/``) matching ``pattern``, live or archived, sorted"""
+        live = {str(path.relative_to(self.data_dir)) for path in self.data_dir.glob(pattern)}
+        archived = {name for name in self.members if fnmatch.fnmatch(name, pattern)}
+        return sorted(live | archived)
+
+    def exists(self, name: str) -> bool:
+        return (self.data_dir / name).exists() or name in self.members
+
+    def read(self, name: str) -> bytes:
+        """Contents of ``name``, from ``data/`` if it is still live, else from its bundle"""
+        path = self.data_dir / name
+        if path.exists():
+            return path.read_bytes()
+
+        entry = self.members.get(name)
+        if entry is None:
+            raise FileNotFoundError(f"{name} is neither in data/ nor archived")
+
+        with open(self._bundle_path(entry['month']), 'rb') as f:
+            f.seek(entry['offset'])
+            return gzip.decompress(f.read(entry['length']))
+
+    def read_json(self, name: str) -> Any:
+        return json.loads(self.read(name))
+
+    def compact(self, keep_weeks: int = 4, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Move dated files older than ``keep_weeks`` into their month's bundle.
+
+        Each file is appended to the bundle, the index is updated, and only then is
+        the original deleted. An interrupted run therefore leaves, at worst, an
+        unindexed tail in a bundle or a file present in both places.
+        """
+        cutoff = ((now or datetime.now()) - timedelta(weeks=keep_weeks)).strftime('%Y%m%d')
+
+        by_month: Dict[str, List[Path]] = {}
+        for pattern in ARCHIVABLE:
+            for path in self.data_dir.glob(pattern):
+                match = DATE_RE.search(path.name)
+                if match and match.group(1) < cutoff:
+                    date = match.group(1)
+                    by_month.setdefault(f"{date[:4]}-{date[4:6]}", []).append(path)
+
+        stats = {'files': 0, 'bytes_before': 0, 'bytes_after': 0}
+        if not by_month:
+            return stats
+
+        self.archive_dir.mkdir(exist_ok=True)
+        for month, paths in sorted(by_month.items()):
+            index = self._load_index(month)
+            with open(self._bundle_path(month), 'ab') as bundle:
+                bundle.seek(0, 2)
+                for path in sorted(paths):
+                    data = path.read_bytes()
+                    member = gzip.compress(data, compresslevel=9, mtime=0)
+                    index['members'][str(path.relative_to(self.data_dir))] = {
+                        'offset': bundle.tell(), 'length': len(member), 'size': len(data)
+                    }
+                    bundle.write(member)
+                    stats['files'] += 1
+                    stats['bytes_before'] += len(data)
+                    stats['bytes_after'] += len(member)
+
+            tmp_path = self._index_path(month).with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f, indent=2)
+            tmp_path.replace(self._index_path(month))
+
+            for path in paths:
+                path.unlink()
+
+        self._members = None
+        return stats
+
+def compact_databases(data_dir: Path, config: Dict[str, Any], keep_weeks: int,
+                      now: Optional[datetime] = None) -> Dict[str, int]:
+    """Prune the SQLite stores and HTTP cache in ``data_dir`` to their retention, then VACUUM them.
+
+    digest.db keeps the raw items and digest JSON of the last ``keep_weeks`` (the
+    rest lives in the archived files). The item and HTTP caches follow
+    ``cache.retention_days``, and the LLM cache is already capped at ``llm_cache.max_mb``.
+    """
+    # digest_repo imports this module, so the stores are imported here
+    from digest_repo import DigestRepository
+    from http_cache import HTTPCache
+    from item_cache import ItemCache
+    from llm_cache import LLMCache
+
+    data_dir = Path(data_dir)
+    databases = [data_dir / name for name in ("digest.db", "item_cache.db", "llm_cache.db")]
+    http_cache_dir = data_dir / "http_cache"
+
+    def size() -> int:
+        files = [path for path in databases if path.exists()]
+        if http_cache_dir.exists():
+            files += [path for path in http_cache_dir.glob('*/*') if path.is_file()]
+        return sum(path.stat().st_size for path in files)
+
+    stats = {'bytes_before': size()}
+    cache_config = config.get('cache', {})
+    retention_days = cache_config.get('retention_days', 30)
+
+    repo = DigestRepository(data_dir)
+    try:
+        repo.prune((now or datetime.now()) - timedelta(weeks=keep_weeks))
+        repo.vacuum()
+    finally:
+        repo.close()
+
+    if databases[1].exists():
+        item_cache = ItemCache(databases[1])
+        try:
+            item_cache.prune(retention_days, {'article': cache_config.get('article_retention_days', 365)})
+            item_cache.vacuum()
+        finally:
+            item_cache.close()
+
+    if databases[2].exists():
+        llm_cache = LLMCache(databases[2])
+        try:
+            llm_cache.vacuum()
+        finally:
+            llm_cache.close()
+
+    if http_cache_dir.exists():
+        HTTPCache(http_cache_dir).prune(retention_days)
+
+    stats['bytes_after'] = size()
+    return stats
+
+def main():
+    base_dir = Path(__file__).parent.parent
+    with open(base_dir / "config.yaml") as f:
+        config = yaml.safe_load(f)
+
+    parser = argparse.ArgumentParser(description="Compact old data/ files into per-month gzip bundles")
+    parser.add_argument('--keep-weeks', type=int, metavar='N',
+                        default=config.get('archive', {}).get('keep_weeks', 4),
+                        help="leave files from the last N weeks uncompacted (default: archive.keep_weeks)")
+    keep_weeks = parser.parse_args().keep_weeks
+
+    print(f"🗜️  Compacting data/ files older than {keep_weeks} weeks...")
+    stats = DataArchive(base_dir / "data").compact(keep_weeks)
+
+    if stats['files']:
+        saved = stats['bytes_before'] - stats['bytes_after']
+        print(f"✅ Archived {stats['files']} files: {stats['bytes_before'] / 1e6:.1f} MB -> "
+              f"{stats['bytes_after'] / 1e6:.1f} MB ({saved * 100 // max(stats['bytes_before'], 1)}% smaller)")
+    else:
+        print("  Nothing to compact")
+
+    print("🧹 Pruning and vacuuming the databases and caches...")
+    stats = compact_databases(base_dir / "data", config, keep_weeks)
+    print(f"✅ Databases and caches: {stats['bytes_before'] / 1e6:.1f} MB -> {stats['bytes_after'] / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Cross-source Deduplication
+URL canonicalization and an exact-match index that merges duplicate items
+"""
+
+import re
+from typing import List, Dict, Any, Callable, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'yclid',
+    'ref', 'ref_src', 'ref_url', 'si', 'cmpid', '_hsenc', '_hsmkt'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_')
+
+HOST_ALIASES = {
+    'old.reddit.com': 'reddit.com',
+    'np.reddit.com': 'reddit.com',
+    'm.reddit.com': 'reddit.com',
+    'export.arxiv.org': 'arxiv.org',
+    'mobile.twitter.com': 'twitter.com',
+    'x.com': 'twitter.com',
+    'm.youtube.com': 'youtube.com',
+}
+
+ARXIV_PATH_RE = re.compile(r'^/(?:abs|pdf|html)/(.+?)(?:v\d+)?(?:\.pdf)?/?$')
+
+SOURCE_LABELS = {'arxiv': 'arXiv', 'hackernews': 'Hacker News', 'reddit': 'Reddit'}
+
+# Which source's copy of a duplicated item is kept (lower first); feeds come last
+SOURCE_RANK = {'arxiv': 0, 'hackernews': 1, 'reddit': 2}
+
+def canonicalize_url(url: str) -> str:
+    """Reduce a URL to a canonical form so trivially different links compare equal.
+
+    Scheme is normalized to https, ``www.``/mobile host prefixes and default ports
+    are dropped, tracking query parameters and fragments are removed, remaining
+    parameters are sorted, and trailing slashes are trimmed. arXiv abs/pdf/html
+    links, with or without a version suffix, all map to ``arxiv.org/abs/<id>``.
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+
+    parts = urlsplit(url if '://' in url else f'https://{url}')
+    host = (parts.hostname or '').lower().rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    host = HOST_ALIASES.get(host, host)
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+
+    if host == 'arxiv.org':
+        match = ARXIV_PATH_RE.match(path)
+        if match:
+            return f"https://arxiv.org/abs/{match.group(1)}"
+
+    if host == 'youtu.be':
+        host, path, query = 'youtube.com', '/watch', urlencode({'v': path.strip('/')})
+    else:
+        params = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+        ]
+        query = urlencode(sorted(params))
+
+    if len(path) > 1:
+        path = path.rstrip('/')
+        for suffix in ('/index.html', '/index.htm'):
+            if path.endswith(suffix):
+                path = path[:-len(suffix)] or '/'
+
+    port = parts.port
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+    return urlunsplit(('https', netloc, path, query, ''))
+
+def item_link(item: Dict[str, Any]) -> str:
+    """The URL an item is *about*: a Reddit post's outbound link rather than its permalink"""
+    return item.get('link') or item.get('url', '')
+
+class DedupIndex:
+    """Hash index of canonical URLs; each item is checked and merged in O(1).
+
+    The item from the best-ranked source (see ``SOURCE_RANK``; the first seen on a
+    tie) is kept as the primary. The others are folded into it: their source, URL
+    and engagement are appended to ``also_seen_on`` and ``engagement`` holds the
+    combined score and comment counts. Sources can be added in any order; a
+    better-ranked duplicate takes over the primary's dict in place, so lists that
+    already hold the primary stay valid; ``on_promote(primary)`` is called after
+    each takeover, for indexes built from the primary's old fields.
+    """
+
+    def __init__(self, on_promote: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.by_url: Dict[str, Dict[str, Any]] = {}
+        self.merged = 0
+        self.on_promote = on_promote
+
+    def add(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Index ``item``; return it if new, or None if it was merged into an earlier item"""
+        key = canonicalize_url(item_link(item))
+        if not key:
+            return item
+
+        primary = self.by_url.get(key)
+        if primary is None:
+            item['canonical_url'] = key
+            self.by_url[key] = item
+            return item
+
+        if source_rank(item) < source_rank(primary):
+            self._promote(primary, item)
+        else:
+            self._merge(primary, item)
+        self.merged += 1
+        return None
+
+    def _promote(self, primary: Dict[str, Any], item: Dict[str, Any]):
+        """Make ``item`` the primary, reusing the primary's dict, and fold the old primary into it"""
+        earlier = dict(primary)
+        sightings = earlier.pop('also_seen_on', [])
+        earlier.pop('engagement', None)
+
+        primary.clear()
+        primary.update(item, canonical_url=earlier['canonical_url'])
+        self._merge(primary, earlier)
+        for sighting in sightings:
+            self._add_sighting(primary, sighting)
+        if self.on_promote:
+            self.on_promote(primary)
+
+    def _add_sighting(self, primary: Dict[str, Any], sighting: Dict[str, Any]):
+        if 'engagement' not in primary:
+            primary['engagement'] = {
+                'score': primary.get('score', 0),
+                'comments': primary.get('comments', 0),
+                'sources': [primary['source']]
+            }
+        primary.setdefault('also_seen_on', []).append(sighting)
+
+        engagement = primary['engagement']
+        engagement['score'] += sighting['score']
+        engagement['comments'] += sighting['comments']
+        if sighting['source'] not in engagement['sources']:
+            engagement['sources'].append(sighting['source'])
+
+    def _merge(self, primary: Dict[str, Any], duplicate: Dict[str, Any]):
+        sighting = {
+            'source': duplicate['source'],
+            'url': duplicate.get('url'),
+            'score': duplicate.get('score', 0),
+            'comments': duplicate.get('comments', 0)
+        }
+        if 'subreddit' in duplicate:
+            sighting['subreddit'] = duplicate['subreddit']
+        self._add_sighting(primary, sighting)
+
+        # Keywords matched anywhere count for the merged item
+        for keyword in duplicate.get('matched_keywords', []):
+            if keyword not in primary.setdefault('matched_keywords', []):
+                primary['matched_keywords'].append(keyword)
+
+def source_rank(item: Dict[str, Any]) -> int:
+    return SOURCE_RANK.get(item['source'], len(SOURCE_RANK))
+
+def news_lists(news_data: Dict[str, Any]) -> List[str]:
+    """Keys of the per-source item lists in a news dict (papers, hackernews, reddit and any feeds)"""
+    return [key for key, value in news_data.items() if isinstance(value, list)]
+
+def dedupe_news(news_data: Dict[str, Any], index: Optional[DedupIndex] = None) -> DedupIndex:
+    """Remove cross-source duplicates from every source list in place"""
+    index = index or DedupIndex()
+    for key in news_lists(news_data):
+        news_data[key] = [item for item in news_data.get(key, []) if index.add(item) is not None]
+    return index
+
+def describe_sightings(item: Dict[str, Any]) -> str:
+    """Short meta suffix naming where else a merged item appeared, e.g. " • also on r/LocalLLaMA (1200)" """
+    places = []
+    for sighting in item.get('also_seen_on', []):
+        if sighting.get('subreddit'):
+            places.append(f"r/{sighting['subreddit']} ({sighting['score']})")
+        else:
+            places.append(f"{SOURCE_LABELS.get(sighting['source'], sighting['source'])} ({sighting['score']})")
+    return f" • also on {', '.join(places)}" if places else ''
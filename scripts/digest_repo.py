@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Digest Repository
+SQLite index of collection runs, raw items, curated digests and generated artifacts
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from data_archive import DataArchive
+from dedup import canonicalize_url, item_link
+from raw_store import item_key, item_time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    stage       TEXT NOT NULL,            -- 'collect' or 'curate'
+    run_date    TEXT NOT NULL,            -- YYYYMMDD
+    iso_week    TEXT NOT NULL,            -- e.g. 2026-W42
+    started_at  TEXT NOT NULL,
+    week_start  TEXT,
+    item_count  INTEGER NOT NULL DEFAULT 0,
+    summary     TEXT,
+    data        TEXT                      -- full curated JSON for 'curate' runs
+);
+CREATE INDEX IF NOT EXISTS runs_by_stage_date ON runs (stage, run_date);
+CREATE INDEX IF NOT EXISTS runs_by_stage_week ON runs (stage, iso_week);
+
+CREATE TABLE IF NOT EXISTS raw_items (
+    source      TEXT NOT NULL,
+    item_key    TEXT NOT NULL,
+    run_id      INTEGER NOT NULL REFERENCES runs (id),
+    iso_week    TEXT,
+    url         TEXT,
+    posted_at   TEXT,
+    score       INTEGER,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (source, item_key)
+);
+CREATE INDEX IF NOT EXISTS raw_items_by_week ON raw_items (iso_week, source);
+CREATE INDEX IF NOT EXISTS raw_items_by_posted ON raw_items (posted_at);
+CREATE INDEX IF NOT EXISTS raw_items_by_url ON raw_items (url);
+
+CREATE TABLE IF NOT EXISTS curated_items (
+    run_id      INTEGER NOT NULL REFERENCES runs (id),
+    section     TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    title       TEXT,
+    url         TEXT,
+    score       INTEGER,
+    PRIMARY KEY (run_id, section, position)
+);
+CREATE INDEX IF NOT EXISTS curated_items_by_url ON curated_items (url);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id      INTEGER NOT NULL REFERENCES runs (id),
+    kind        TEXT NOT NULL,            -- 'webpage', 'audio', 'video', 'presentation'
+    path        TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    PRIMARY KEY (run_id, kind)
+);
+"""
+
+def iso_week(moment: datetime) -> str:
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+class DigestRepository:
+    """One ``data/digest.db`` that every pipeline stage queries instead of globbing ``data/``.
+
+    Collection runs upsert their raw items (the newest record of an item wins).
+    Each curation run stores its digest JSON once, along with one row per featured
+    item. Generators register the files they write as artifacts of the latest digest.
+    All lookups are indexed, so finding the latest digest or listing the archive
+    costs the same with five weeks of history as with five hundred.
+
+    Curated files written before the repository existed, including compacted
+    ones, are imported the first time it is opened. Raw items and digest JSON are
+    copies of the files in ``data/``, so :meth:`prune` drops them once they are
+    older than the archive window; old digests are then read back from their files.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.conn = sqlite3.connect(self.data_dir / "digest.db")
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        if not self.conn.execute("SELECT 1 FROM runs WHERE stage = 'curate' LIMIT 1").fetchone():
+            self._import_curated_files()
+
+    def _import_curated_files(self):
+        archive = DataArchive(self.data_dir)
+        for name in archive.glob("curated_*.json"):
+            run_date = name[len("curated_"):-len(".json")]
+            self.record_digest(archive.read_json(name), datetime.strptime(run_date, '%Y%m%d'))
+
+    # Collection
+
+    def start_collection(self, started_at: datetime, week_start: datetime) -> int:
+        """Register a collection run and return its ID"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (stage, run_date, iso_week, started_at, week_start) VALUES ('collect', ?, ?, ?, ?)",
+                (started_at.strftime('%Y%m%d'), iso_week(started_at), started_at.isoformat(), week_start.isoformat())
+            )
+        return cursor.lastrowid
+
+    def add_raw_items(self, run_id: int, items: List[Dict[str, Any]]):
+        """Upsert one source's batch for ``run_id``; a later record of the same item replaces it"""
+        rows = []
+        for item in items:
+            posted = item_time(item)
+            rows.append((item['source'], item_key(item), run_id, iso_week(posted) if posted else None,
+                         canonicalize_url(item_link(item)), posted.isoformat() if posted else None,
+                         item.get('score'), json.dumps(item)))
+
+        with self.conn:
+            self.conn.executemany(
+                """INSERT OR REPLACE INTO raw_items
+                   (source, item_key, run_id, iso_week, url, posted_at, score, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            self.conn.execute(
+                "UPDATE runs SET item_count = item_count + ? WHERE id = ?", (len(items), run_id)
+            )
+
+    def latest_collection(self) -> Optional[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM runs WHERE stage = 'collect' ORDER BY run_date DESC, id DESC LIMIT 1"
+        ).fetchone()
+
+    def raw_items_since(self, since: datetime, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Raw items posted at or after ``since``, optionally for one source"""
+        query = "SELECT data FROM raw_items WHERE posted_at >= ?"
+        params = [since.isoformat()]
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        return [json.loads(row['data']) for row in self.conn.execute(query + " ORDER BY rowid", params)]
+
+    # Curation
+
+    def record_digest(self, curated: Dict[str, Any], created_at: Optional[datetime] = None) -> int:
+        """Store a curated digest and its items; replaces an earlier digest from the same day"""
+        created_at = created_at or datetime.now()
+        run_date = created_at.strftime('%Y%m%d')
+        sections = curated.get('sections', {})
+
+        with self.conn:
+            for (old_id,) in self.conn.execute(
+                    "SELECT id FROM runs WHERE stage = 'curate' AND run_date = ?", (run_date,)).fetchall():
+                self.conn.execute("DELETE FROM curated_items WHERE run_id = ?", (old_id,))
+                self.conn.execute("DELETE FROM artifacts WHERE run_id = ?", (old_id,))
+                self.conn.execute("DELETE FROM runs WHERE id = ?", (old_id,))
+
+            run_id = self.conn.execute(
+                """INSERT INTO runs (stage, run_date, iso_week, started_at, item_count, summary, data)
+                   VALUES ('curate', ?, ?, ?, ?, ?, ?)""",
+                (run_date, iso_week(created_at), created_at.isoformat(),
+                 sum(len(items) for items in sections.values()),
+                 curated.get('weekly_summary', ''), json.dumps(curated))
+            ).lastrowid
+
+            self.conn.executemany(
+                "INSERT INTO curated_items (run_id, section, position, title, url, score) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, section, position, item.get('title'), canonicalize_url(item.get('url', '')), item.get('score'))
+                 for section, items in sections.items() for position, item in enumerate(items)]
+            )
+        return run_id
+
+    def recent_digests(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """The latest ``limit`` digests, newest first, as ``{run_date, iso_week, item_count, summary, data}``"""
+        rows = self.conn.execute(
+            """SELECT run_date, iso_week, item_count, summary, data FROM runs
+               WHERE stage = 'curate' ORDER BY run_date DESC LIMIT ?""",
+            (limit,)
+        ).fetchall()
+        archive = DataArchive(self.data_dir)
+        return [dict(row, data=json.loads(row['data']) if row['data']
+                     else archive.read_json(f"curated_{row['run_date']}.json"))
+                for row in rows]
+
+    def latest_digest(self) -> Dict[str, Any]:
+        """The newest curated digest's JSON"""
+        digests = self.recent_digests(1)
+        if not digests:
+            raise FileNotFoundError("No curated data found. Run curate_content.py first.")
+        return digests[0]['data']
+
+    # Retention
+
+    def prune(self, before: datetime):
+        """Drop raw items posted before ``before`` and the stored JSON of digests created before it"""
+        cutoff = before.isoformat()
+        with self.conn:
+            self.conn.execute(
+                """DELETE FROM raw_items WHERE posted_at < ? OR (posted_at IS NULL AND run_id IN
+                   (SELECT id FROM runs WHERE stage = 'collect' AND started_at < ?))""",
+                (cutoff, cutoff)
+            )
+            self.conn.execute(
+                "UPDATE runs SET data = NULL WHERE stage = 'curate' AND started_at < ? AND data IS NOT NULL",
+                (cutoff,)
+            )
+
+    def vacuum(self):
+        """Give the space freed by :meth:`prune` back to the filesystem"""
+        self.conn.execute("VACUUM")
+
+    # Artifacts
+
+    def record_artifact(self, kind: str, path: Path, run_date: Optional[str] = None):
+        """Register a generated file against the digest of ``run_date`` (default: the latest)"""
+        query = "SELECT id FROM runs WHERE stage = 'curate'"
+        params = []
+        if run_date:
+            query += " AND run_date = ?"
+            params.append(run_date)
+        row = self.conn.execute(query + " ORDER BY run_date DESC LIMIT 1", params).fetchone()
+        if not row:
+            return
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO artifacts (run_id, kind, path, created_at) VALUES (?, ?, ?, ?)",
+                (row['id'], kind, str(path), datetime.now().isoformat())
+            )
+
+    def latest_artifact(self, kind: str) -> Optional[Path]:
+        """Path of the newest artifact of ``kind`` that still exists on disk"""
+        row = self.conn.execute(
+            """SELECT artifacts.path FROM artifacts JOIN runs ON runs.id = artifacts.run_id
+               WHERE artifacts.kind = ? ORDER BY runs.run_date DESC LIMIT 1""",
+            (kind,)
+        ).fetchone()
+        return Path(row['path']) if row and Path(row['path']).exists() else None
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Featured Filter
+Persistent Bloom filter of everything already featured in a past digest
+"""
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
+
+from data_archive import DataArchive
+from dedup import canonicalize_url, item_link
+from near_dup import TOKEN_RE, STOPWORDS
+
+def title_fingerprint(title: str) -> str:
+    """Order-insensitive content words of a title ("OpenAI launches GPT-5" -> "gpt-5 openai")"""
+    return ' '.join(sorted({word for word in TOKEN_RE.findall((title or '').lower()) if word not in STOPWORDS}))
+
+def fingerprints(item: Dict[str, Any]) -> List[str]:
+    """Keys an item is recognized by: each canonical URL it carries, plus its title"""
+    keys = {f"url:{canonicalize_url(url)}" for url in (item.get('url'), item_link(item)) if url}
+    title = title_fingerprint(item.get('title', ''))
+    if title:
+        keys.add(f"title:{title}")
+    return sorted(keys)
+
+class BloomFilter:
+    """Fixed-size bit array sized for ``capacity`` keys at ``error_rate`` false positives.
+
+    Membership checks hash the key once and test ``hash_count`` bits, so a lookup
+    is O(1) whatever the number of keys. There are no false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+class FeaturedFilter:
+    """Bloom filter of featured item fingerprints, kept in sync with ``curated_*.json``.
+
+    The filter lives in ``data/featured.bloom``: a JSON header line (sizing, key
+    count and the curated files already added) followed by the raw bit array. On
+    load, curated files not yet in the header are added. When the key count
+    outgrows the capacity, the filter is rebuilt from every curated file at double
+    the capacity, so the false positive rate stays bounded. At the default 1% rate
+    that is about 1.2 KB per 1,000 keys.
+
+    Curated files named in ``exclude`` (normally the current day's) are not added.
+    Rerunning today's pipeline therefore doesn't filter out today's own picks.
+    Compacted curated files are read from ``data/archive/``.
+    """
+
+    def __init__(self, data_dir: Path, capacity: int = 20000, error_rate: float = 0.01,
+                 exclude: Iterable[str] = ()):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / "featured.bloom"
+        self.archive = DataArchive(self.data_dir)
+        self.exclude = set(exclude)
+        self.error_rate = error_rate
+
+        self.files: List[str] = []
+        self.bloom = self._load() or BloomFilter(capacity, error_rate)
+        self.sync()
+
+    def _load(self) -> Optional[BloomFilter]:
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+                bits = f.read()
+        except (OSError, ValueError):
+            return None
+
+        bloom = BloomFilter(header['capacity'], header['error_rate'])
+        if len(bits) != len(bloom.bits):
+            return None
+        bloom.bits = bytearray(bits)
+        bloom.count = header['count']
+        self.files = header['files']
+        return bloom
+
+    def _save(self):
+        header = {'capacity': self.bloom.capacity, 'error_rate': self.bloom.error_rate,
+                  'count': self.bloom.count, 'files': self.files}
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode() + b'\n')
+            f.write(self.bloom.bits)
+        tmp_path.replace(self.path)
+
+    def _curated_files(self) -> List[str]:
+        return [name for name in self.archive.glob("curated_*.json") if name not in self.exclude]
+
+    def _add_file(self, name: str):
+        curated = self.archive.read_json(name)
+        for items in curated.get('sections', {}).values():
+            for item in items:
+                for key in fingerprints(item):
+                    self.bloom.add(key)
+        self.files.append(name)
+
+    def sync(self) -> int:
+        """Add curated files that aren't in the filter yet; return how many were added"""
+        known = set(self.files)
+        new_files = [name for name in self._curated_files() if name not in known]
+        if not new_files:
+            return 0
+
+        for name in new_files:
+            self._add_file(name)
+
+        capacity = self.bloom.capacity
+        while self.bloom.count > capacity:
+            capacity *= 2
+        if capacity != self.bloom.capacity:
+            self.rebuild(capacity)
+        else:
+            self._save()
+        return len(new_files)
+
+    def rebuild(self, capacity: int):
+        """Recreate the filter at ``capacity`` from every curated file"""
+        self.bloom = BloomFilter(capacity, self.error_rate)
+        self.files = []
+        for name in self._curated_files():
+            self._add_file(name)
+        self._save()
+
+    def seen(self, item: Dict[str, Any]) -> bool:
+        """True if the item (by any of its URLs or its title) was featured before"""
+        return any(key in self.bloom for key in fingerprints(item))
+
+def describe_featured(item: Dict[str, Any]) -> str:
+    """Meta suffix for items the collector flagged rather than dropped"""
+    return " • featured in an earlier digest" if item.get('previously_featured') else ''
@@ -6,7 +6,6 @@ Small fonts, no graphs, 10-15 slides
 """
 
 import asyncio
-import json
 import yaml
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +16,8 @@ import os
 sys.path.insert(0, '/Users/rena/mcp-powerpoint-server')
 from server import call_tool
 
+from digest_repo import DigestRepository
+
 class PresentationGenerator:
     def __init__(self, config_path: str = "../config.yaml"):
         self.base_dir = Path(__file__).parent.parent
@@ -27,16 +28,11 @@ class PresentationGenerator:
 
         self.data_dir = self.base_dir / "data"
         self.output_dir = Path(self.config['presentation']['output_path'])
+        self.repo = None  # Opened for each run, closed when it ends
 
     def get_latest_curated_data(self):
         """Load the most recent curated content"""
-        data_files = sorted(self.data_dir.glob("curated_*.json"), reverse=True)
-
-        if not data_files:
-            raise FileNotFoundError("No curated data found. Run curate_content.py first.")
-
-        with open(data_files[0]) as f:
-            return json.load(f)
+        return self.repo.latest_digest()
 
     async def create_presentation(self, curated_data):
         """Generate clean presentation with small fonts, no graphs, 10-15 slides"""
@@ -292,6 +288,8 @@ class PresentationGenerator:
             "filename": filepath
         })
 
+        self.repo.record_artifact('presentation', filepath)
+
         print(f"\n✅ Presentation created successfully!")
         print(f"📁 Location: {filepath}")
 
@@ -310,22 +308,26 @@ class PresentationGenerator:
     async def generate(self) -> str:
         """Main generation workflow"""
         print("🎯 Starting presentation generation...\n")
+        self.repo = DigestRepository(self.data_dir)
 
-        # Load curated data
-        curated_data = self.get_latest_curated_data()
+        try:
+            # Load curated data
+            curated_data = self.get_latest_curated_data()
 
-        # Filter to only 3 sections (no Notable Discussions)
-        if 'sections' in curated_data:
-            curated_data['sections'] = {
-                k: v for k, v in curated_data['sections'].items()
-                if k != "Notable Discussions"
-            }
+            # Filter to only 3 sections (no Notable Discussions)
+            if 'sections' in curated_data:
+                curated_data['sections'] = {
+                    k: v for k, v in curated_data['sections'].items()
+                    if k != "Notable Discussions"
+                }
 
-        total_items = sum(len(items) for items in curated_data.get('sections', {}).values())
-        print(f"📊 Loaded curated content with {total_items} items (excluding discussions)\n")
+            total_items = sum(len(items) for items in curated_data.get('sections', {}).values())
+            print(f"📊 Loaded curated content with {total_items} items (excluding discussions)\n")
 
-        # Create presentation
-        filepath = await self.create_presentation(curated_data)
+            # Create presentation
+            filepath = await self.create_presentation(curated_data)
+        finally:
+            self.repo.close()
 
         return filepath
 
@@ -12,6 +12,9 @@ from pathlib import Path
 import anthropic
 import os
 
+from digest_repo import DigestRepository
+from llm_cache import create_message, llm_cache_from_config
+
 class VideoGenerator:
     def __init__(self):
         self.base_dir = Path(__file__).parent.parent
@@ -24,18 +27,14 @@ class VideoGenerator:
         self.output_dir = self.base_dir / "output"
         self.video_dir = self.base_dir / "videos"
         self.video_dir.mkdir(exist_ok=True)
+        self.repo = None  # Opened for each run, closed when it ends
 
         self.claude_client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        self.llm_cache = llm_cache_from_config(self.data_dir, self.config)
 
     def get_latest_curated_data(self):
         """Load most recent curated content"""
-        data_files = sorted(self.data_dir.glob("curated_*.json"), reverse=True)
-
-        if not data_files:
-            raise FileNotFoundError("No curated data found")
-
-        with open(data_files[0]) as f:
-            return json.load(f)
+        return self.repo.latest_digest()
 
     async def generate_script(self, curated_data):
         """Generate narration script using Claude"""
@@ -74,11 +73,12 @@ Output as JSON with sections for timing:
 
 Keep each section concise and engaging. Focus on WHY each item matters, not just WHAT it is."""
 
-        message = self.claude_client.messages.create(
+        request = dict(
             model="claude-sonnet-4-5-20250929",
             max_tokens=2000,
             messages=[{"role": "user", "content": prompt}]
         )
+        message = create_message(self.claude_client, self.llm_cache, **request)
 
         # Extract JSON from response
         response_text = message.content[0].text
@@ -97,6 +97,8 @@ Keep each section concise and engaging. Focus on WHY each item matters, not just
 
             script = json.loads(response_text)
         except json.JSONDecodeError:
+            if self.llm_cache:
+                self.llm_cache.invalidate(request)
             # Fallback to simple script
             script = {
                 "intro": f"Welcome to AI Weekly Digest for {datetime.now().strftime('%B %d, %Y')}.",
@@ -278,6 +280,7 @@ Keep each section concise and engaging. Focus on WHY each item matters, not just
                 preset='medium'
             )
 
+            self.repo.record_artifact('video', output_path)
             print(f"  ✓ Video created: {output_path}")
             return output_path
 
@@ -292,6 +295,7 @@ Keep each section concise and engaging. Focus on WHY each item matters, not just
     async def generate(self):
         """Main video generation workflow"""
         print("🎥 Starting video generation...\n")
+        self.repo = DigestRepository(self.data_dir)
 
         try:
             # Load curated data
@@ -318,6 +322,9 @@ Keep each section concise and engaging. Focus on WHY each item matters, not just
             print(f"\n❌ Video generation failed: {e}")
             return None
 
+        finally:
+            self.repo.close()
+
 async def main():
     generator = VideoGenerator()
     video_path = await generator.generate()
@@ -5,12 +5,13 @@ Creates a beautiful futuristic webpage for AI Weekly Digest
 """
 
 import asyncio
-import json
 import yaml
 from datetime import datetime
 from pathlib import Path
 import sys
 
+from digest_repo import DigestRepository
+
 class WebpageGenerator:
     def __init__(self, config_path: str = "../config.yaml"):
         self.base_dir = Path(__file__).parent.parent
@@ -22,26 +23,53 @@ class WebpageGenerator:
         self.data_dir = self.base_dir / "data"
         self.output_dir = self.base_dir / "output"
         self.output_dir.mkdir(exist_ok=True)
+        self.repo = None  # Opened for each run, closed when it ends
+        self.item_html = {}
 
-    def get_latest_curated_data(self):
-        """Load the most recent curated content"""
-        data_files = sorted(self.data_dir.glob("curated_*.json"), reverse=True)
+    @staticmethod
+    def item_key(item):
+        return (item['title'], item.get('insight', ''), item.get('meta', 'Source unknown'), item.get('url', ''))
+
+    def render_item(self, item):
+        """HTML card for one curated item, rendered once per distinct item"""
+        key = self.item_key(item)
+        if key not in self.item_html:
+            title, insight, meta, url = key
+            url_html = f'<a href="{url}" target="_blank" class="item-link">🔗 Read more</a>' if url else ''
+
+            self.item_html[key] = f"""
+                <div class="content-item">
+                    <h3 class="item-title">{title}</h3>
+                    <p class="item-insight">{insight}</p>
+                    <div class="item-meta">
+                        <span class="meta-source">📍 {meta}</span>
+                        {url_html}
+                    </div>
+                </div>
+                """
+        return self.item_html[key]
 
-        if not data_files:
-            raise FileNotFoundError("No curated data found. Run curate_content.py first.")
+    def prerender(self, section, index, item):
+        """``ContentCurator.on_item`` hook: render each card while curation is still streaming"""
+        if isinstance(item, dict) and item.get('title'):
+            self.render_item(item)
 
-        with open(data_files[0]) as f:
-            return json.load(f)
+    def get_latest_curated_data(self):
+        """Load the most recent curated content"""
+        return self.repo.latest_digest()
 
     def get_recent_digests(self, limit=5):
-        """Get list of recent digest files"""
-        data_files = sorted(self.data_dir.glob("curated_*.json"), reverse=True)
-        return data_files[:limit]
+        """Get the most recent digests, newest first"""
+        return self.repo.recent_digests(limit)
 
     async def create_webpage(self, curated_data):
         """Generate beautiful futuristic webpage"""
         print("🎨 Creating webpage...\n")
 
+        # Cards prerendered during curation for items that didn't make the final digest
+        final = {self.item_key(item) for items in curated_data.get('sections', {}).values() for item in items}
+        self.item_html = {key: html for key, html in self.item_html.items() if key in final}
+
         date_str = datetime.now().strftime('%Y%m%d')
         week_str = datetime.now().strftime('%B %d, %Y')
 
@@ -49,14 +77,12 @@ class WebpageGenerator:
         recent_digests = self.get_recent_digests(5)
         archive_html = ""
 
-        for idx, digest_file in enumerate(recent_digests):
-            with open(digest_file) as f:
-                digest_data = json.load(f)
-
-            digest_date = digest_file.stem.replace('curated_', '')
+        for idx, digest in enumerate(recent_digests):
+            digest_data = digest['data']
+            digest_date = digest['run_date']
             formatted_date = datetime.strptime(digest_date, '%Y%m%d').strftime('%B %d, %Y')
 
-            total_items = sum(len(items) for items in digest_data.get('sections', {}).values())
+            total_items = digest['item_count']
 
             # Create individual archive page for older digests
             if idx > 0:  # Skip the current week (index 0)
@@ -108,25 +134,7 @@ class WebpageGenerator:
             icon = section_icons.get(section_name, "📌")
             color = section_colors.get(section_name, "#5B9BD5")
 
-            items_html = ""
-            for item in items:
-                title = item['title']
-                insight = item.get('insight', '')
-                meta = item.get('meta', 'Source unknown')
-                url = item.get('url', '')
-
-                url_html = f'<a href="{url}" target="_blank" class="item-link">🔗 Read more</a>' if url else ''
-
-                items_html += f"""
-                <div class="content-item">
-                    <h3 class="item-title">{title}</h3>
-                    <p class="item-insight">{insight}</p>
-                    <div class="item-meta">
-                        <span class="meta-source">📍 {meta}</span>
-                        {url_html}
-                    </div>
-                </div>
-                """
+            items_html = "".join(self.render_item(item) for item in items)
 
             sections_html += f"""
             <section class="content-section" style="border-left: 4px solid {color}">
@@ -466,6 +474,7 @@ class WebpageGenerator:
         output_path = self.output_dir / "index.html"
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        self.repo.record_artifact('webpage', output_path)
 
         print(f"✅ Webpage created successfully!")
         print(f"📁 Location: {output_path}")
@@ -500,25 +509,7 @@ class WebpageGenerator:
             icon = section_icons.get(section_name, "📌")
             color = section_colors.get(section_name, "#5B9BD5")
 
-            items_html = ""
-            for item in items:
-                title = item['title']
-                insight = item.get('insight', '')
-                meta = item.get('meta', 'Source unknown')
-                url = item.get('url', '')
-
-                url_html = f'<a href="{url}" target="_blank" class="item-link">🔗 Read more</a>' if url else ''
-
-                items_html += f"""
-                <div class="content-item">
-                    <h3 class="item-title">{title}</h3>
-                    <p class="item-insight">{insight}</p>
-                    <div class="item-meta">
-                        <span class="meta-source">📍 {meta}</span>
-                        {url_html}
-                    </div>
-                </div>
-                """
+            items_html = "".join(self.render_item(item) for item in items)
 
             sections_html += f"""
             <section class="content-section" style="border-left: 4px solid {color}">
@@ -783,15 +774,19 @@ class WebpageGenerator:
     async def generate(self):
         """Main generation workflow"""
         print("🎯 Starting webpage generation...\n")
+        self.repo = DigestRepository(self.data_dir)
 
-        # Load curated data
-        curated_data = self.get_latest_curated_data()
+        try:
+            # Load curated data
+            curated_data = self.get_latest_curated_data()
 
-        total_items = sum(len(items) for items in curated_data.get('sections', {}).values())
-        print(f"📊 Loaded curated content with {total_items} items\n")
+            total_items = sum(len(items) for items in curated_data.get('sections', {}).values())
+            print(f"📊 Loaded curated content with {total_items} items\n")
 
-        # Create webpage
-        filepath = await self.create_webpage(curated_data)
+            # Create webpage
+            filepath = await self.create_webpage(curated_data)
+        finally:
+            self.repo.close()
 
         return filepath
 
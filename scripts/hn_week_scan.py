@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Hacker News Week Scanner
+Walks every HN item ID posted in a time window instead of the front-page snapshot
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+
+FetchItems = Callable[[List[int]], Awaitable[List[Any]]]
+
+# What ``fetch_items`` returns for an ID it couldn't fetch. ``None`` is an answer:
+# HN serves deleted and missing items as JSON null, so those IDs count as scanned.
+FETCH_FAILED = object()
+
+class HNWeekScanner:
+    """Scans the item ID range ``[first id at or after since, maxitem]`` in parallel batches.
+
+    ``fetch_items`` takes a list of item IDs and returns the decoded items in the same
+    order (``FETCH_FAILED`` for failures), so the scanner works with any fetch engine. Progress
+    is written to a cursor file after every batch; a scan interrupted part-way resumes
+    from the cursor on the next run for the same window instead of starting over.
+
+    IDs that failed to fetch are kept in the cursor and retried, up to ``retry_rounds``
+    times, once the range has been walked. Any still failing then stay in the cursor,
+    so the next run for the window retries them instead of losing those stories.
+    """
+
+    def __init__(self, fetch_items: FetchItems, cursor_path: Path,
+                 batch_size: int = 2000, probe_fanout: int = 16,
+                 retry_rounds: int = 2, retry_delay: float = 2):
+        self.fetch_items = fetch_items
+        self.cursor_path = Path(cursor_path)
+        self.batch_size = max(1, int(batch_size))
+        self.probe_fanout = max(1, int(probe_fanout))
+        self.retry_rounds = max(0, int(retry_rounds))
+        self.retry_delay = retry_delay
+
+    async def find_start_id(self, max_id: int, since_ts: float) -> int:
+        """Find the first item ID created at or after ``since_ts``.
+
+        Item IDs are assigned in creation order, so this is a search over a sorted
+        range. Each round probes ``probe_fanout`` evenly spaced IDs at once, which
+        narrows tens of millions of IDs to one in a handful of round trips. Probes
+        that come back empty (deleted or failed) are ignored, and a round where every
+        probe is empty is retried ``retry_rounds`` times before giving up with a
+        ``RuntimeError``: falling back to ID 1 would mean walking the whole history.
+        """
+        lo, hi = 1, max_id
+        failed_rounds = 0
+
+        while hi - lo > 1:
+            step = (hi - lo) / (self.probe_fanout + 1)
+            probes = sorted({lo + int(step * (k + 1)) for k in range(self.probe_fanout)} - {lo, hi})
+            if not probes:
+                break
+
+            items = await self.fetch_items(probes)
+            new_lo, new_hi = lo, hi
+            for probe_id, item in zip(probes, items):
+                if item is FETCH_FAILED or not item or 'time' not in item:
+                    continue
+                if item['time'] < since_ts:
+                    new_lo = probe_id
+                else:
+                    new_hi = probe_id
+                    break
+
+            if (new_lo, new_hi) == (lo, hi):
+                if FETCH_FAILED not in items and len(probes) == hi - lo - 1:
+                    # Every ID in between is deleted, so the scan can start right after lo
+                    return lo + 1
+                failed_rounds += 1
+                if failed_rounds > self.retry_rounds:
+                    raise RuntimeError(f"Couldn't find the first HN item of the window: "
+                                       f"every probe between {lo:,} and {hi:,} failed")
+                await asyncio.sleep(self.retry_delay * failed_rounds)
+                continue
+            failed_rounds = 0
+            lo, hi = new_lo, new_hi
+
+        return hi if hi - lo <= 1 else lo
+
+    def _load_cursor(self, window: str) -> Optional[Dict[str, Any]]:
+        if not self.cursor_path.exists():
+            return None
+
+        try:
+            with open(self.cursor_path) as f:
+                cursor = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        return cursor if cursor.get('window') == window else None
+
+    def _save_cursor(self, cursor: Dict[str, Any]):
+        tmp_path = self.cursor_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(cursor, f)
+        tmp_path.replace(self.cursor_path)
+
+    async def scan(self, max_id: int, since: datetime,
+                   keep: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """Fetch every item in the window and return the ones ``keep`` accepts"""
+        window = since.strftime('%Y-%m-%d')
+        cursor = self._load_cursor(window)
+
+        if cursor:
+            cursor['end_id'] = max(cursor['end_id'], max_id)
+            cursor.setdefault('failed', [])
+            print(f"  Resuming scan at item {cursor['next_id']:,} ({len(cursor['matches'])} matches so far)")
+        else:
+            start_id = await self.find_start_id(max_id, since.timestamp())
+            cursor = {'window': window, 'start_id': start_id, 'next_id': start_id,
+                      'end_id': max_id, 'matches': [], 'failed': []}
+
+        total = cursor['end_id'] - cursor['start_id'] + 1
+        started = time.monotonic()
+        scanned_this_run = 0
+
+        while cursor['next_id'] <= cursor['end_id']:
+            batch_end = min(cursor['next_id'] + self.batch_size, cursor['end_id'] + 1)
+            ids = list(range(cursor['next_id'], batch_end))
+            self._collect(cursor, ids, await self.fetch_items(ids), keep)
+
+            cursor['next_id'] = batch_end
+            self._save_cursor(cursor)
+
+            scanned_this_run += len(ids)
+            done = cursor['next_id'] - cursor['start_id']
+            rate = scanned_this_run / max(time.monotonic() - started, 1e-6)
+            print(f"  Scanned {done:,}/{total:,} items ({done * 100 // max(total, 1)}%) • "
+                  f"{len(cursor['matches'])} matches • {rate:,.0f} items/s")
+
+        for attempt in range(self.retry_rounds):
+            if not cursor['failed']:
+                break
+            await asyncio.sleep(self.retry_delay * (attempt + 1))
+            print(f"  Retrying {len(cursor['failed']):,} items that failed to fetch")
+            ids, cursor['failed'] = cursor['failed'], []
+            for offset in range(0, len(ids), self.batch_size):
+                batch = ids[offset:offset + self.batch_size]
+                self._collect(cursor, batch, await self.fetch_items(batch), keep)
+                self._save_cursor(cursor)
+
+        if cursor['failed']:
+            # Keep the cursor so the next run for this window retries them
+            print(f"  ⚠️  {len(cursor['failed']):,} items still failed to fetch; they'll be retried next run")
+            self._save_cursor(cursor)
+        else:
+            # The window is complete; the next run starts a fresh scan
+            self.cursor_path.unlink(missing_ok=True)
+        return cursor['matches']
+
+    @staticmethod
+    def _collect(cursor: Dict[str, Any], ids: List[int], items: List[Any],
+                 keep: Callable[[Dict[str, Any]], bool]):
+        """Add a batch's matches to the cursor and note the IDs that failed"""
+        for item_id, item in zip(ids, items):
+            if item is FETCH_FAILED:
+                cursor['failed'].append(item_id)
+            elif item is not None and keep(item):
+                cursor['matches'].append(item)
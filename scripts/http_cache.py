@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache
+On-disk response cache with ETag/Last-Modified revalidation and Cache-Control max-age
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)')
+
+class CachedResponse:
+    """Body of a GET served either from upstream or from the HTTP cache"""
+
+    def __init__(self, url: str, content: bytes, status_code: int = 200,
+                 from_cache: bool = False, not_modified: bool = False,
+                 headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.from_cache = from_cache          # served without touching the network
+        self.not_modified = not_modified      # upstream answered 304
+        self.headers = headers or {}
+
+    @property
+    def unchanged(self) -> bool:
+        """True when the body is the one already on disk, so cached parses are still valid"""
+        return self.from_cache or self.not_modified
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+class HTTPCache:
+    """Stores each URL's body plus its validators under ``cache_dir``.
+
+    Every URL maps to three files named after the SHA-256 of the URL: ``.json``
+    holds the validators and expiry, ``.body`` the raw bytes, and an optional
+    ``.parsed.json`` the result of parsing that exact body, so callers that get an
+    unchanged response can skip both the transfer and the parse.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> Path:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}{suffix}"
+
+    def _write(self, path: Path, data: bytes):
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{time.monotonic_ns()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored metadata for ``url``, or None if it isn't cached"""
+        meta_path = self._path(url, '.json')
+        body_path = self._path(url, '.body')
+        if not meta_path.exists() or not body_path.exists():
+            return None
+
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        return meta.get('expires_at', 0) > time.time()
+
+    def body(self, url: str) -> bytes:
+        return self._path(url, '.body').read_bytes()
+
+    def conditional_headers(self, meta: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators"""
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def _expires_at(self, headers) -> float:
+        cache_control = headers.get('Cache-Control', '').lower()
+        if 'no-cache' in cache_control or 'no-store' in cache_control:
+            return 0
+
+        match = MAX_AGE_RE.search(cache_control)
+        if not match:
+            return 0
+
+        age = int(headers.get('Age', 0) or 0)
+        return time.time() + max(int(match.group(1)) - age, 0)
+
+    def store(self, url: str, response) -> Optional[Dict[str, Any]]:
+        """Save a 200 response, unless upstream forbids storing it"""
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return None
+
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'expires_at': self._expires_at(response.headers),
+            'body_sha256': hashlib.sha256(response.content).hexdigest(),
+            'stored_at': time.time()
+        }
+        self._write(self._path(url, '.body'), response.content)
+        self._write(self._path(url, '.json'), json.dumps(meta).encode())
+        return meta
+
+    def revalidated(self, url: str, meta: Dict[str, Any], response) -> Dict[str, Any]:
+        """Record a 304: keep the body, take any new validators and expiry"""
+        meta = dict(meta)
+        meta['etag'] = response.headers.get('ETag') or meta.get('etag')
+        meta['last_modified'] = response.headers.get('Last-Modified') or meta.get('last_modified')
+        meta['expires_at'] = self._expires_at(response.headers)
+        self._write(self._path(url, '.json'), json.dumps(meta).encode())
+        return meta
+
+    def load_parsed(self, url: str) -> Optional[Any]:
+        """Return the parse stored for the current body of ``url``, if any"""
+        meta = self.lookup(url)
+        parsed_path = self._path(url, '.parsed.json')
+        if not meta or not parsed_path.exists():
+            return None
+
+        try:
+            with open(parsed_path) as f:
+                parsed = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if parsed.get('body_sha256') != meta.get('body_sha256'):
+            return None
+        return parsed['data']
+
+    def store_parsed(self, url: str, data: Any):
+        meta = self.lookup(url)
+        if not meta:
+            return
+        payload = {'body_sha256': meta.get('body_sha256'), 'data': data}
+        self._write(self._path(url, '.parsed.json'), json.dumps(payload).encode())
+
+    def prune(self, max_age_days: float):
+        """Delete entries that were last stored more than ``max_age_days`` ago"""
+        cutoff = time.time() - max_age_days * 86400
+        for path in self.cache_dir.glob('*/*'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
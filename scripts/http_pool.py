@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Async HTTP Pool
+Bounded-concurrency async fetching on top of a pooled keep-alive requests session
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+from cassette import Cassette, CassetteMiss
+from http_cache import HTTPCache, CachedResponse
+from rate_limit import TokenBucket
+from resilience import Resilience, CircuitOpenError
+
+DEFAULT_HEADERS = {'User-Agent': 'AIWeeklyDigest/1.0'}
+
+def discard_response(future: asyncio.Future):
+    """Done-callback for a request whose response nobody will read"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+class AsyncHTTPPool:
+    """Runs blocking requests calls on a dedicated thread pool so the event loop stays free.
+
+    At most ``max_concurrency`` requests are in flight at once, and all of them share
+    one ``requests.Session`` whose connection pool is sized to match, so connections
+    are kept alive and reused instead of re-handshaking per request. ``min_interval``
+    spaces out request starts for APIs that ask clients to pace themselves, and a
+    ``rate_limiter`` token bucket is fed from each response's rate-limit headers.
+
+    Every request goes through ``resilience``: a host whose circuit is open fails
+    fast, failed attempts are retried with jittered backoff, and slow requests are
+    hedged with a duplicate. Hedging is skipped when ``min_interval`` or a
+    ``rate_limiter`` is set, since those APIs count every request against us.
+
+    With a ``cassette``, the session records to it or replays from it. There is no
+    upstream to be polite to during a replay, so pacing, rate limiting, hedging and
+    retry backoff are off, and a request missing from the cassette fails at once
+    with :class:`CassetteMiss` without counting against the host's circuit.
+
+    Pools for different sources can share one ``executor``. Each pool still keeps
+    its own concurrency limit, but the number of worker threads is capped by the
+    shared executor, not summed over every pool. A shared executor is left running
+    by :meth:`close`.
+    """
+
+    def __init__(self, max_concurrency: int = 20, timeout: float = 10,
+                 headers: Optional[Dict[str, str]] = None,
+                 http_cache: Optional[HTTPCache] = None,
+                 min_interval: float = 0,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 max_rate_limit_retries: int = 2,
+                 cassette: Optional[Cassette] = None,
+                 resilience: Optional[Resilience] = None,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.replaying = cassette is not None and cassette.replaying
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.http_cache = http_cache
+        self.min_interval = 0 if self.replaying else min_interval
+        self.rate_limiter = None if self.replaying else rate_limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.resilience = resilience or Resilience()
+        self.hedging = not (self.replaying or self.min_interval or self.rate_limiter)
+        self._next_request_at = 0.0
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_concurrency)
+        if cassette:
+            cassette.mount(self.session, adapter)
+        else:
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+
+        self.owns_executor = executor is None
+        if executor:
+            self.executor = executor
+        else:
+            # Extra workers so hedged duplicates don't queue behind the requests they back up
+            hedge_workers = max(1, self.max_concurrency // 4) if self.hedging else 0
+            self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency + hedge_workers,
+                                               thread_name_prefix='http-pool')
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def get(self, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """GET a URL without blocking the event loop"""
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(self.max_rate_limit_retries + 1):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+
+            response = await self._fetch(url, timeout, kwargs)
+
+            if not self.rate_limiter:
+                return response
+
+            self.rate_limiter.update_from_headers(response.headers)
+            if response.status_code != 429 or attempt == self.max_rate_limit_retries:
+                return response
+
+            retry_after = response.headers.get('Retry-After') or response.headers.get('X-Ratelimit-Reset')
+            try:
+                self.rate_limiter.pause(float(retry_after))
+            except (TypeError, ValueError):
+                self.rate_limiter.pause(2 ** attempt)
+
+    async def _fetch(self, url: str, timeout: float, kwargs: Dict[str, Any]) -> requests.Response:
+        """One logical GET: circuit check, then attempts with jittered backoff between them"""
+        host = urlsplit(url).netloc
+        breaker = self.resilience.breaker(host)
+        stats = self.resilience.stats(host)
+
+        for attempt in range(self.resilience.retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}, not requesting {url}")
+
+            try:
+                async with self.semaphore:
+                    await self._pace()
+                    response = await self._send(url, timeout, kwargs, host)
+            except CassetteMiss:
+                raise
+            except (requests.ConnectionError, requests.Timeout):
+                stats.errors += 1
+                breaker.record_failure()
+                if attempt == self.resilience.retries:
+                    raise
+            except BaseException:
+                # Anything else (redirect loops, broken chunked bodies, cancellation) is
+                # not retried but still counts, so a half-open trial never stays in flight
+                stats.errors += 1
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                    return response
+                stats.errors += 1
+                breaker.record_failure()
+                if attempt == self.resilience.retries:
+                    return response
+
+            # A replayed 5xx is followed by the recording of the retry that was made live
+            stats.retries += 1
+            if not self.replaying:
+                await asyncio.sleep(self.resilience.backoff(attempt))
+
+    async def _pace(self):
+        if self.min_interval:
+            loop = asyncio.get_running_loop()
+            delay = self._next_request_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_request_at = loop.time() + self.min_interval
+
+    async def _send(self, url: str, timeout: float, kwargs: Dict[str, Any], host: str) -> requests.Response:
+        """Run the blocking GET on the worker pool, hedging it if it outlives the host's p95"""
+        loop = asyncio.get_running_loop()
+        stats = self.resilience.stats(host)
+        stats.requests += 1
+
+        def timed_get():
+            started = time.monotonic()
+            response = self.session.get(url, timeout=timeout, **kwargs)
+            stats.observe(time.monotonic() - started)
+            return response
+
+        primary = loop.run_in_executor(self.executor, timed_get)
+        hedge_after = self.resilience.hedge_delay(host) if self.hedging else None
+        if hedge_after is None or hedge_after >= timeout:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        stats.hedges += 1
+        hedge = loop.run_in_executor(self.executor, timed_get)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The loser keeps its worker until it finishes; its response is then
+                    # closed, which releases a streamed one's connection unread
+                    loser = hedge if future is primary else primary
+                    loser.add_done_callback(discard_response)
+                    if future is hedge:
+                        stats.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    async def get_json(self, url: str, timeout: Optional[float] = None, **kwargs) -> Any:
+        """GET a URL and decode its JSON body"""
+        response = await self.get(url, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_capped(self, url: str, max_bytes: int,
+                         timeout: Optional[float] = None) -> Tuple[requests.Response, bytes]:
+        """GET a URL but read at most ``max_bytes`` of its body; the rest is never downloaded.
+
+        The response is streamed and closed after the cap (or the end of the body),
+        so a huge page costs ``max_bytes`` of transfer, not its full size.
+        """
+        response = await self.get(url, timeout=timeout, stream=True)
+
+        def read() -> bytes:
+            body = bytearray()
+            try:
+                for chunk in response.iter_content(chunk_size=16384):
+                    body += chunk
+                    if len(body) >= max_bytes:
+                        break
+            finally:
+                response.close()
+            return bytes(body[:max_bytes])
+
+        loop = asyncio.get_running_loop()
+        return response, await loop.run_in_executor(self.executor, read)
+
+    async def get_many_json(self, urls: List[str], timeout: Optional[float] = None,
+                            failed: Any = None) -> List[Any]:
+        """Fetch many JSON URLs concurrently, returning results in input order.
+
+        A URL that fails (timeout, HTTP error, bad JSON) yields ``failed`` in its slot
+        rather than failing the whole batch. Pass a sentinel to tell failures apart
+        from bodies that are JSON ``null``.
+        """
+        async def fetch_one(url):
+            try:
+                return await self.get_json(url, timeout=timeout)
+            except (requests.RequestException, ValueError):
+                return failed
+
+        return await asyncio.gather(*(fetch_one(url) for url in urls))
+
+    async def get_cached(self, url: str, timeout: Optional[float] = None) -> CachedResponse:
+        """GET through the HTTP cache.
+
+        A body still inside its Cache-Control max-age is served without a request.
+        Otherwise the stored ETag/Last-Modified are sent as a conditional request and
+        a 304 is answered from disk. Without an HTTP cache this is a plain GET.
+        """
+        if not self.http_cache:
+            response = await self.get(url, timeout=timeout)
+            response.raise_for_status()
+            return CachedResponse(url, response.content, response.status_code,
+                                  headers=dict(response.headers))
+
+        meta = self.http_cache.lookup(url)
+        if meta and self.http_cache.is_fresh(meta):
+            return CachedResponse(url, self.http_cache.body(url), from_cache=True)
+
+        response = await self.get(url, timeout=timeout, headers=self.http_cache.conditional_headers(meta))
+
+        if response.status_code == 304 and meta:
+            self.http_cache.revalidated(url, meta, response)
+            return CachedResponse(url, self.http_cache.body(url), not_modified=True,
+                                  headers=dict(response.headers))
+
+        response.raise_for_status()
+        self.http_cache.store(url, response)
+        return CachedResponse(url, response.content, response.status_code,
+                              headers=dict(response.headers))
+
+    async def get_cached_json(self, url: str, timeout: Optional[float] = None) -> Any:
+        """GET a JSON URL through the HTTP cache"""
+        return (await self.get_cached(url, timeout=timeout)).json()
+
+    async def get_parsed(self, url: str, parse: Callable[[bytes], Any],
+                         timeout: Optional[float] = None) -> Any:
+        """GET through the HTTP cache and parse the body, reusing the stored parse if unchanged.
+
+        ``parse`` runs on the worker pool and must return something JSON-serializable.
+        """
+        response = await self.get_cached(url, timeout=timeout)
+
+        if self.http_cache and response.unchanged:
+            parsed = self.http_cache.load_parsed(url)
+            if parsed is not None:
+                return parsed
+
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(self.executor, parse, response.content)
+
+        if self.http_cache:
+            self.http_cache.store_parsed(url, parsed)
+        return parsed
+
+    def close(self):
+        """Release pooled connections and worker threads"""
+        if self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Item Cache
+Persistent SQLite cache of fetched source items (HN items, Reddit listings)
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    source       TEXT NOT NULL,
+    item_id      TEXT NOT NULL,
+    data         TEXT NOT NULL,
+    fetched_at   REAL NOT NULL,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (source, item_id)
+)
+"""
+
+# SQLite's default limit on bound parameters is 999
+QUERY_CHUNK = 500
+
+class ItemCache:
+    """Caches decoded items keyed by ``(source, item_id)``.
+
+    Titles, URLs and timestamps never change once an item exists, but scores and
+    comment counts do. Every entry therefore records when it was last refreshed, and
+    a cached item is only considered stale once it is older than ``ttl_seconds`` *and*
+    its mutable fields can still affect the outcome (the ``refresh_if`` predicate
+    passed to :meth:`lookup`). Everything else is served from disk indefinitely.
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: float = 6 * 3600):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+
+    def _load(self, source: str, keys: List[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        rows = {}
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT item_id, data, refreshed_at FROM items WHERE source = ? AND item_id IN ({placeholders})",
+                [source, *chunk]
+            )
+            for item_id, data, refreshed_at in cursor:
+                rows[item_id] = (json.loads(data), refreshed_at)
+        return rows
+
+    def lookup(self, source: str, item_ids: List[Any],
+               refresh_if: Optional[Callable[[Dict[str, Any]], bool]] = None
+               ) -> Tuple[Dict[Any, Dict[str, Any]], List[Any]]:
+        """Split ``item_ids`` into cached items and IDs that need fetching.
+
+        Returns ``(cached, to_fetch)``. ``cached`` also contains stale items that are
+        being refetched, so callers can fall back to them if the refresh fails.
+        """
+        now = time.time()
+        rows = self._load(source, [str(item_id) for item_id in item_ids])
+
+        cached = {}
+        to_fetch = []
+        for item_id in item_ids:
+            row = rows.get(str(item_id))
+            if row is None:
+                self.misses += 1
+                to_fetch.append(item_id)
+                continue
+
+            item, refreshed_at = row
+            cached[item_id] = item
+            if now - refreshed_at <= self.ttl_seconds or (refresh_if and not refresh_if(item)):
+                self.hits += 1
+            else:
+                self.refreshed += 1
+                to_fetch.append(item_id)
+
+        return cached, to_fetch
+
+    def put_many(self, source: str, items: Dict[Any, Dict[str, Any]]):
+        """Store freshly fetched items, keeping their original first-fetch time"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO items (source, item_id, data, fetched_at, refreshed_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (source, item_id)
+                   DO UPDATE SET data = excluded.data, refreshed_at = excluded.refreshed_at""",
+                [(source, str(item_id), json.dumps(item), now, now) for item_id, item in items.items()]
+            )
+
+    def prune(self, max_age_days: float, source_max_age_days: Optional[Dict[str, float]] = None):
+        """Drop items first fetched more than ``max_age_days`` ago.
+
+        ``source_max_age_days`` gives some sources their own retention instead.
+        """
+        now = time.time()
+        overrides = source_max_age_days or {}
+        placeholders = ','.join('?' * len(overrides))
+        with self.conn:
+            self.conn.execute(f"DELETE FROM items WHERE fetched_at < ? AND source NOT IN ({placeholders})",
+                              (now - max_age_days * 86400, *overrides))
+            for source, days in overrides.items():
+                self.conn.execute("DELETE FROM items WHERE source = ? AND fetched_at < ?",
+                                  (source, now - days * 86400))
+
+    def vacuum(self):
+        """Give the space freed by :meth:`prune` back to the filesystem"""
+        self.conn.execute("VACUUM")
+
+    def summary(self) -> str:
+        total = self.hits + self.misses + self.refreshed
+        hit_rate = self.hits * 100 // total if total else 0
+        return f"{self.hits} hits, {self.misses} misses, {self.refreshed} refreshed ({hit_rate}% hit rate)"
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON Parsing
+Validates a JSON document as it streams in and hands over completed values early
+"""
+
+import json
+import re
+from typing import List, Any, Callable, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+LITERAL_RE = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+LITERAL_CHARS = set('-+.0123456789eEtruefalsn')
+WHITESPACE = set(' \t\r\n')
+# What may precede the document: whitespace and an opening markdown code fence
+FENCE = '```json'
+
+class JSONStreamError(ValueError):
+    """The streamed text can no longer become valid JSON"""
+
+class Container:
+    __slots__ = ('kind', 'path', 'start', 'state', 'key', 'index')
+
+    def __init__(self, kind: str, path: Path, start: int):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        # Objects: key_or_end, key, colon, value, comma_or_end; arrays: value_or_end, value, comma_or_end
+        self.state = 'key_or_end' if kind == 'object' else 'value_or_end'
+        self.key: Optional[str] = None
+        self.index = -1
+
+class IncrementalJSONParser:
+    """Push parser for one JSON document fed in arbitrary chunks.
+
+    Every character is checked as it arrives, so a structural error (a stray
+    bracket, a missing comma, prose instead of JSON) raises
+    :class:`JSONStreamError` at once instead of after the whole response.
+    Each completed value whose path satisfies ``watch`` is decoded and passed
+    to ``on_value(path, value)``; a path is the tuple of keys and indexes from
+    the root, e.g. ``('sections', 'Industry Updates', 2)``. Leading whitespace
+    and a markdown code fence are skipped, and anything after the document is
+    ignored. Once complete, the whole document is in :attr:`result`.
+    """
+
+    def __init__(self, watch: Callable[[Path], bool] = lambda path: False,
+                 on_value: Callable[[Path, Any], None] = lambda path, value: None):
+        self.watch = watch
+        self.on_value = on_value
+        self.buffer = ''
+        self.stack: List[Container] = []
+        self.prefix = ''
+        self.started = False
+        self.done = False
+        self.result: Any = None
+        self.string_start: Optional[int] = None
+        self.string_is_key = False
+        self.escape = False
+        self.literal_start: Optional[int] = None
+        self.value_path: Path = ()  # Of the string or literal being read
+
+    def _error(self, position: int, message: str):
+        context = self.buffer[max(0, position - 40):position + 1]
+        raise JSONStreamError(f"{message} at character {position}: ...{context!r}")
+
+    def _begin_value(self, position: int) -> Path:
+        """Path of a value starting at ``position``; errors if no value is expected here"""
+        if not self.stack:
+            return ()
+        top = self.stack[-1]
+        if top.state not in ('value', 'value_or_end'):
+            self._error(position, "Unexpected value")
+        if top.kind == 'array':
+            top.index += 1
+            return top.path + (top.index,)
+        return top.path + (top.key,)
+
+    def _end_value(self, path: Path, start: int, end: int):
+        if self.stack:
+            self.stack[-1].state = 'comma_or_end'
+        if self.watch(path) or not self.stack:
+            try:
+                value = json.loads(self.buffer[start:end])
+            except ValueError as e:
+                self._error(end - 1, f"Invalid value ({e})")
+            if not self.stack:
+                self.result = value
+                self.done = True
+            if self.watch(path):
+                self.on_value(path, value)
+
+    def _end_literal(self, position: int):
+        start, self.literal_start = self.literal_start, None
+        if not LITERAL_RE.fullmatch(self.buffer[start:position]):
+            self._error(position - 1, f"Invalid literal {self.buffer[start:position]!r}")
+        self._end_value(self.value_path, start, position)
+
+    def feed(self, chunk: str):
+        offset = len(self.buffer)
+        self.buffer += chunk
+        for position in range(offset, len(self.buffer)):
+            if self.done:
+                return
+            char = self.buffer[position]
+
+            if self.string_start is not None:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    start, self.string_start = self.string_start, None
+                    if self.string_is_key:
+                        try:
+                            self.stack[-1].key = json.loads(self.buffer[start:position + 1])
+                        except ValueError as e:
+                            self._error(position, f"Invalid key ({e})")
+                        self.stack[-1].state = 'colon'
+                    else:
+                        self._end_value(self.value_path, start, position + 1)
+                continue
+
+            if self.literal_start is not None:
+                if char in LITERAL_CHARS:
+                    continue
+                self._end_literal(position)
+                if self.done:
+                    return
+
+            if not self.started:
+                if char in '{[':
+                    self.started = True
+                elif char in WHITESPACE:
+                    continue
+                else:
+                    self.prefix += char
+                    if not FENCE.startswith(self.prefix):
+                        self._error(position, "Expected the JSON document to start")
+                    continue
+
+            if char in WHITESPACE:
+                continue
+            top = self.stack[-1] if self.stack else None
+
+            if char in '{[':
+                path = self._begin_value(position)
+                self.stack.append(Container('object' if char == '{' else 'array', path, position))
+            elif char in '}]':
+                kind = 'object' if char == '}' else 'array'
+                if not top or top.kind != kind or top.state not in ('key_or_end', 'value_or_end', 'comma_or_end'):
+                    self._error(position, f"Unexpected '{char}'")
+                self.stack.pop()
+                self._end_value(top.path, top.start, position + 1)
+            elif char == '"':
+                if top and top.kind == 'object' and top.state in ('key', 'key_or_end'):
+                    self.string_is_key = True
+                else:
+                    self.value_path = self._begin_value(position)
+                    self.string_is_key = False
+                self.string_start = position
+            elif char == ':':
+                if not top or top.state != 'colon':
+                    self._error(position, "Unexpected ':'")
+                top.state = 'value'
+            elif char == ',':
+                if not top or top.state != 'comma_or_end':
+                    self._error(position, "Unexpected ','")
+                top.state = 'key' if top.kind == 'object' else 'value'
+            elif char in LITERAL_CHARS:
+                self.value_path = self._begin_value(position)
+                self.literal_start = position
+            else:
+                self._error(position, f"Unexpected {char!r}")
+
+    def close(self) -> Any:
+        """The parsed document; raises if the stream ended before it was complete"""
+        if not self.done:
+            self._error(len(self.buffer) - 1, "Response ended before the JSON document was complete")
+        return self.result
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher
+Single compiled regex for matching tracked keywords and phrases in titles
+"""
+
+import re
+from typing import List, Iterable, Iterator, Match
+
+# Words inside a phrase may be separated by any run of spaces, hyphens or underscores,
+# so "ai agents" also matches "AI-agents" and "ai_agents"
+SEPARATOR = r'[\s\-_]+'
+
+# Left context that puts a match in a URL path: a scheme, or a dotted host then "/"
+URL_PATH_RE = re.compile(r'(?:://|\w\.\w[\w.-]*/)\S*\Z')
+
+def _words(text: str) -> List[str]:
+    return [word for word in re.split(SEPARATOR, text.strip().lower()) if word]
+
+class KeywordMatcher:
+    """Matches a keyword list in one pass over the text.
+
+    All keywords are compiled into a single alternation, longest first, anchored so
+    a keyword only matches as a whole word or phrase: "gpt" matches "GPT-4" and
+    "GPT/Claude" but not "gpts", "chatgpt", a host like "gpt.example.com" or a path
+    like "example.com/gpt". :meth:`matches` reports which configured keywords were hit.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = []
+        self._canonical = {}
+
+        for keyword in keywords:
+            key = ' '.join(_words(keyword))
+            if key and key not in self._canonical:
+                self._canonical[key] = keyword
+                self.keywords.append(keyword)
+
+        alternatives = sorted(
+            (SEPARATOR.join(re.escape(word) for word in key.split(' ')) for key in self._canonical),
+            key=len, reverse=True
+        )
+        # An empty keyword list compiles to a pattern that never matches.
+        # Boundaries also reject hostname neighbours so "llm" doesn't hit "llm.example.com"
+        body = '|'.join(alternatives) or r'(?!)'
+        self.pattern = re.compile(rf'(?<![\w.])(?:{body})(?!\w|\.\w)', re.IGNORECASE)
+
+    def _finditer(self, text: str) -> Iterator[Match]:
+        """Keyword matches, skipping those inside a URL path"""
+        for match in self.pattern.finditer(text):
+            if not URL_PATH_RE.search(text, 0, match.start()):
+                yield match
+
+    def search(self, text: str) -> bool:
+        """True if any keyword occurs in ``text``"""
+        return bool(text) and next(self._finditer(text), None) is not None
+
+    def matches(self, text: str) -> List[str]:
+        """Return the configured keywords found in ``text``, in order of first appearance"""
+        if not text:
+            return []
+
+        found = []
+        for match in self._finditer(text):
+            keyword = self._canonical[' '.join(_words(match.group(0)))]
+            if keyword not in found:
+                found.append(keyword)
+        return found
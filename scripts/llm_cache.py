@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+Content-addressed SQLite cache of Claude responses, so a rerun doesn't repeat identical calls
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+
+from anthropic.types import Message
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    model       TEXT,
+    response    TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    used_at     REAL NOT NULL
+)
+"""
+
+class LLMCache:
+    """Stores each ``messages.create`` response under a hash of its full request.
+
+    The key covers every request parameter (model, temperature, max_tokens,
+    messages, system prompt, tools), so any change to the prompt or settings is a
+    miss and nothing stale is ever served. Hits refresh an entry's ``used_at``.
+    Once the stored responses exceed ``max_bytes``, the least recently used ones
+    are evicted. Truncated responses (``stop_reason == 'max_tokens'``) are never
+    stored, and callers that can't use a response should :meth:`invalidate` it.
+
+    With ``bypass`` set (or ``LLM_CACHE_BYPASS=1`` in the environment), every call
+    goes to the API, and its response still replaces the cached one.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int = 50 * 1024 * 1024, bypass: bool = False):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.bypass = bypass or os.environ.get('LLM_CACHE_BYPASS') == '1'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Curation calls can run on worker threads
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Message]:
+        if self.bypass:
+            return None
+        with self._lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+        return Message.model_validate(json.loads(row[0]))
+
+    def put(self, key: str, model: str, message: Message):
+        response = json.dumps(message.model_dump(mode='json'))
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, used_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response), now, now)
+            )
+            self._evict()
+
+    def invalidate(self, request: Dict[str, Any]):
+        """Drop the cached response to ``request`` (e.g. one that failed to parse)"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (self.key(request),))
+
+    def _evict(self):
+        total = 0
+        stale = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY used_at DESC"):
+            total += size
+            if total > self.max_bytes:
+                stale.append((key,))
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def create(self, client, **request) -> Message:
+        """``client.messages.create(**request)``, answered from the cache when possible"""
+        key = self.key(request)
+        message = self.get(key)
+        if message is not None:
+            self.hits += 1
+            print("  ♻️  Reusing cached Claude response")
+            return message
+
+        self.misses += 1
+        message = client.messages.create(**request)
+        if message.stop_reason != 'max_tokens':
+            self.put(key, request.get('model'), message)
+        return message
+
+    def stream(self, client, on_text: Callable[[str], None], **request) -> Message:
+        """Like :meth:`create`, but over ``client.messages.stream``, passing text to ``on_text`` as it arrives.
+
+        A cached response is passed in one piece. If ``on_text`` raises, the
+        stream is closed (ending generation) and nothing is cached.
+        """
+        key = self.key(request)
+        message = self.get(key)
+        if message is not None:
+            self.hits += 1
+            print("  ♻️  Reusing cached Claude response")
+            on_text(message_text(message))
+            return message
+
+        self.misses += 1
+        message = stream_response(client, on_text, **request)
+        if message.stop_reason != 'max_tokens':
+            self.put(key, request.get('model'), message)
+        return message
+
+    def vacuum(self):
+        """Give the space freed by evictions back to the filesystem"""
+        with self._lock:
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        self.conn.close()
+
+def llm_cache_from_config(data_dir: Path, config: Dict[str, Any]) -> Optional[LLMCache]:
+    """The cache described by config.yaml ``llm_cache:``, or None if it is disabled"""
+    cache_config = config.get('llm_cache', {})
+    if not cache_config.get('enabled', True):
+        return None
+    return LLMCache(Path(data_dir) / "llm_cache.db",
+                    max_bytes=cache_config.get('max_mb', 50) * 1024 * 1024,
+                    bypass=cache_config.get('bypass', False))
+
+def message_text(message: Message) -> str:
+    """The answer in ``message``: its tool call's input as JSON if it made one, else its text"""
+    for block in message.content:
+        if block.type == 'tool_use':
+            return json.dumps(block.input)
+    return ''.join(block.text for block in message.content if block.type == 'text')
+
+def stream_response(client, on_text: Callable[[str], None], **request) -> Message:
+    """``client.messages.stream(**request)``, feeding each text or tool-input JSON delta to ``on_text``"""
+    with client.messages.stream(**request) as stream:
+        for event in stream:
+            # A tool call's answer is its input; any text next to it is commentary
+            if event.type == 'text' and 'tools' not in request:
+                on_text(event.text)
+            elif event.type == 'input_json':
+                on_text(event.partial_json)
+        return stream.get_final_message()
+
+def create_message(client, cache: Optional[LLMCache], **request) -> Message:
+    """``client.messages.create(**request)`` through ``cache`` if there is one"""
+    return cache.create(client, **request) if cache else client.messages.create(**request)
+
+def stream_message(client, cache: Optional[LLMCache], on_text: Callable[[str], None], **request) -> Message:
+    """:func:`stream_response` through ``cache`` if there is one"""
+    return cache.stream(client, on_text, **request) if cache else stream_response(client, on_text, **request)
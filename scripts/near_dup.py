@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate Clustering
+MinHash signatures with LSH banding to group differently-worded posts about the same story
+"""
+
+import random
+import re
+import zlib
+from typing import List, Dict, Any, Optional
+
+from dedup import news_lists
+
+# Words that carry no identity in news headlines: "OpenAI launches X" and
+# "OpenAI's new X is out" should both reduce to {openai, x}
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by',
+    'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'it', 'its', 'this', 'that',
+    'these', 'those', 'we', 'you', 'your', 'our', 'their', 'they', 'i', 'my', 'me', 'how',
+    'what', 'why', 'when', 'who', 'which', 'can', 'will', 'just', 'now', 'about', 'into',
+    'new', 'out', 'here', 'show', 'ask', 'hn', 'launch', 'launches', 'launched', 'launching',
+    'release', 'releases', 'released', 'releasing', 'announce', 'announces', 'announced',
+    'announcing', 'introduce', 'introduces', 'introduced', 'introducing', 'unveil', 'unveils',
+    'unveiled', 'available', 'today', 'official', 'officially', 'finally', 'via',
+    's', 't'  # left over from possessives and contractions ("OpenAI's", "isn't")
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+CASED_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[.\-][A-Za-z0-9]+)*")
+MERSENNE_PRIME = (1 << 61) - 1
+SUMMARY_TOKENS = 20
+
+# Names and versions ("GPT-5", "Claude", "4", "Opus") are what tell two stories apart
+NAME_WEIGHT = 3
+# Acronyms that name no particular story in AI news
+GENERIC_TERMS = {'ai', 'llm', 'llms', 'api', 'apis', 'ml', 'gpu', 'gpus', 'agi', 'rag', 'sota', 'ceo', 'oss', 'pdf'}
+
+Terms = Dict[str, float]
+
+def is_name(word: str, sentence_start: bool, title_case: bool) -> bool:
+    """Whether ``word`` (as written) looks like a product, company or version name"""
+    if word.lower() in GENERIC_TERMS:
+        return False
+    if any(char.isdigit() for char in word) or any(char.isupper() for char in word[1:]):
+        return True  # "GPT-5", "3.5", "OpenAI", "DeepSeek"
+    # A capital is only a hint mid-sentence, and only if the text isn't in Title Case
+    return word[0].isupper() and not sentence_start and not title_case
+
+def terms(text: str, limit: Optional[int] = None) -> Terms:
+    """Content words of ``text``, lowercased, each weighted ``NAME_WEIGHT`` if it is a name and 1 otherwise"""
+    matches = [(m.group(), m.start()) for m in CASED_TOKEN_RE.finditer(text)]
+    # Title Case capitalizes function words too ("Meta Releases Llama 4")
+    function_words = [word for word, _ in matches if word.lower() in STOPWORDS and len(word) > 3]
+    title_case = bool(function_words) and all(word[0].isupper() for word in function_words)
+
+    weights: Terms = {}
+    for word, start in matches:
+        lowered = word.lower()
+        if lowered in STOPWORDS:
+            continue
+        if limit is not None and len(weights) >= limit and lowered not in weights:
+            break
+        before = text[:start].rstrip()
+        sentence_start = not before or before[-1] in '.!?'
+        weight = NAME_WEIGHT if is_name(word, sentence_start, title_case) else 1
+        weights[lowered] = max(weight, weights.get(lowered, 0))
+    return weights
+
+def item_summary(item: Dict[str, Any]) -> str:
+    return item.get('article_summary') or item.get('summary') or ''
+
+def features(item: Dict[str, Any]) -> Terms:
+    """Weighted content words of an item's title"""
+    return terms(item.get('title', ''))
+
+def summary_features(item: Dict[str, Any]) -> Optional[Terms]:
+    """Title words plus the opening of the item's (article) summary, or None without a summary"""
+    summary = item_summary(item)
+    if not summary:
+        return None
+    combined = features(item)
+    for word, weight in terms(summary, SUMMARY_TOKENS).items():
+        combined[word] = max(weight, combined.get(word, 0))
+    return combined
+
+def similarity(a: Terms, b: Terms) -> float:
+    """Weighted Jaccard similarity; a word shared by both counts with the higher of its weights.
+
+    "OpenAI launches GPT-5" and "OpenAI's new GPT-5 is out" score 1.0, while
+    "Claude 3.5 Sonnet" and "Claude 3.5 Haiku" differ in a name and score 0.4.
+    """
+    shared = sum(max(a[word], b[word]) for word in a.keys() & b.keys())
+    union = sum(a.values()) + sum(b.values()) - sum(min(a[word], b[word]) for word in a.keys() & b.keys())
+    return shared / union if union else 0.0
+
+def engagement(item: Dict[str, Any]) -> int:
+    return item.get('engagement', {}).get('score', item.get('score', 0))
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of items, clustered into stories by :meth:`clusters`.
+
+    :meth:`add` does the per-item work as items arrive: weighing the title's words
+    and computing a ``bands * rows`` MinHash signature of them, plus one of the
+    title and summary together when the item has a summary. Items that share any
+    band land in the same bucket and become candidates. An item whose text changes
+    afterwards (a better-ranked duplicate taking over its dict) is re-signed with
+    :meth:`update`.
+
+    :meth:`clusters` then visits items from the most engaged down. Each item is
+    compared, by :func:`similarity`, with the representative (first member) of each
+    candidate's cluster and joins the most similar one at or above ``threshold``;
+    otherwise it starts a cluster of its own. Comparing with the representative,
+    rather than chaining pairwise matches, keeps "Gemini 2.0 Flash" and "Gemini 2.0
+    Pro" from merging through a post that mentions both, and visiting in engagement
+    order makes the clusters independent of arrival order. Titles and summaries are
+    compared separately and the better score counts, so a summary adds evidence
+    without diluting a match against a title-only post.
+
+    Items whose title words weigh less than ``min_weight`` (say two common words)
+    are never clustered. Only ``max_candidates`` bucket-mates are checked per band,
+    so clustering n items is O(n) rather than all-pairs O(n^2).
+    """
+
+    def __init__(self, threshold: float = 0.75, bands: int = 16, rows: int = 3,
+                 max_candidates: int = 32, min_weight: float = NAME_WEIGHT, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_candidates = max_candidates
+        self.min_weight = min_weight
+
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                             for _ in range(bands * rows)]
+
+        self.items: List[Dict[str, Any]] = []
+        self.positions: Dict[int, int] = {}  # id(item) -> position
+        self.features: List[Terms] = []
+        self.summary_features: List[Optional[Terms]] = []
+        self.keys: List[List[tuple]] = []  # Bucket keys of each item
+        self.buckets: Dict[tuple, List[int]] = {}
+
+    def signature(self, words) -> List[int]:
+        hashes = [zlib.crc32(word.encode()) for word in words]
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.permutations]
+
+    def _band_keys(self, kind: str, words: Terms) -> List[tuple]:
+        signature = self.signature(words)
+        return [(kind, band, *signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def _index(self, position: int):
+        item = self.items[position]
+        title, combined = features(item), summary_features(item)
+        self.features[position] = title
+        self.summary_features[position] = combined
+
+        keys = []
+        if sum(title.values()) >= self.min_weight:
+            keys = self._band_keys('title', title)
+            if combined:
+                keys += self._band_keys('summary', combined)
+        self.keys[position] = keys
+        for key in keys:
+            self.buckets.setdefault(key, []).append(position)
+
+    def add(self, item: Dict[str, Any]) -> int:
+        """Sign and index ``item``; return its position"""
+        position = len(self.items)
+        self.items.append(item)
+        self.positions[id(item)] = position
+        self.features.append({})
+        self.summary_features.append(None)
+        self.keys.append([])
+        self._index(position)
+        return position
+
+    def update(self, item: Dict[str, Any]):
+        """Re-sign an indexed ``item`` whose title or summary changed in place"""
+        position = self.positions.get(id(item))
+        if position is None:
+            return
+        for key in self.keys[position]:
+            self.buckets[key].remove(position)
+        self._index(position)
+
+    def _score(self, first: int, second: int) -> float:
+        score = similarity(self.features[first], self.features[second])
+        a, b = self.summary_features[first], self.summary_features[second]
+        if a and b:
+            score = max(score, similarity(a, b))
+        return score
+
+    def clusters(self) -> List[List[Dict[str, Any]]]:
+        """All clusters with more than one member, each sorted by engagement (best first)"""
+        order = sorted(range(len(self.items)),
+                       key=lambda position: (-engagement(self.items[position]),
+                                             self.items[position].get('title', ''),
+                                             self.items[position].get('url') or ''))
+        representative: Dict[int, int] = {}
+        for position in order:
+            best, best_similarity = position, self.threshold
+            checked = set()
+            for key in self.keys[position]:
+                for other in self.buckets[key][:self.max_candidates]:
+                    leader = representative.get(other)
+                    if leader is None or leader in checked:
+                        continue  # Not visited yet, or its cluster was already compared
+                    checked.add(leader)
+                    score = self._score(position, leader)
+                    if score >= best_similarity:
+                        best, best_similarity = leader, score
+            representative[position] = best
+
+        groups: Dict[int, List[Dict[str, Any]]] = {}
+        for position in order:
+            groups.setdefault(representative[position], []).append(self.items[position])
+        return [members for members in groups.values() if len(members) > 1]
+
+def collapse_near_duplicates(news_data: Dict[str, Any], threshold: float = 0.75,
+                             index: Optional[NearDuplicateIndex] = None) -> int:
+    """Replace each near-duplicate cluster in ``news_data`` with one representative.
+
+    The highest-engagement member is kept. It gains ``cluster_size`` and a compact
+    ``related`` list of the members it stands for; the rest are removed from their
+    source lists. Returns the number of items removed.
+    """
+    index = index or NearDuplicateIndex(threshold=threshold)
+    for key in news_lists(news_data):
+        for item in news_data.get(key, []):
+            index.add(item)
+    return fold_clusters(news_data, index)
+
+def fold_clusters(news_data: Dict[str, Any], index: NearDuplicateIndex) -> int:
+    """Collapse the clusters of an already filled ``index`` in ``news_data`` (see above)"""
+    dropped = set()
+    for members in index.clusters():
+        representative, others = members[0], members[1:]
+        representative['cluster_size'] = len(members)
+        representative['related'] = [
+            {'source': item['source'], 'title': item['title'], 'url': item.get('url'), 'score': item.get('score', 0)}
+            for item in others
+        ]
+        dropped.update(id(item) for item in others)
+
+    for key in news_lists(news_data):
+        news_data[key] = [item for item in news_data.get(key, []) if id(item) not in dropped]
+
+    return len(dropped)
+
+def describe_cluster(item: Dict[str, Any]) -> str:
+    """Short meta suffix for a cluster representative, e.g. " • 3 related posts" """
+    related = item.get('cluster_size', 1) - 1
+    return f" • {related} related post{'s' if related != 1 else ''}" if related > 0 else ''
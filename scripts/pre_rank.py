@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Relevance Pre-Ranking
+Local BM25 scoring of collected items against the focus topics and digest sections,
+so only the likeliest candidates are sent to Claude
+"""
+
+import time
+from typing import List, Dict, Any
+
+try:
+    import numpy as np
+except ImportError:  # Pre-ranking is skipped without NumPy
+    np = None
+
+from dedup import news_lists
+from near_dup import TOKEN_RE, STOPWORDS
+
+SUMMARY_CHARS = 300
+
+# Polynomial word hashes mod 2**64 (uint64 arithmetic wraps)
+HASH_BASE = 1_000_003
+
+if np is not None:
+    # Bytes that make up words: letters, digits and hyphens ("multi-agent")
+    WORD_BYTES = np.zeros(256, dtype=bool)
+    WORD_BYTES[list(b'abcdefghijklmnopqrstuvwxyz0123456789-')] = True
+
+def stem(word: str) -> str:
+    """Fold plurals together ("agents" -> "agent")"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+def query_terms(text: str) -> List[str]:
+    return [stem(word) for word in TOKEN_RE.findall(text.lower()) if word not in STOPWORDS]
+
+def item_text(item: Dict[str, Any]) -> str:
+    """Title and the start of the best available summary (about what Claude gets to see)"""
+    summary = (item.get('article_summary') or item.get('summary', ''))[:SUMMARY_CHARS]
+    return f"{item.get('title', '')} {summary}".lower().replace('\n', ' ')
+
+def word_hash(word: str) -> int:
+    """Polynomial hash of ``word``'s bytes, as :meth:`PreRanker.term_frequencies` computes it"""
+    return sum(byte * pow(HASH_BASE, position, 1 << 64) for position, byte in enumerate(word.encode())) % (1 << 64)
+
+class PreRanker:
+    """Keeps the ``top_k`` most relevant items for each digest section.
+
+    Each item's title and summary are scored with BM25 against two queries: the
+    focus topics, and the section's name and ``description``. The two are
+    normalized and averaged, then boosted by engagement (log of points plus
+    comments, scaled within each source, weighted by ``engagement_weight``), so
+    engagement lifts relevant items but can't rescue an unrelated one.
+
+    Only query terms are ever counted, so the term-frequency matrix is as narrow
+    as the queries' vocabulary, and BM25 for every item and query is a single
+    matrix product.
+    """
+
+    def __init__(self, focus_topics: List[str], sections: List[Dict[str, Any]], top_k: int = 40,
+                 engagement_weight: float = 0.5, k1: float = 1.2, b: float = 0.75):
+        self.sections = sections
+        self.top_k = top_k
+        self.engagement_weight = engagement_weight
+        self.k1 = k1
+        self.b = b
+
+        queries = [query_terms(' '.join(focus_topics))]
+        queries += [query_terms(f"{s['name']} {s.get('description', '')}") for s in sections]
+        self.vocabulary = sorted({term for query in queries for term in query})
+        self.term_ids = {term: index for index, term in enumerate(self.vocabulary)}
+        # Term counts per query: one column for the focus topics, then one per section
+        self.query_matrix = np.zeros((len(self.vocabulary), len(queries)))
+        for column, query in enumerate(queries):
+            for term in query:
+                self.query_matrix[self.term_ids[term], column] += 1
+
+        # Every spelling a term can take in the corpus (plurals fold into the stem),
+        # by hash, sorted for searchsorted, with the term id of each
+        spellings: Dict[str, int] = {}
+        for term, index in self.term_ids.items():
+            variants = [term, term + 's', term + 'es'] + ([term[:-1] + 'ies'] if term.endswith('y') else [])
+            for variant in variants:
+                spellings.setdefault(variant, index)
+        by_hash = sorted((word_hash(spelling), index) for spelling, index in spellings.items())
+        self.spelling_hashes = np.array([h for h, _ in by_hash], dtype=np.uint64)
+        self.spelling_terms = np.array([index for _, index in by_hash], dtype=np.int64)
+
+        # Cheap filter: only words whose length, first and last byte match a spelling's get hashed
+        encoded = [spelling.encode() for spelling in spellings]
+        self.max_length = max(len(spelling) for spelling in encoded)
+        self.shape_ok = np.zeros((self.max_length + 2, 256, 256), dtype=bool)
+        for spelling in encoded:
+            self.shape_ok[len(spelling), spelling[0], spelling[-1]] = True
+        self.powers = np.array([pow(HASH_BASE, position, 1 << 64) for position in range(self.max_length)],
+                               dtype=np.uint64)
+
+    def term_frequencies(self, texts: List[str]):
+        """Counts of each query term per text as a dense ``(texts, terms)`` matrix, plus text lengths in words.
+
+        The texts are joined into one byte array and its words are found with
+        array ops. Only words with a query spelling's length and first and last
+        letters are hashed, by gathering their bytes into a ``(words, max_length)``
+        block, and the hits become (text, term) pairs counted with one
+        ``np.bincount``. No Python code runs per word.
+        """
+        data = np.frombuffer('\n'.join(texts).encode(), dtype=np.uint8)
+        is_word = np.concatenate(([False], WORD_BYTES[data], [False]))
+        edges = np.diff(is_word.view(np.int8))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        newlines = np.flatnonzero(data == ord('\n'))
+        boundaries = np.concatenate(([0], newlines, [len(data)]))
+        lengths = np.diff(np.searchsorted(starts, boundaries)).astype(float)
+
+        word_lengths = np.minimum(ends - starts, self.max_length + 1)
+        candidates = self.shape_ok[word_lengths, data[starts], data[ends - 1]]
+        starts, word_lengths = starts[candidates], word_lengths[candidates]
+        offsets = np.arange(self.max_length)
+        block = data[np.minimum(starts[:, None] + offsets, len(data) - 1)].astype(np.uint64)
+        block[offsets >= word_lengths[:, None]] = 0
+        with np.errstate(over='ignore'):
+            hashes = (block * self.powers).sum(axis=1, dtype=np.uint64)
+
+        slots = np.minimum(np.searchsorted(self.spelling_hashes, hashes), len(self.spelling_hashes) - 1)
+        hit = self.spelling_hashes[slots] == hashes
+        rows = np.searchsorted(newlines, starts[hit])
+        size = len(texts) * len(self.vocabulary)
+        tf = np.bincount(rows * len(self.vocabulary) + self.spelling_terms[slots[hit]], minlength=size)
+        return tf.reshape(len(texts), len(self.vocabulary)), lengths
+
+    def scores(self, items: List[Dict[str, Any]]):
+        """Relevance of every item to every section, shape ``(items, sections)``"""
+        texts = [item_text(item) for item in items]
+        tf, lengths = self.term_frequencies(texts)
+
+        n = len(items)
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1))
+        bm25 = idf * tf * (self.k1 + 1) / (tf + norm[:, None])
+
+        relevance = bm25 @ self.query_matrix
+        relevance /= np.maximum(relevance.max(axis=0), 1e-9)
+        return (relevance[:, :1] + relevance[:, 1:]) / 2
+
+    def engagement(self, items: List[Dict[str, Any]]):
+        """Points plus comments on a log scale, 0-1 within each source.
+
+        Items from a source without engagement numbers (arXiv) get a neutral 0.5,
+        so they compete on relevance alone against an average HN or Reddit post.
+        """
+        raw = np.log1p([max(0, item.get('score', 0) or 0) + max(0, item.get('comments', 0) or 0)
+                        for item in items])
+        sources = np.array([item.get('source', '') for item in items])
+        scaled = np.full(len(items), 0.5)
+        for source in set(sources):
+            mask = sources == source
+            peak = raw[mask].max()
+            if peak > 0:
+                scaled[mask] = raw[mask] / peak
+        return scaled
+
+    def rank(self, news_data: Dict[str, Any]) -> Dict[str, Any]:
+        """``news_data`` with each list cut to the items among some section's top ``top_k``"""
+        keys = news_lists(news_data)
+        items = [item for key in keys for item in news_data[key]]
+        if len(items) <= self.top_k:
+            return news_data
+
+        started = time.perf_counter()
+        relevance = self.scores(items) * (1 + self.engagement_weight * self.engagement(items))[:, None]
+        keep = np.zeros(len(items), dtype=bool)
+        k = min(self.top_k, len(items))
+        for column in relevance.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            keep[top[column[top] > 0]] = True
+        elapsed = (time.perf_counter() - started) * 1000
+
+        ranked = dict(news_data)
+        position = 0
+        for key in keys:
+            count = len(news_data[key])
+            ranked[key] = [item for item, kept in zip(news_data[key], keep[position:position + count]) if kept]
+            position += count
+        print(f"🎯 Pre-ranked {len(items)} items in {elapsed:.0f} ms: "
+              f"{int(keep.sum())} candidates for {len(self.sections)} sections go to Claude\n")
+        return ranked
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting
+Async token bucket that follows the budget advertised in X-Ratelimit-* response headers
+"""
+
+import asyncio
+import time
+from typing import Mapping
+
+class TokenBucket:
+    """Hands out one token per request, refilling continuously at ``rate`` tokens/second.
+
+    The starting capacity and rate are only a guess. Once responses arrive,
+    :meth:`update_from_headers` replaces them with the server's own numbers: the
+    remaining requests are spread evenly over the time left until the window resets.
+    A 429 drains the bucket until its ``Retry-After`` has passed.
+    """
+
+    def __init__(self, capacity: float = 10, per_seconds: float = 60):
+        self.capacity = capacity
+        self.tokens = capacity
+        self.rate = capacity / per_seconds
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adopt the server's view of the remaining budget (Reddit-style headers)"""
+        try:
+            remaining = float(headers['X-Ratelimit-Remaining'])
+            reset = max(float(headers['X-Ratelimit-Reset']), 1.0)
+        except (KeyError, TypeError, ValueError):
+            return
+
+        self._refill()
+        # Requests already in flight were counted before the server saw them, so
+        # never trust a higher remaining count than the bucket already holds
+        self.tokens = min(self.tokens, remaining)
+        self.capacity = max(remaining, 1.0)
+        self.rate = max(remaining, 1.0) / reset
+
+    def pause(self, seconds: float):
+        """Hold off all requests for ``seconds`` (e.g. after a 429)"""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Raw News Store
+Append-only JSONL files of collected items with a sidecar index of byte ranges
+"""
+
+import json
+import mmap
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Iterable
+
+from data_archive import DataArchive
+from dedup import canonicalize_url
+
+# Item 'source' field -> key in the news dict the curator works with
+SOURCE_KEYS = {'arxiv': 'papers', 'hackernews': 'hackernews', 'reddit': 'reddit'}
+
+# Fields holding an item's own publication time, per source
+TIME_FIELDS = ('published', 'time', 'created')
+
+class RawNewsStore:
+    """One ``raw_news_YYYYMMDD.jsonl`` file per collection day under ``data/raw/``.
+
+    Collectors append each source's batch as soon as it arrives; a batch is a
+    contiguous byte range and ``raw_news_YYYYMMDD.idx.json`` records the source,
+    offsets, item count and write time of every range plus the run's metadata.
+    Readers use the index to memory-map just the ranges they need and decode one
+    line at a time, so memory use does not grow with the number of stored items.
+
+    Files are never rewritten. When the same item is appended more than once
+    (a rerun, or a later score update), readers keep the most recent record.
+    Days that have been compacted into ``data/archive/`` are read from their bundle.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.store_dir = Path(data_dir) / "raw"
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.archive = DataArchive(data_dir)
+
+    def _data_path(self, date: str) -> Path:
+        return self.store_dir / f"raw_news_{date}.jsonl"
+
+    def _index_path(self, date: str) -> Path:
+        return self.store_dir / f"raw_news_{date}.idx.json"
+
+    def load_index(self, date: str) -> Dict[str, Any]:
+        name = f"raw/{self._index_path(date).name}"
+        if not self.archive.exists(name):
+            return {'meta': {}, 'ranges': []}
+        return self.archive.read_json(name)
+
+    def _save_index(self, date: str, index: Dict[str, Any]):
+        _write_json(self._index_path(date), index)
+
+    def append(self, date: str, source: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Append one source's batch as a new indexed range"""
+        with open(self._data_path(date), 'ab') as f:
+            # Start from the real end of file so a crash between data and index
+            # writes leaves an unindexed tail rather than a corrupt range
+            f.seek(0, 2)
+            start = f.tell()
+            for item in items:
+                f.write(json.dumps(item).encode() + b'\n')
+            end = f.tell()
+
+        entry = {'source': source, 'start': start, 'end': end, 'count': len(items),
+                 'written_at': datetime.now().isoformat()}
+        index = self.load_index(date)
+        index['ranges'].append(entry)
+        self._save_index(date, index)
+        return entry
+
+    def set_meta(self, date: str, **meta):
+        """Record run metadata (collection time, week window) in the day's index"""
+        index = self.load_index(date)
+        index['meta'].update(meta)
+        self._save_index(date, index)
+
+    def dates(self) -> List[str]:
+        """Days with stored data, oldest first"""
+        return [name[len("raw/raw_news_"):-len(".idx.json")]
+                for name in self.archive.glob("raw/raw_news_*.idx.json")]
+
+    def window_dates(self, days: int = 7, end: Optional[str] = None) -> List[str]:
+        """Stored days from ``days`` before ``end`` (default: the latest day) through ``end``.
+
+        The first day is included because a week measured from mid-day starts partway
+        through it; :meth:`load_news` trims by post time.
+        """
+        dates = self.dates()
+        end = end or (dates[-1] if dates else None)
+        if not end:
+            return []
+        first = (datetime.strptime(end, '%Y%m%d') - timedelta(days=days)).strftime('%Y%m%d')
+        return [date for date in dates if first <= date <= end]
+
+    def load_cursors(self) -> Dict[str, Any]:
+        """Per-source incremental collection cursors (see ``AINewsCollector``)"""
+        cursor_path = self.store_dir / "cursors.json"
+        if not cursor_path.exists():
+            return {}
+        with open(cursor_path) as f:
+            return json.load(f)
+
+    def save_cursors(self, cursors: Dict[str, Any]):
+        _write_json(self.store_dir / "cursors.json", cursors)
+
+    def iter_records(self, date: str, sources: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield every stored record for ``date`` in write order, optionally for some sources only"""
+        data_path = self._data_path(date)
+        wanted = set(sources) if sources else None
+        ranges = [r for r in self.load_index(date)['ranges'] if wanted is None or r['source'] in wanted]
+
+        if data_path.exists():
+            if data_path.stat().st_size == 0:
+                return
+            with open(data_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from _iter_ranges(mm, ranges)
+        elif self.archive.exists(f"raw/{data_path.name}"):
+            yield from _iter_ranges(self.archive.read(f"raw/{data_path.name}"), ranges)
+
+    def iter_items(self, dates: Iterable[str], sources: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the latest record of each distinct item across ``dates``.
+
+        Only the item keys are held in memory while reading; records are decoded
+        twice (once to find each key's last position, once to yield) rather than
+        buffered.
+        """
+        dates = list(dates)
+        last_seen = {}
+        for date in dates:
+            for position, record in enumerate(self.iter_records(date, sources)):
+                last_seen[item_key(record)] = (date, position)
+
+        for date in dates:
+            for position, record in enumerate(self.iter_records(date, sources)):
+                if last_seen.get(item_key(record)) == (date, position):
+                    yield record
+
+    def load_news(self, dates: Iterable[str], since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Assemble the papers/hackernews/reddit dict the curator expects.
+
+        With ``since``, items published before it are left out, so a window built
+        from several collection days still covers exactly one week of news.
+        """
+        dates = list(dates)
+        news = {key: [] for key in SOURCE_KEYS.values()}
+        for item in self.iter_items(dates):
+            published = item_time(item)
+            if since and published and published < since:
+                continue
+            news.setdefault(SOURCE_KEYS.get(item['source'], item['source']), []).append(item)
+
+        if dates:
+            news.update(self.load_index(dates[-1])['meta'])
+        return news
+
+def item_key(item: Dict[str, Any]) -> str:
+    """Stable identity of an item across runs: its source plus canonical URL"""
+    return f"{item['source']}:{canonicalize_url(item.get('url', '')) or item.get('title', '')}"
+
+def _iter_ranges(buffer, ranges: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Decode the JSON lines in each indexed byte range of ``buffer`` (an mmap or bytes)"""
+    for entry in ranges:
+        position = entry['start']
+        while position < entry['end']:
+            newline = buffer.find(b'\n', position, entry['end'])
+            if newline == -1:
+                break
+            yield json.loads(buffer[position:newline])
+            position = newline + 1
+
+def item_time(item: Dict[str, Any]) -> Optional[datetime]:
+    """When the item itself was posted, if the source records it"""
+    for field in TIME_FIELDS:
+        if item.get(field):
+            return datetime.fromisoformat(item[field])
+    return None
+
+def _write_json(path: Path, data: Any):
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    tmp_path.replace(path)
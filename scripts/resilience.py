@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Resilience
+Per-host latency tracking, jittered retry backoff and circuit breakers for upstream fetches
+"""
+
+import random
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import requests
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive failures.
+
+    Once open, requests are refused for ``reset_after`` seconds. Then a single trial
+    request is let through (half-open). Its success closes the circuit again; a
+    failure reopens it for another ``reset_after``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.reset_after else 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half-open' and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.trial_in_flight:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+class HostStats:
+    """Rolling latency window and outcome counters for one host"""
+
+    def __init__(self, window: int = 500):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._p95 = None
+        self._p95_observed = 0
+        self._observed = 0
+
+    def observe(self, seconds: float):
+        self.latencies.append(seconds)
+        self._observed += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency, re-sorted only every 25 observations"""
+        if self._p95 is None or self._observed - self._p95_observed >= 25:
+            self._p95 = self.percentile(0.95)
+            self._p95_observed = self._observed
+        return self._p95
+
+    def summary(self) -> str:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        latency = f"p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms" if p50 is not None else "no responses"
+        return (f"{self.requests} requests, {latency}, {self.errors} errors, "
+                f"{self.retries} retries, {self.hedges} hedged ({self.hedge_wins} won)")
+
+class Resilience:
+    """Retry, hedging and circuit-breaker policy shared by every pool in a run.
+
+    ``retries`` failed attempts (connection errors, timeouts, 5xx) are retried
+    after a full-jitter exponential backoff: a random delay up to
+    ``backoff_base * 2**attempt``, capped at ``backoff_max``. Once a host has
+    ``hedge_min_samples`` latencies on record, a request still running after that
+    host's p95 gets one duplicate, and whichever answers first wins. At most
+    ``hedge_budget`` of a host's requests are hedged, so a host that is slow across
+    the board doesn't get its load doubled. Each host has its own
+    :class:`CircuitBreaker` and :class:`HostStats`.
+    """
+
+    def __init__(self, retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8,
+                 hedge: bool = True, hedge_min_samples: int = 20, hedge_budget: float = 0.1,
+                 breaker_failures: int = 5, breaker_reset_seconds: float = 30):
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_budget = hedge_budget
+        self.breaker_failures = breaker_failures
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.hosts: Dict[str, HostStats] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def stats(self, host: str) -> HostStats:
+        return self.hosts.setdefault(host, HostStats())
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(self.breaker_failures, self.breaker_reset_seconds)
+        return self.breakers[host]
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Seconds to wait before hedging a request to ``host``, or None if it shouldn't be hedged"""
+        stats = self.stats(host)
+        if not self.hedge or len(stats.latencies) < self.hedge_min_samples:
+            return None
+        if stats.hedges >= self.hedge_budget * stats.requests:
+            return None
+        return stats.p95()
+
+    def summary(self) -> Dict[str, str]:
+        summaries = {host: stats.summary() for host, stats in sorted(self.hosts.items())}
+        for host, breaker in self.breakers.items():
+            if breaker.times_opened:
+                summaries[host] += f", circuit opened {breaker.times_opened}x"
+        return summaries
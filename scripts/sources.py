@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+News Sources
+Source plugins, the registry that builds them from config.yaml ``sources:``, and
+a merged stream of their results
+"""
+
+import abc
+import asyncio
+import calendar
+import html
+import re
+from datetime import datetime
+from typing import List, Dict, Any, AsyncIterator, Callable, Tuple, Type, Union
+
+import feedparser
+
+from http_pool import AsyncHTTPPool
+from rate_limit import TokenBucket
+
+# Source type name -> plugin class, filled in by @register_source
+SOURCE_TYPES: Dict[str, Type['SourcePlugin']] = {}
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+def register_source(type_name: str):
+    """Class decorator adding a plugin to the registry under ``type_name``"""
+    def register(cls):
+        cls.type_name = type_name
+        SOURCE_TYPES[type_name] = cls
+        return cls
+    return register
+
+class SourcePlugin(abc.ABC):
+    """One configured news source.
+
+    A plugin is built from its ``sources:`` entry in config.yaml. The entry's key is
+    the plugin's ``name``, which is also the ``source`` field of every item it
+    returns. ``type`` picks the plugin class and defaults to the key, so the built-in
+    ``arxiv``/``hackernews``/``reddit`` entries need no ``type``.
+
+    The class attributes are the plugin's defaults for its HTTP pool; each can be
+    overridden in the entry: ``max_concurrency``, ``timeout``, ``request_delay``
+    (seconds between request starts) and ``requests_per_minute`` (token bucket).
+
+    :meth:`collect` is an async generator of item batches. A plugin with several
+    feeds or pages can yield each as soon as it is ready.
+    """
+
+    type_name = ''
+    label = ''
+    emoji = '📰'
+    max_concurrency = 8
+    timeout = 10
+    request_delay = 0
+    requests_per_minute = 0
+
+    def __init__(self, name: str, config: Dict[str, Any], collector):
+        self.name = name
+        self.config = config
+        self.collector = collector
+        self.label = config.get('label', self.label or name)
+
+    def pool_options(self) -> Dict[str, Any]:
+        """Keyword arguments for this plugin's AsyncHTTPPool"""
+        requests_per_minute = self.config.get('requests_per_minute', self.requests_per_minute)
+        return {
+            'max_concurrency': self.config.get('max_concurrency', self.max_concurrency),
+            'timeout': self.config.get('timeout', self.timeout),
+            'min_interval': self.config.get('request_delay', self.request_delay),
+            'rate_limiter': TokenBucket(requests_per_minute, per_seconds=60) if requests_per_minute else None
+        }
+
+    @abc.abstractmethod
+    def collect(self, pool: AsyncHTTPPool) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield batches of items; overrides are ``async def`` generators"""
+
+@register_source('arxiv')
+class ArxivSource(SourcePlugin):
+    label = 'arXiv'
+    emoji = '📚'
+    max_concurrency = 1
+    timeout = 60
+    request_delay = 3  # arXiv asks for 3 seconds between API calls
+
+    async def collect(self, pool):
+        yield await self.collector.collect_arxiv(pool)
+
+@register_source('hackernews')
+class HackerNewsSource(SourcePlugin):
+    label = 'Hacker News'
+    emoji = '🔥'
+    max_concurrency = 20
+    timeout = 5
+
+    def pool_options(self):
+        options = super().pool_options()
+        if self.config.get('mode', 'top') == 'week':
+            options['max_concurrency'] = self.config.get('scan_concurrency', 64)
+        return options
+
+    async def collect(self, pool):
+        yield await self.collector.collect_hackernews(pool)
+
+@register_source('reddit')
+class RedditSource(SourcePlugin):
+    label = 'Reddit'
+    emoji = '💬'
+    max_concurrency = 8
+    requests_per_minute = 10  # Starting budget; Reddit's X-Ratelimit-* headers take over
+
+    async def collect(self, pool):
+        yield await self.collector.collect_reddit(pool)
+
+def parse_feed(content: bytes) -> Dict[str, Any]:
+    """Reduce an RSS or Atom document to its title and JSON-serializable entries"""
+    parsed = feedparser.parse(content)
+    entries = []
+    for entry in parsed.entries:
+        posted = entry.get('published_parsed') or entry.get('updated_parsed')
+        if not posted or not entry.get('link'):
+            continue
+        summary = html.unescape(TAG_RE.sub(' ', entry.get('summary', '')))
+        entries.append({
+            'title': ' '.join(entry.get('title', '').split()),
+            'url': entry['link'],
+            'summary': ' '.join(summary.split())[:300],
+            # feedparser normalizes dates to UTC; items elsewhere use local time
+            'published': datetime.fromtimestamp(calendar.timegm(posted)).isoformat()
+        })
+    return {'title': parsed.feed.get('title', ''), 'entries': entries}
+
+@register_source('rss')
+class FeedSource(SourcePlugin):
+    """Any number of RSS/Atom feeds: blogs, company news, GitHub trending and so on.
+
+    Entry options: ``feeds`` (URLs), ``max_items`` per feed (0 = all) and
+    ``keywords_only`` to keep just the entries that mention a tracked keyword.
+    Each feed's batch is yielded as soon as it is fetched.
+    """
+
+    max_concurrency = 4
+
+    async def _collect_feed(self, pool: AsyncHTTPPool, url: str) -> List[Dict[str, Any]]:
+        since = self.collector._since(self.name)
+        matcher = self.collector.keyword_matcher
+        max_items = self.config.get('max_items', 10)
+        feed = await pool.get_parsed(url, parse_feed)
+
+        items = []
+        for entry in feed['entries']:
+            if datetime.fromisoformat(entry['published']) < since:
+                continue
+            keywords = matcher.matches(f"{entry['title']} {entry['summary']}")
+            if self.config.get('keywords_only') and not keywords:
+                continue
+            items.append(dict(entry, source=self.name, feed=feed['title'] or self.label,
+                              matched_keywords=keywords))
+            if max_items and len(items) >= max_items:
+                break
+        return items
+
+    async def collect(self, pool):
+        print(f"{self.emoji} Collecting from {self.label}...")
+        feeds = self.config.get('feeds', [])
+        tasks = [asyncio.ensure_future(self._collect_feed(pool, url)) for url in feeds]
+        total = 0
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    items = await task
+                except Exception as e:
+                    print(f"  Error collecting {self.label} feed: {e}")
+                    continue
+                total += len(items)
+                yield items
+        finally:
+            for task in tasks:
+                task.cancel()
+        print(f"  Found {total} recent {self.label} posts across {len(feeds)} feeds")
+
+def build_sources(sources_config: Dict[str, Dict[str, Any]], collector) -> List[SourcePlugin]:
+    """Instantiate a plugin for every enabled ``sources:`` entry, in config order"""
+    plugins = []
+    for name, config in sources_config.items():
+        if not config.get('enabled', True):
+            continue
+        type_name = config.get('type', name)
+        if type_name not in SOURCE_TYPES:
+            raise ValueError(f"Unknown type '{type_name}' for source '{name}' "
+                             f"(available: {', '.join(sorted(SOURCE_TYPES))})")
+        plugins.append(SOURCE_TYPES[type_name](name, config, collector))
+    return plugins
+
+async def stream_batches(plugins: List[SourcePlugin],
+                         make_pool: Callable[[SourcePlugin], AsyncHTTPPool]
+                         ) -> AsyncIterator[Tuple[SourcePlugin, Union[List[Dict[str, Any]], Exception]]]:
+    """Run every plugin concurrently and yield ``(plugin, batch)`` in arrival order.
+
+    A plugin that raises yields ``(plugin, exception)`` once and stops; the others
+    carry on. Each plugin's pool is closed when the plugin finishes.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def run(plugin: SourcePlugin):
+        pool = make_pool(plugin)
+        try:
+            async for batch in plugin.collect(pool):
+                await queue.put((plugin, batch))
+        except Exception as e:
+            await queue.put((plugin, e))
+        finally:
+            pool.close()
+            await queue.put((plugin, done))
+
+    tasks = [asyncio.ensure_future(run(plugin)) for plugin in plugins]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            plugin, batch = await queue.get()
+            if batch is done:
+                remaining -= 1
+            else:
+                yield plugin, batch
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -11,6 +11,8 @@ import json
 import os
 import base64
 
+from digest_repo import DigestRepository
+
 class YouTubeUploader:
     def __init__(self):
         self.base_dir = Path(__file__).parent.parent
@@ -21,6 +23,15 @@ class YouTubeUploader:
 
     def get_latest_video(self):
         """Find most recent video file"""
+        repo = DigestRepository(self.base_dir / "data")
+        try:
+            video_path = repo.latest_artifact('video')
+        finally:
+            repo.close()
+        if video_path:
+            return video_path
+
+        # Videos generated before the repository tracked artifacts
         video_files = sorted(self.video_dir.glob("ai_weekly_*.mp4"), reverse=True)
 
         if not video_files:
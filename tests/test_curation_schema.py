@@ -0,0 +1,86 @@
+import pytest
+
+from curation_schema import (ITEM_SCHEMA, compile_schema, digest_schema, format_errors, invalid_parts,
+                             picks_tool, scores_tool, section_tool)
+
+SECTIONS = [{'name': 'Key Research Papers', 'max_items': 2}, {'name': 'Industry Updates', 'max_items': 1}]
+NAMES = [s['name'] for s in SECTIONS]
+
+def item(**overrides):
+    return dict({'title': 'T', 'url': 'https://a', 'meta': 'HN', 'insight': 'Why it matters', 'score': 8}, **overrides)
+
+def digest(**sections):
+    return {'sections': dict({name: [] for name in NAMES}, **sections), 'weekly_summary': 'Agents.'}
+
+validate_digest = compile_schema(digest_schema(SECTIONS))
+
+def test_valid_digest_has_no_errors():
+    assert validate_digest(digest(**{'Key Research Papers': [item(), item(score=1)],
+                                     'Industry Updates': [item(score=10)]})) == []
+
+@pytest.mark.parametrize('value, expected', [
+    ('not a digest', [((), 'expected object')]),
+    ({'sections': {}}, [(('weekly_summary',), 'is required'),
+                        (('sections', 'Key Research Papers'), 'is required'),
+                        (('sections', 'Industry Updates'), 'is required')]),
+    (digest(**{'Industry Updates': [item(), item()]}), [(('sections', 'Industry Updates'), 'more than 1 items')]),
+    (dict(digest(), weekly_summary='  '), [(('weekly_summary',), 'is empty')]),
+])
+def test_digest_errors(value, expected):
+    assert validate_digest(value) == expected
+
+@pytest.mark.parametrize('overrides, expected', [
+    ({'score': 11}, [(('score',), 'maximum is 10')]),
+    ({'score': 0}, [(('score',), 'minimum is 1')]),
+    ({'score': 7.5}, [(('score',), 'expected integer')]),
+    ({'score': True}, [(('score',), 'expected integer')]),
+    ({'title': ''}, [(('title',), 'is empty')]),
+    ({'url': None}, [(('url',), 'expected string')]),
+])
+def test_item_errors(overrides, expected):
+    assert compile_schema(ITEM_SCHEMA)(item(**overrides)) == expected
+
+def test_missing_item_field_is_reported_at_its_path():
+    broken = item()
+    del broken['insight']
+    errors = validate_digest(digest(**{'Key Research Papers': [item(), broken]}))
+    assert errors == [(('sections', 'Key Research Papers', 1, 'insight'), 'is required')]
+
+def test_wrong_type_stops_further_checks():
+    assert compile_schema({'type': 'array', 'maxItems': 1})('abc') == [((), 'expected array')]
+
+def test_section_tool_validates_its_items():
+    tool = section_tool(1)
+    validate = compile_schema(tool['input_schema'])
+    assert validate({'items': [item()]}) == []
+    assert validate({'items': [item(), item()]}) == [(('items',), 'more than 1 items')]
+
+def test_scores_tool_restricts_sections():
+    validate = compile_schema(scores_tool(NAMES)['input_schema'])
+    entry = {'id': 3, 'section': 'Industry Updates', 'insight': 'x', 'score': 5}
+    assert validate({'items': [entry]}) == []
+    assert validate({'items': [dict(entry, section='Elsewhere', id=-1)]}) == [
+        (('items', 0, 'id'), 'minimum is 0'),
+        (('items', 0, 'section'), f"not one of {NAMES}")
+    ]
+
+def test_picks_tool_requires_every_section_and_int_ids():
+    validate = compile_schema(picks_tool(SECTIONS)['input_schema'])
+    assert validate({'sections': {'Key Research Papers': [0, 4], 'Industry Updates': []},
+                     'weekly_summary': 'Agents.'}) == []
+    assert validate({'sections': {'Key Research Papers': ['0']}, 'weekly_summary': 'Agents.'}) == [
+        (('sections', 'Industry Updates'), 'is required'),
+        (('sections', 'Key Research Papers', 0), 'expected integer')
+    ]
+
+def test_invalid_parts():
+    assert invalid_parts([], NAMES) == (set(), False)
+    assert invalid_parts([(('sections', 'Industry Updates', 0, 'score'), 'maximum is 10'),
+                          (('weekly_summary',), 'is empty')], NAMES) == ({'Industry Updates'}, True)
+    assert invalid_parts([(('sections',), 'expected object')], NAMES) == (set(NAMES), False)
+    assert invalid_parts([((), 'expected object')], NAMES) == (set(NAMES), True)
+
+def test_format_errors_truncates():
+    errors = [(('sections', 'a', i), 'expected object') for i in range(5)] + [((), 'no response')]
+    assert format_errors(errors[-1:]) == '(root) no response'
+    assert format_errors(errors, limit=2) == 'sections.a.0 expected object; sections.a.1 expected object (+4 more)'
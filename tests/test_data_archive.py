@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from data_archive import DataArchive, compact_databases
+from digest_repo import DigestRepository
+from raw_store import RawNewsStore
+
+NOW = datetime(2026, 10, 17)
+
+def write_json(path, value):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(value))
+
+def test_compacted_files_read_back_unchanged(tmp_path):
+    old = {'sections': {'Industry Updates': [{'title': 'Old news'}]}, 'weekly_summary': 'August.'}
+    write_json(tmp_path / "curated_20260801.json", old)
+    write_json(tmp_path / "curated_20260815.json", dict(old, weekly_summary='Mid August.'))
+    write_json(tmp_path / "curated_20261015.json", dict(old, weekly_summary='This week.'))
+    store = RawNewsStore(tmp_path)
+    store.append('20260901', 'hackernews', [{'source': 'hackernews', 'title': 'Story', 'url': 'https://a'}])
+
+    archive = DataArchive(tmp_path)
+    stats = archive.compact(keep_weeks=4, now=NOW)
+
+    assert stats['files'] == 4  # Two curated files plus the raw day's data and index
+    assert sorted(path.name for path in (tmp_path / "archive").iterdir()) == [
+        '2026-08.gz', '2026-08.idx.json', '2026-09.gz', '2026-09.idx.json']
+    assert not (tmp_path / "curated_20260801.json").exists()
+    assert (tmp_path / "curated_20261015.json").exists()
+
+    # Live and archived files look the same through the archive
+    assert archive.glob("curated_*.json") == [
+        "curated_20260801.json", "curated_20260815.json", "curated_20261015.json"]
+    assert archive.read_json("curated_20260801.json") == old
+    assert archive.read_json("curated_20260815.json")['weekly_summary'] == 'Mid August.'
+    assert [item['title'] for item in RawNewsStore(tmp_path).iter_records('20260901')] == ['Story']
+
+def test_compacting_again_appends_to_the_bundle(tmp_path):
+    write_json(tmp_path / "curated_20260801.json", {'n': 1})
+    DataArchive(tmp_path).compact(keep_weeks=4, now=NOW)
+    write_json(tmp_path / "curated_20260808.json", {'n': 2})
+    archive = DataArchive(tmp_path)
+    assert archive.compact(keep_weeks=4, now=NOW)['files'] == 1
+    assert [archive.read_json(name)['n'] for name in archive.glob("curated_*.json")] == [1, 2]
+    assert archive.compact(keep_weeks=4, now=NOW)['files'] == 0
+
+def test_missing_files_raise(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DataArchive(tmp_path).read("curated_20200101.json")
+
+def test_compact_databases_prunes_old_copies(tmp_path):
+    digest = {'sections': {'Industry Updates': [{'title': 'Old news', 'url': 'https://a'}]}, 'weekly_summary': 'August.'}
+    write_json(tmp_path / "curated_20260801.json", digest)
+    repo = DigestRepository(tmp_path)  # Imports the curated file
+    run_id = repo.start_collection(datetime(2026, 8, 1), datetime(2026, 7, 25))
+    repo.add_raw_items(run_id, [
+        {'source': 'hackernews', 'title': 'Old', 'url': 'https://old', 'time': '2026-08-01T00:00:00'},
+        {'source': 'hackernews', 'title': 'New', 'url': 'https://new', 'time': '2026-10-16T00:00:00'}])
+    repo.close()
+
+    compact_databases(tmp_path, {}, keep_weeks=4, now=NOW)
+
+    repo = DigestRepository(tmp_path)
+    try:
+        assert [item['title'] for item in repo.raw_items_since(datetime(2000, 1, 1))] == ['New']
+        assert repo.conn.execute("SELECT data FROM runs WHERE stage = 'curate'").fetchone()['data'] is None
+        # The digest itself is still there, read back from its file
+        assert repo.latest_digest() == digest
+    finally:
+        repo.close()
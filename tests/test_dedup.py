@@ -0,0 +1,58 @@
+import pytest
+
+from dedup import DedupIndex, canonicalize_url, dedupe_news, describe_sightings
+
+@pytest.mark.parametrize('url, expected', [
+    ("http://www.example.com/post/", "https://example.com/post"),
+    ("https://Example.COM:443/a//b/index.html", "https://example.com/a/b"),
+    ("https://example.com:8080/a", "https://example.com:8080/a"),
+    ("example.com/a#comments", "https://example.com/a"),
+    ("https://example.com/a?utm_source=x&b=2&a=1&fbclid=y&ref=hn", "https://example.com/a?a=1&b=2"),
+    ("https://arxiv.org/pdf/2401.12345v2.pdf", "https://arxiv.org/abs/2401.12345"),
+    ("http://export.arxiv.org/abs/2401.12345v3", "https://arxiv.org/abs/2401.12345"),
+    ("https://arxiv.org/html/2401.12345", "https://arxiv.org/abs/2401.12345"),
+    ("https://old.reddit.com/r/LocalLLaMA/comments/abc/", "https://reddit.com/r/LocalLLaMA/comments/abc"),
+    ("https://x.com/user/status/1", "https://twitter.com/user/status/1"),
+    ("https://youtu.be/dQw4w9WgXcQ", "https://youtube.com/watch?v=dQw4w9WgXcQ"),
+    ("https://example.com", "https://example.com/"),
+    ("  ", ""),
+    (None, ""),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+def item(source, url, score=1, comments=0, **fields):
+    return dict({'source': source, 'title': url, 'url': url, 'score': score, 'comments': comments}, **fields)
+
+def test_duplicates_merge_into_the_best_ranked_source():
+    reddit = item('reddit', 'https://reddit.com/r/ml/1', score=50, comments=5, subreddit='ml',
+                  link='https://www.example.com/post?utm_source=reddit', matched_keywords=['agents'])
+    hn = item('hackernews', 'https://example.com/post/', score=300, comments=40, matched_keywords=['LLM'])
+    index = DedupIndex()
+    assert index.add(reddit) is reddit
+    assert index.add(hn) is None
+    assert index.merged == 1
+
+    # Hacker News took over the Reddit item's dict, so lists holding it stay valid
+    assert reddit['source'] == 'hackernews'
+    assert reddit['url'] == 'https://example.com/post/'
+    assert reddit['engagement'] == {'score': 350, 'comments': 45, 'sources': ['hackernews', 'reddit']}
+    assert reddit['matched_keywords'] == ['LLM', 'agents']
+    assert describe_sightings(reddit) == " • also on r/ml (50)"
+
+def test_worse_ranked_duplicates_fold_into_the_primary():
+    paper = item('arxiv', 'https://arxiv.org/abs/2401.12345')
+    news = {'papers': [paper],
+            'hackernews': [item('hackernews', 'https://arxiv.org/pdf/2401.12345v2', score=80)],
+            'blogs': [item('blogs', 'https://example.com/unrelated')]}
+    index = dedupe_news(news)
+    assert index.merged == 1
+    assert news['hackernews'] == []
+    assert [sighting['source'] for sighting in paper['also_seen_on']] == ['hackernews']
+    assert len(news['blogs']) == 1
+
+def test_items_without_a_url_are_never_merged():
+    index = DedupIndex()
+    first, second = item('blogs', ''), item('blogs', '')
+    assert index.add(first) is first and index.add(second) is second
+    assert index.merged == 0
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from json_stream import IncrementalJSONParser, JSONStreamError
+
+DIGEST = {
+    "sections": {
+        "Key Research Papers": [{"title": "P1", "url": "https://a", "score": 9}],
+        "Industry Updates": [{"title": "I1", "url": "https://b", "score": 7},
+                             {"title": "I \"2\"", "url": "https://c", "score": 6.5}]
+    },
+    "weekly_summary": "Agents, mostly.",
+    "flags": [True, False, None, -1.5e3]
+}
+
+def section_item(path):
+    return len(path) == 3 and path[0] == 'sections'
+
+def feed_in_chunks(parser, text, size):
+    for start in range(0, len(text), size):
+        parser.feed(text[start:start + size])
+
+@pytest.mark.parametrize('size', [1, 7, 10_000])
+def test_parses_any_chunking(size):
+    parser = IncrementalJSONParser()
+    feed_in_chunks(parser, json.dumps(DIGEST, indent=2), size)
+    assert parser.close() == DIGEST
+
+def test_reports_watched_values_as_they_complete():
+    seen = []
+    parser = IncrementalJSONParser(watch=section_item, on_value=lambda path, value: seen.append((path, value)))
+    text = json.dumps(DIGEST)
+    first_item_end = text.index('}') + 1
+
+    parser.feed(text[:first_item_end])
+    assert seen == [(('sections', 'Key Research Papers', 0), DIGEST['sections']['Key Research Papers'][0])]
+
+    parser.feed(text[first_item_end:])
+    assert [path for path, _ in seen] == [('sections', 'Key Research Papers', 0),
+                                          ('sections', 'Industry Updates', 0),
+                                          ('sections', 'Industry Updates', 1)]
+    assert seen[2][1]['title'] == 'I "2"'
+
+def test_skips_code_fence_and_trailing_text():
+    parser = IncrementalJSONParser()
+    parser.feed('\n```json\n' + json.dumps(DIGEST) + '\n```\nHope this helps!')
+    assert parser.close() == DIGEST
+
+@pytest.mark.parametrize('text', [
+    'Here is the digest: {}',
+    '{"sections": {"a": [1 2]}}',
+    '{"sections": ]',
+    '{"a": 1,, "b": 2}',
+    '{"a" 1}',
+    '{"a": tru }',
+    '{"a": 01}',
+    '[1, 2}',
+])
+def test_structural_errors_raise(text):
+    with pytest.raises(JSONStreamError):
+        IncrementalJSONParser().feed(text)
+
+def test_errors_raise_before_the_document_ends():
+    parser = IncrementalJSONParser()
+    with pytest.raises(JSONStreamError):
+        parser.feed('{"sections": {"a": [{"title": "P1"} {"title"')
+
+@pytest.mark.parametrize('text', ['{"a\tb": 1}', '{"a": "line\nbreak"}', '{"\\x": 1}'])
+def test_invalid_strings_raise_stream_errors(text):
+    with pytest.raises(JSONStreamError):
+        IncrementalJSONParser(watch=lambda path: True).feed(text)
+
+def test_close_raises_on_an_incomplete_document():
+    parser = IncrementalJSONParser()
+    parser.feed('{"sections": {"a": [')
+    with pytest.raises(JSONStreamError):
+        parser.close()
@@ -0,0 +1,45 @@
+import pytest
+
+from keyword_matcher import KeywordMatcher
+
+KEYWORDS = ['GPT', 'LLM', 'RAG', 'Claude', 'AI agents', 'open source']
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher(KEYWORDS)
+
+@pytest.mark.parametrize('text, expected', [
+    ("OpenAI ships GPT-4.5", ['GPT']),
+    ("GPT/Claude shootout", ['GPT', 'Claude']),
+    ("LLM/RAG pipelines in production", ['LLM', 'RAG']),
+    ("Building AI-agents and ai_agents", ['AI agents']),
+    ("Open  Source LLMs? No, open-source LLM", ['open source', 'LLM']),
+    ("(GPT), 'Claude'.", ['GPT', 'Claude']),
+])
+def test_matches_whole_words_and_phrases(matcher, text, expected):
+    assert matcher.matches(text) == expected
+
+@pytest.mark.parametrize('text', [
+    "ChatGPT and GPTs",
+    "Visit llm.example.com for more",
+    "See example.com/llm/guide",
+    "https://blog.example.org/rag",
+    "news.ycombinator.com/item?id=1/claude",
+])
+def test_ignores_partial_words_hosts_and_paths(matcher, text):
+    assert matcher.matches(text) == []
+    assert not matcher.search(text)
+
+def test_path_rule_only_covers_the_url_token(matcher):
+    assert matcher.matches("example.com/llm vs Claude") == ['Claude']
+
+def test_duplicate_keywords_keep_the_first_spelling():
+    matcher = KeywordMatcher(['AI agents', 'ai-agents', 'AI  Agents'])
+    assert matcher.keywords == ['AI agents']
+    assert matcher.matches("ai-agents") == ['AI agents']
+
+def test_empty_keyword_list_never_matches():
+    matcher = KeywordMatcher([])
+    assert matcher.matches("GPT LLM") == []
+    assert not matcher.search("GPT LLM")
+    assert not matcher.search("")
@@ -0,0 +1,116 @@
+import copy
+
+import pytest
+
+from dedup import DedupIndex
+from near_dup import NearDuplicateIndex, collapse_near_duplicates, features, similarity
+
+SAME_STORY = [
+    ("OpenAI launches GPT-5", "OpenAI's new GPT-5 is out"),
+    ("Anthropic releases Claude 4 Opus, its most capable model yet", "Claude 4 Opus is now available from Anthropic"),
+    ("Anthropic Launches Claude Opus 4 and Claude Sonnet 4", "Claude 4: Anthropic's new Opus and Sonnet models"),
+    ("Meta releases Llama 4 Scout and Maverick", "Meta's Llama 4 models are here: Scout and Maverick"),
+    ("Google releases Gemini 2.5 Pro with thinking", "Gemini 2.5 Pro: Google's new thinking model"),
+]
+
+DIFFERENT_STORIES = [
+    ("Claude 3.5 Sonnet", "Claude 3.5 Haiku"),
+    ("Gemini 2.0 Flash", "Gemini 2.0 Pro"),
+    ("Anthropic releases Claude 3.5 Sonnet with computer use", "Anthropic releases Claude 3.5 Haiku with computer use"),
+    ("Google launches Gemini 2.0 Flash model for agents", "Google launches Gemini 2.0 Pro model for agents"),
+    ("Building agents with LangChain", "Building agents with LlamaIndex"),
+    ("Ask HN: How do you use AI agents at work?", "Ask HN: How do you test AI agents?"),
+]
+
+def story(title, score=10, source='hackernews', **fields):
+    return dict({'source': source, 'title': title, 'url': f"https://{abs(hash(title))}.example", 'score': score}, **fields)
+
+def cluster_titles(titles, **index_options):
+    index = NearDuplicateIndex(**index_options)
+    for position, title in enumerate(titles):
+        index.add(story(title, score=len(titles) - position))
+    return [[member['title'] for member in members] for members in index.clusters()]
+
+@pytest.mark.parametrize('first, second', SAME_STORY)
+def test_rewordings_cluster(first, second):
+    assert cluster_titles([first, second]) == [[first, second]]
+
+@pytest.mark.parametrize('first, second', DIFFERENT_STORIES)
+def test_different_stories_stay_apart(first, second):
+    assert cluster_titles([first, second]) == []
+
+def test_names_weigh_more_than_common_words():
+    assert features(story("OpenAI's new GPT-5 is out")) == {'openai': 3, 'gpt-5': 3}
+    assert features(story("Building agents with LangChain")) == {'building': 1, 'agents': 1, 'langchain': 3}
+    # In Title Case a capital says nothing; digits and inner capitals still do
+    assert features(story("Meta Releases Llama 4 With Agents")) == {'meta': 1, 'llama': 1, '4': 3, 'agents': 1}
+
+def test_similarity_uses_the_higher_weight_of_a_shared_word():
+    assert similarity({'claude': 1, '4': 3}, {'claude': 3, '4': 3}) == 1.0
+    assert similarity({'claude': 3, 'sonnet': 3}, {'claude': 3, 'haiku': 3}) == pytest.approx(1 / 3)
+
+def test_titles_too_light_to_tell_apart_are_never_clustered():
+    assert cluster_titles(["Agents", "Agents"]) == []
+    assert cluster_titles(["GPT-5", "GPT-5"]) == [["GPT-5", "GPT-5"]]
+
+def test_no_chaining_through_a_post_that_mentions_both():
+    titles = ["Gemini 2.0 Flash and Pro", "Gemini 2.0 Flash", "Gemini 2.0 Pro"]
+    clusters = cluster_titles(titles)
+    assert all(not {"Gemini 2.0 Flash", "Gemini 2.0 Pro"} <= set(members) for members in clusters)
+
+def test_summaries_add_evidence_without_diluting_title_matches():
+    hn = story("OpenAI launches GPT-5", score=500)
+    blog = story("OpenAI's new GPT-5 is out", source='blogs',
+                 summary="The model tops SWE-bench and ships to ChatGPT Plus users this week with a 400K context.")
+    reworded = story("The model OpenAI has been teasing for months is finally here", source='reddit',
+                     article_summary="OpenAI's GPT-5 tops SWE-bench and ships to ChatGPT Plus users this week.")
+    index = NearDuplicateIndex()
+    for item in (reworded, blog, hn):
+        index.add(item)
+    assert index.clusters() == [[hn, blog]]
+
+    # Summaries alone can match two differently titled posts
+    first = story("This week's big model", summary="OpenAI's GPT-5 tops SWE-bench and ships to ChatGPT Plus.")
+    second = story("GPT-5 thoughts", article_summary="OpenAI's GPT-5 tops SWE-bench and ships to ChatGPT Plus.")
+    index = NearDuplicateIndex()
+    index.add(first)
+    index.add(second)
+    assert len(index.clusters()) == 1
+
+def test_clusters_do_not_depend_on_arrival_order():
+    items = [story(title, score=score) for score, title in enumerate(
+        ["OpenAI launches GPT-5", "OpenAI's new GPT-5 is out", "GPT-5 is out", "Claude 3.5 Sonnet", "Claude 3.5 Haiku"])]
+
+    def run(order):
+        index = NearDuplicateIndex()
+        for item in order:
+            index.add(item)
+        return [[member['title'] for member in members] for members in index.clusters()]
+
+    assert run(items) == run(items[::-1]) == [["OpenAI's new GPT-5 is out", "OpenAI launches GPT-5"]]
+
+def test_collapse_keeps_the_most_engaged_post():
+    news = {'hackernews': [story("OpenAI launches GPT-5", score=300)],
+            'reddit': [story("OpenAI's new GPT-5 is out", score=40, source='reddit'),
+                       story("Claude 3.5 Haiku", score=5, source='reddit')]}
+    original = copy.deepcopy(news)
+    assert collapse_near_duplicates(news) == 1
+    representative = news['hackernews'][0]
+    assert representative['cluster_size'] == 2
+    assert representative['related'][0]['title'] == original['reddit'][0]['title']
+    assert [item['title'] for item in news['reddit']] == ["Claude 3.5 Haiku"]
+
+def test_promoted_items_are_re_signed():
+    index = NearDuplicateIndex()
+    dedup = DedupIndex(on_promote=index.update)
+    reddit = story("Finally here", score=40, source='reddit', url='https://openai.com/gpt-5')
+    blog = story("OpenAI's new GPT-5 is out", source='blogs')
+    for item in (reddit, blog):
+        assert dedup.add(item) is item
+        index.add(item)
+    assert index.clusters() == []
+
+    # Hacker News takes over the Reddit post's dict with its own title
+    assert dedup.add(story("OpenAI launches GPT-5", score=300, url='https://openai.com/gpt-5')) is None
+    assert reddit['source'] == 'hackernews'
+    assert index.clusters() == [[reddit, blog]]
@@ -0,0 +1,63 @@
+import asyncio
+import types
+
+import pytest
+
+import rate_limit
+from rate_limit import TokenBucket
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A manual clock for the bucket (asyncio keeps the real one)"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def test_refills_continuously_up_to_capacity(clock):
+    bucket = TokenBucket(capacity=10, per_seconds=60)
+    bucket.tokens = 0
+    clock[0] += 30
+    bucket._refill()
+    assert bucket.tokens == pytest.approx(5)
+    clock[0] += 600
+    bucket._refill()
+    assert bucket.tokens == 10
+
+def test_adopts_the_servers_budget(clock):
+    bucket = TokenBucket(capacity=10, per_seconds=60)
+    bucket.update_from_headers({'X-Ratelimit-Remaining': '100', 'X-Ratelimit-Reset': '50'})
+    # Never more tokens than the bucket held: requests in flight already used some
+    assert bucket.tokens == 10
+    assert bucket.capacity == 100
+    assert bucket.rate == pytest.approx(2)
+
+    bucket.update_from_headers({'X-Ratelimit-Remaining': '3', 'X-Ratelimit-Reset': '0'})
+    assert bucket.tokens == 3
+    assert bucket.rate == pytest.approx(3)  # The reset is floored at one second
+
+@pytest.mark.parametrize('headers', [{}, {'X-Ratelimit-Remaining': '5'}, {'X-Ratelimit-Remaining': 'lots',
+                                                                          'X-Ratelimit-Reset': '10'}])
+def test_ignores_missing_or_bad_headers(clock, headers):
+    bucket = TokenBucket(capacity=10, per_seconds=60)
+    bucket.update_from_headers(headers)
+    assert (bucket.tokens, bucket.capacity, bucket.rate) == (10, 10, pytest.approx(10 / 60))
+
+def test_pause_holds_requests_off(clock):
+    bucket = TokenBucket(capacity=10, per_seconds=10)
+    bucket.pause(5)
+    assert bucket.tokens == pytest.approx(-5)
+    clock[0] += 6
+    bucket._refill()
+    assert bucket.tokens == pytest.approx(1)
+
+def test_acquire_waits_for_a_token():
+    async def run():
+        bucket = TokenBucket(capacity=2, per_seconds=0.1)  # A token every 50 ms
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        return loop.time() - started
+
+    # Two tokens at once, then two refills
+    assert 0.08 <= asyncio.run(run()) < 0.5
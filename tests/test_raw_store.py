@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from raw_store import RawNewsStore, item_key
+
+DAY = '20261012'
+
+def story(number, score=10, **fields):
+    return dict({'source': 'hackernews', 'title': f"Story {number}", 'url': f"https://example.com/{number}",
+                 'score': score, 'time': f"2026-10-{number:02d}T12:00:00"}, **fields)
+
+def test_appended_batches_are_readable_at_once(tmp_path):
+    store = RawNewsStore(tmp_path)
+    store.append(DAY, 'hackernews', [story(1), story(2)])
+    assert [item['title'] for item in store.iter_records(DAY)] == ["Story 1", "Story 2"]
+
+    store.append(DAY, 'reddit', [dict(story(3), source='reddit')])
+    assert len(list(store.iter_records(DAY))) == 3
+    assert [item['title'] for item in store.iter_records(DAY, sources=['reddit'])] == ["Story 3"]
+    assert [r['count'] for r in store.load_index(DAY)['ranges']] == [2, 1]
+
+def test_latest_record_of_an_item_wins(tmp_path):
+    store = RawNewsStore(tmp_path)
+    store.append('20261011', 'hackernews', [story(1, score=5), story(2)])
+    store.append(DAY, 'hackernews', [story(1, score=80)])
+    items = list(store.iter_items(['20261011', DAY]))
+    assert [(item['title'], item['score']) for item in items] == [("Story 2", 10), ("Story 1", 80)]
+
+def test_unindexed_tail_is_ignored(tmp_path):
+    store = RawNewsStore(tmp_path)
+    store.append(DAY, 'hackernews', [story(1)])
+    # A crash between the data and index writes leaves bytes no range points to
+    with open(tmp_path / "raw" / f"raw_news_{DAY}.jsonl", 'ab') as f:
+        f.write(b'{"source": "hackernews", "title": "half')
+    store.append(DAY, 'hackernews', [story(2)])
+    assert [item['title'] for item in store.iter_records(DAY)] == ["Story 1", "Story 2"]
+
+def test_load_news_groups_by_source_and_trims_to_the_window(tmp_path):
+    store = RawNewsStore(tmp_path)
+    store.set_meta(DAY, week_start='2026-10-05T00:00:00')
+    store.append(DAY, 'hackernews', [story(1), story(6)])
+    store.append(DAY, 'arxiv', [{'source': 'arxiv', 'title': 'Paper', 'url': 'https://arxiv.org/abs/1',
+                                 'published': '2026-10-10T00:00:00'}])
+    news = store.load_news(store.window_dates(), since=datetime(2026, 10, 5))
+    assert [item['title'] for item in news['hackernews']] == ["Story 6"]
+    assert [item['title'] for item in news['papers']] == ["Paper"]
+    assert news['week_start'] == '2026-10-05T00:00:00'
+
+def test_item_key_uses_the_canonical_url():
+    assert item_key(story(1)) == item_key(story(1, url="http://www.example.com/1/?utm_source=x"))
+    assert item_key({'source': 'blogs', 'title': 'No link'}) == "blogs:No link"
@@ -0,0 +1,84 @@
+import types
+
+import pytest
+
+import resilience
+from resilience import CircuitBreaker, HostStats, Resilience
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_after=30)
+    fail(breaker, 2)
+    breaker.record_success()
+    fail(breaker, 2)
+    assert breaker.state == 'closed' and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+    assert breaker.times_opened == 1
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial at a time
+
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+    assert breaker.times_opened == 1
+
+def test_failed_trial_reopens_for_another_period(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_after=30)
+    fail(breaker, 5)
+    clock[0] += 31
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.times_opened == 2
+    clock[0] += 29
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+
+def test_failures_while_open_do_not_count_as_new_openings(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=30)
+    fail(breaker, 4)
+    assert breaker.times_opened == 1
+
+def test_hedging_waits_for_samples_and_respects_the_budget():
+    policy = Resilience(hedge_min_samples=3, hedge_budget=0.5)
+    stats = policy.stats('example.com')
+    for seconds in (0.1, 0.2):
+        stats.observe(seconds)
+    stats.requests = 2
+    assert policy.hedge_delay('example.com') is None
+
+    stats.observe(0.3)
+    assert policy.hedge_delay('example.com') == 0.3
+    stats.hedges = 1
+    assert policy.hedge_delay('example.com') is None
+    assert Resilience(hedge=False).hedge_delay('example.com') is None
+
+def test_backoff_is_capped_full_jitter():
+    policy = Resilience(backoff_base=0.5, backoff_max=2)
+    assert all(0 <= policy.backoff(attempt) <= min(2, 0.5 * 2 ** attempt) for attempt in range(6) for _ in range(20))
+
+def test_host_stats_percentiles():
+    stats = HostStats(window=100)
+    assert stats.p95() is None
+    for ms in range(1, 101):
+        stats.observe(ms / 1000)
+    assert stats.percentile(0.5) == 0.051
+    assert stats.p95() == 0.096